@@ -9,73 +9,40 @@ Universidad Tecnológica de Pereira
 """
 
 # Importación de las librerías y módulos necesarios
-import requests  # Para importar las señales de Github
-import matplotlib.pyplot as plt  # Para las gráficas
 import numpy as np  # Cálculos matemáticos
-from matplotlib.figure import Figure  # Personalizar figuras
-from tabulate import tabulate  # Crear tablas
+import fasores  # Estimador de fasores
+from armonicos import relativos  # Armónicos en por unidad de la fundamental
+import perfil  # Instrumentación (sin costo si está desactivada)
+from nucleo import AnalizadorNumerico  # Núcleo numérico (solo NumPy)
+from resultados import etiquetas_fases  # Nombres de las fases
 
 
-# Creando el objeto Analizador
-class Analizador:
+def _tabulate():
     """
-    Esta es la clase Analizador, la cual se encarga de analizar un sistema de distribución de energía
-    de 4 nodos.
+    Importa tabulate en el primer uso, para no cargarlo cuando solo se necesitan los números.
+    :return: Función tabulate
     """
+    from tabulate import tabulate  # Crear tablas
+    return perfil.envolver(tabulate, 'tabulate')
 
-    def __init__(self, V, I):
-        """
-        Método que inicializa la clase. También conocido como Constructor.
-        :param V: Voltajes en los nodos
-        :param I: Corrientes en los nodos
-        """
-        # Atributos de la clase
-        # Voltajes y corrientes en los nodos:
-        self.V = V  # Vector de voltajes
-        self.I = I  # Vector de corrientes
-        self.Zl1 = 0.009  # Impedancia en la línea 1
-        self.Zl2 = 0.01  # Impedancia en la línea 2
-        self.Zl3 = 0.01 + 0.001j  # Impedancia en la línea 3
-
-    # -------------------------------------------------------
-    # Métodos de la clase Analizador:
-    # Cálculo de los voltajes RMS
-    def v_rms(self):
-        """
-        Este método calcula los valores RMS de voltajes en los nodos.
-        :param V: Arreglo de voltajes en los nodos
-        :return: El valor RMS de las tensiones
-        """
-        V_rms = []  # Lista que contiene los valores RMS
-        for i in range(len(self.V)):  # Ciclo que calcula los valores RMS
-            quad_array = self.V[i] ** 2  # Eleva al cuadrado el arreglo de Voltajes
-            rms_value = np.sqrt(np.mean(quad_array))
-            V_rms.append(np.round(rms_value, 4))  # Agrega los valores a la lista V_rms
-
-        return np.round(V_rms, 4)
 
-    def i_rms(self):
-        """
-        Este método calcula los valores RMS de corrientes en los nodos.
-        :return: El valor RMS de las corrientes
-        """
+def _pyplot():
+    """
+    Importa matplotlib.pyplot en el primer uso, porque su importación es costosa y puede
+    elegir un backend gráfico.
+    :return: Módulo matplotlib.pyplot
+    """
+    import matplotlib.pyplot as plt  # Para las gráficas
+    return plt
 
-        I_rms = []
-        for i in range(len(self.I)):
-            quad_array = self.I[i] ** 2
-            rms_value = np.sqrt(np.mean(quad_array[i]))
-            I_rms.append(rms_value)
-        return np.round(I_rms, 4)
 
-    def __rms(self, v):
-        """
-        Este método cálcula el verdadero valor RMS de una señal
-        :param v: señal para determinar su RMS
-        :return: El valor RMS de v
-        """
-        quad = v ** 2
-        rmsval = np.sqrt(np.mean(quad))
-        return rmsval
+# Creando el objeto Analizador
+@perfil.instrumentable()
+class Analizador(AnalizadorNumerico):
+    """
+    Esta es la clase Analizador, la cual se encarga de analizar un sistema de distribución de energía
+    de 4 nodos. Agrega las tablas y los diagramas fasoriales al núcleo numérico.
+    """
 
     def tabla_rms(self):
         """
@@ -83,309 +50,151 @@ class Analizador:
         de fase en cada uno de los nodos.
         :return: Tabla con verdaderos valores RMS.
         """
-        v = self.V / np.sqrt(3)
-        i = self.I / np.sqrt(3)
-        V1a, I1a = Analizador.__rms(self, v[0][0]), Analizador.__rms(self, i[0][0])
-        V1b, I1b = Analizador.__rms(self, v[0][1]), Analizador.__rms(self, i[0][1])
-        V1c, I1c = Analizador.__rms(self, v[0][2]), Analizador.__rms(self, i[0][2])
-        V2a, I2a = Analizador.__rms(self, v[1][0]), Analizador.__rms(self, i[1][0])
-        V2b, I2b = Analizador.__rms(self, v[1][1]), Analizador.__rms(self, i[1][1])
-        V2c, I2c = Analizador.__rms(self, v[1][2]), Analizador.__rms(self, i[1][2])
-        V3a, I3a = Analizador.__rms(self, v[2][0]), Analizador.__rms(self, i[2][0])
-        V3b, I3b = Analizador.__rms(self, v[2][1]), Analizador.__rms(self, i[2][1])
-        V3c, I3c = Analizador.__rms(self, v[2][2]), Analizador.__rms(self, i[2][2])
-        I_n4 = self.I[0] + self.I[1] + self.I[2]  # Corrientes en el nodo 4
-        Y = (1 / self.Zl1) + (1 / self.Zl2) + (1 / self.Zl3)
-        V4 = (I_n4 + (self.V[0] / self.Zl1) + (self.V[1] / self.Zl2) + (self.V[2] / self.Zl3)) / Y
-        V4a, I4a = Analizador.__rms(self, abs(V4[0])), Analizador.__rms(self, I_n4[0])
-        V4b, I4b = Analizador.__rms(self, abs(V4[1])), Analizador.__rms(self, I_n4[1])
-        V4c, I4c = Analizador.__rms(self, abs(V4[2])), Analizador.__rms(self, I_n4[2])
-        tabla = tabulate([
-            ['Va [V]', V1a, V2a, V3a, V4a],
-            ['Vb [V]', V1b, V2b, V3b, V4b],
-            ['Vc [V]', V1c, V2c, V3c, V4c],
-            ['Ia [A]', I1a, I2a, I3a, I4a],
-            ['Ib [A]', I1b, I2b, I3b, I4b],
-            ['Ic [A]', I1c, I2c, I3c, I4c]],
-            headers=["Fase", "Nodo 1", "Nodo 2", "Nodo 3", "Nodo 4"], tablefmt="fancy_outline")
-        return tabla
+        return self.resultados().tabla_rms()
 
     def tabla_rms_nodo(self):
-        vrms = Analizador.v_rms(self)
-        irms = Analizador.i_rms(self)
-        N1v = vrms[0]
-        N2v = vrms[1]
-        N3v = vrms[2]
-        N1i = irms[0]
-        N2i = irms[1]
-        N3i = irms[2]
-
-        tabla = tabulate([
-            ['1', N1v, N1i],
-            ['2', N2v, N2i],
-            ['3', N3v, N3i]],
-            headers=["Nodo ", "Voltajes [V]", "Corrientes [A]"], tablefmt="fancy_outline")
-        return tabla
-
-    def pot_instantanea(self):
         """
-        Este método calcula las potencias instantáneas en los nodos.
-        :return: Potencias instantáneas
+        Este método retorna la tabla con los valores RMS de voltajes y corrientes por nodo.
+        :return: Tabla con los valores RMS por nodo.
         """
-        P_inst = []  # Vector que va a contener las potencias instantáneas
-        for i in self.V:  # Ciclo que calcula las potencias instantáneas
-            for j in self.I:
-                p_inst = i * j
-                P_inst.append(p_inst)
-        return P_inst
+        return self.resultados().tabla_rms_nodo()
 
-    def pot_activa(self):
-        """
-        Este método calcula las potencias activas en los nodos.
-        :return: Potencias activas en los nodos
-        """
-
-        P = []  # Lista que contiene las potencias activas en los nodos
-        for i in range(len(self.I)):  # ciclo que calcula las potencias activas
-            # Valor medio de la potencia instantánea
-            act_power = abs(np.mean(Analizador.pot_instantanea(self)[i]))
-            P.append(act_power)
-        return np.round(P, 4)
-
-    def pot_reactiva(self):
+    def impedancias(self):
         """
-        Este método calcula la potencia reactiva en los nodos.
-        :return: Los valores de potencias reactivas.
+        Este método calcula las impedancias de carga en los nodos a partir de los fasores
+        fundamentales de voltaje y corriente.
+        :return: Tabla con las impedancias en forma polar
         """
-        P = abs(self.pot_activa())  # Potencias activas
-        Irms = self.i_rms()  # Corrientes RMS
-        Vrms = self.v_rms()  # Voltajes RMS
-        S = []  # Lista que contiene las potencias aparentes en los nodos
-        Q = []  # Lista que contiene las potencias reactivas en llos nodos
-        for i in range(len(self.I)):  # Ciclo principal
-            s = Irms[i] * Vrms[i]  # potencias aparentes
-            S.append(s)
-            q = np.sqrt(abs(S[i] ** 2 - P[i] ** 2))  # potencias reactivas
-            Q.append(q)
-
-        return np.round(Q, 4)
+        return self.resultados().tabla_impedancias()
 
-    def pot_aparente(self):
-        P = self.pot_activa()  # Potencias activas en los nodos
-        Q = self.pot_reactiva()  # Potencias reactivas en los nodos
-        S = []  # Lista de potencias aparentes en los nodos
-        for i in range(len(P)):  # Ciclo que calcula las potencias aparentes
-            s = np.sqrt(P[i] ** 2 + Q[i] ** 2)  # Potencias aparentes
-            S.append(s)
-        return np.round(S, 4)
-
-    def factor_potencia(self):
-        """
-        Este método calcula el factor de potencia del sistema.
-        :return: Los factores de potencia en los nodos.
+    def tabla_potencias(self):
         """
-        P = self.pot_activa()  # Potencias activas
-        S = self.pot_aparente()  # Potencias aparentes
-        PF = []  # Lista factotres de potencia en los nodos
-        for i in range(len(P)):  # Ciclo que calcula los factores de potencia
-            pf = P[i] / S[i]  # Factor de potencia
-            PF.append(pf)
-        return np.round(PF, 4)
-
-    def impedancias(self):
-        v = self.V / np.sqrt(3)  # Voltajes de fase
-        i = self.I / np.sqrt(3)  # Corrientes de fase
-
-        # Cálculo de las impedancias con los valores rms de Vfase e Ifase
-        Z1a = Analizador.__rms(self, v[0][0]) / Analizador.__rms(self, i[0][0])
-        Z1b = Analizador.__rms(self, v[0][1]) / Analizador.__rms(self, i[0][1])
-        Z1c = Analizador.__rms(self, v[0][2]) / Analizador.__rms(self, i[0][2])
-        Z2a = Analizador.__rms(self, v[1][0]) / Analizador.__rms(self, i[1][0])
-        Z2b = Analizador.__rms(self, v[1][1]) / Analizador.__rms(self, i[1][1])
-        Z2c = Analizador.__rms(self, v[1][2]) / Analizador.__rms(self, i[1][2])
-        Z3a = Analizador.__rms(self, v[2][0]) / Analizador.__rms(self, i[2][0])
-        Z3b = Analizador.__rms(self, v[2][1]) / Analizador.__rms(self, i[2][1])
-        Z3c = Analizador.__rms(self, v[2][2]) / Analizador.__rms(self, i[2][2])
-
-        # Cálculo de los ángulos de las impedancias
-        ang_1a, ang_1b, ang_1c = np.angle(np.argmax(v[0][0]) - np.argmax(i[0][0])) * 180 / np.pi, np.angle(
-            np.argmax(v[0][1]) - np.argmax(i[0][1])) * 180 / np.pi, np.angle(
-            np.argmax(v[0][2]) - np.argmax(i[0][2])) * 180 / np.pi
-        ang_2a, ang_2b, ang_2c = np.angle(np.argmax(v[1][0]) - np.argmax(i[1][0])) * 180 / np.pi, np.angle(
-            np.argmax(v[1][1]) - np.argmax(i[1][1])) * 180 / np.pi, np.angle(
-            np.argmax(v[1][2]) - np.argmax(i[1][2])) * 180 / np.pi
-        ang_3a, ang_3b, ang_3c = np.angle(np.argmax(v[2][0]) - np.argmax(i[2][0])) * 180 / np.pi, np.angle(
-            np.argmax(v[2][1]) - np.argmax(i[2][1])) * 180 / np.pi, np.angle(
-            np.argmax(v[2][2]) - np.argmax(i[2][2])) * 180 / np.pi
-        # Se crea la tabla de impedancias como cadena de caracteres (strings)
-        tabla = tabulate([
-            ['A', str(np.round(Z1a, 3)) + '<' + str(np.round(ang_1a, 3)) + '°',
-             str(np.round(Z2a, 3)) + '<' + str(np.round(ang_2a, 3)) + '°',
-             str(np.round(Z3a, 3)) + '<' + str(np.round(ang_3a, 3)) + '°'],
-            ['B', str(np.round(Z1b, 3)) + '<' + str(np.round(ang_1b, 3)) + '°',
-             str(np.round(Z2b, 3)) + '<' + str(np.round(ang_2b, 3)) + '°',
-             str(np.round(Z3b, 3)) + '<' + str(np.round(ang_3b, 3)) + '°'],
-            ['C', str(np.round(Z1c, 3)) + '<' + str(np.round(ang_1c, 3)) + '°',
-             str(np.round(Z2c, 3)) + '<' + str(np.round(ang_2c, 3)) + '°',
-             str(np.round(Z3c, 3)) + '<' + str(np.round(ang_3c, 3)) + '°']],
-            headers=["Fase", "Nodo 1 [Ω]", "Nodo 2 [Ω]", "Nodo 3 [Ω]"], tablefmt="fancy_outline")
+        Este método retorna la tabla de potencias y factores de potencia de los nodos.
+        :return: Tabla con los valores de potencias.
+        """
+        return self.resultados().tabla_potencias()
+
+    def tabla_armonicos(self, armonicos=(3, 5, 7, 9, 11, 13)):
+        """
+        Este método retorna la tabla de distorsión armónica de cada nodo y fase: THD de
+        voltajes y corrientes, TDD, factor K y los armónicos de corriente indicados.
+        :param armonicos: Órdenes armónicos de corriente que se muestran (en % de la fundamental)
+        :return: Tabla de armónicos
+        """
+        Vh, Ih, _, _ = self.armonicos()
+        thd_v, thd_i = self.thd()
+        tdd, fk = self.tdd(), self.factor_k()
+        armonicos = [h for h in armonicos if h < Ih.shape[-1]]
+        fases = etiquetas_fases(Ih.shape[-2])
+        Ir = relativos(Ih)  # En por unidad de la fundamental (cero en las fases sin corriente)
+        filas = []
+        for indice in np.ndindex(*Ih.shape[:-1]):  # Alimentadores, nodos y fases
+            *alimentador, n, k = indice
+            nombre = ''.join('%d.' % (a + 1) for a in alimentador) + '%d%s' % (n + 1, fases[k])
+            filas.append([nombre, '%.2f' % (100 * thd_v[indice]), '%.2f' % (100 * thd_i[indice]),
+                          '%.2f' % (100 * tdd[indice]), '%.2f' % fk[indice],
+                          *['%.2f' % (100 * Ir[indice][h]) for h in armonicos]])
+        tabulate = _tabulate()
+        tabla = tabulate(filas, headers=["Nodo", "THD V [%]", "THD I [%]", "TDD [%]", "Factor K",
+                                         *['I%d [%%]' % h for h in armonicos]],
+                         tablefmt="fancy_outline", disable_numparse=True)
         return tabla
 
-    def tabla_potencias(self):
-        P = self.pot_activa()  # Potencias activas
-        Q = self.pot_reactiva()  # Potencias reactivas
-        S = self.pot_aparente()  # Potencias aparentes
-        PF = self.factor_potencia()  # Factores de potencia
-        Pt = P[0].sum() + P[1].sum() + P[2].sum()  # Potencia activa total
-        Qt = Q[0].sum() + Q[1].sum() + Q[2].sum()  # Potencia reactiva total
-        St = S[0].sum() + S[1].sum() + S[2].sum()  # Potencia aparente total
-        PFt = np.round(Pt / St, 3)  # Factor de potencia del sistema
-        tabla = tabulate([
-            ['P [W]', P[0], P[1], P[2], Pt],
-            ['Q [VAr]', Q[0], Q[1], Q[2], Qt],
-            ['S [VA]', S[0], S[1], S[2], St],
-            ['cos(ϴ)', PF[0], PF[1], PF[2], PFt]],
-            headers=["Potencia", "Nodo 1 ", "Nodo 2 ", "Nodo 3 ", "Total "], tablefmt="fancy_outline")
+    def tabla_eventos(self, **umbrales):
+        """
+        Este método retorna la tabla de eventos de calidad de potencia de los voltajes.
+        :param umbrales: Umbrales de detección (ver calidad.detectar)
+        :return: Tabla con un evento por fila
+        """
+        eventos = self.eventos(**umbrales)
+        if len(eventos) == 0:
+            return 'No se detectaron eventos de calidad de potencia.'
+        varios = self.V.ndim > 3  # Varios alimentadores: se agrega su columna
+        filas = [[e['tipo'].capitalize(), *([e['alimentador']] if varios else []), e['nodo'], e['fase'],
+                  '%.4f' % e['inicio'], '%.1f' % (1000 * e['duracion']), '%.1f' % e['profundidad'],
+                  '%.2f' % e['extremo']] for e in eventos]
+        tabulate = _tabulate()
+        tabla = tabulate(filas, headers=["Evento", *(["Alimentador"] if varios else []), "Nodo", "Fase",
+                                         "Inicio [s]", "Duración [ms]", "Magnitud [%]", "Extremo [V]"],
+                         tablefmt="fancy_outline", disable_numparse=True)
         return tabla
 
-    def voltajes_fasorial(self):
-        # Fases de los voltajes
-        F = 60  # frecuencia del sistema
-        V1phi_a = (np.argmax(self.V[0][0]) - np.argmax(self.V[0][0])) * (1 / (100 * F)) * 2 * np.pi * F
-        V1phi_b = (np.argmax(self.V[0][0]) - np.argmax(self.V[0][1])) * (1 / (100 * F)) * 2 * np.pi * F
-        V1phi_c = (np.argmax(self.V[0][0]) - np.argmax(self.V[0][2])) * (1 / (100 * F)) * 2 * np.pi * F
-        V2phi_a = (np.argmax(self.V[0][0]) - np.argmax(self.V[1][0])) * (1 / (100 * F)) * 2 * np.pi * F
-        V2phi_b = (np.argmax(self.V[0][0]) - np.argmax(self.V[1][1])) * (1 / (100 * F)) * 2 * np.pi * F
-        V2phi_c = (np.argmax(self.V[0][0]) - np.argmax(self.V[1][2])) * (1 / (100 * F)) * 2 * np.pi * F
-        V3phi_a = (np.argmax(self.V[0][0]) - np.argmax(self.V[2][0])) * (1 / (100 * F)) * 2 * np.pi * F
-        V3phi_b = (np.argmax(self.V[0][0]) - np.argmax(self.V[2][1])) * (1 / (100 * F)) * 2 * np.pi * F
-        V3phi_c = (np.argmax(self.V[0][0]) - np.argmax(self.V[2][2])) * (1 / (100 * F)) * 2 * np.pi * F
-
-        # Nodo 4
-        I_n4 = self.I[0] + self.I[1] + self.I[2]  # Corrientes en el nodo 4
-        Y = (1 / self.Zl1) + (1 / self.Zl2) + (1 / self.Zl3)
-        V4 = (I_n4 + (self.V[0] / self.Zl1) + (self.V[1] / self.Zl2) + (
-                self.V[2] / self.Zl3)) / Y  # Voltaje en el nodo 4
-        V4a, I4a = Analizador.__rms(self, abs(V4[0])), Analizador.__rms(self, I_n4[0])
-        V4b, I4b = Analizador.__rms(self, abs(V4[1])), Analizador.__rms(self, I_n4[1])
-        V4c, I4c = Analizador.__rms(self, abs(V4[2])), Analizador.__rms(self, I_n4[2])
-
-        V4phi_a = (np.argmax(abs(V4[0])) - np.argmax(abs(abs(V4[0])))) * (1 / (100 * F)) * 2 * np.pi * F
-        V4phi_b = (np.argmax(abs(V4[0])) - np.argmax(abs(V4[1]))) * (1 / (100 * F)) * 2 * np.pi * F
-        V4phi_c = (np.argmax(abs(V4[0])) - np.argmax(abs(V4[2]))) * (1 / (100 * F)) * 2 * np.pi * F
-
-        # Se crea la figura con los diagramas fasoriales
-        fig, ax = plt.subplots(2, 2, subplot_kw={'projection': 'polar'}, figsize=(6.5, 6.5), dpi=80)
-
-        # Diagrama de voltajes en nodo 1
-        ax[0][0].set_title('Voltajes en los nodos 1, 2, 3 y 4')
-        ax[0][0].quiver(V1phi_a, np.max(self.V[0][0]), angles='xy', scale_units='xy', scale=1, color='green', label='A')
-        ax[0][0].quiver(V1phi_b, np.max(self.V[0][1]), angles='xy', scale_units='xy', scale=1, color='blue', label='B')
-        ax[0][0].quiver(V1phi_c, np.max(self.V[0][2]), angles='xy', scale_units='xy', scale=1, color='red', label='C')
-        ax[0][0].set_rmax(np.max(self.V[0]))
-        ax[0][0].legend(loc="best")
-
-        # Diagrama de voltajes en nodo 2
-        ax[0][1].quiver(V2phi_a, np.max(self.V[1][0]), angles='xy', scale_units='xy', scale=1, color='green', label='A')
-        ax[0][1].quiver(V2phi_b, np.max(self.V[1][1]), angles='xy', scale_units='xy', scale=1, color='blue', label='B')
-        ax[0][1].quiver(V2phi_c, np.max(self.V[1][2]), angles='xy', scale_units='xy', scale=1, color='red', label='C')
-        ax[0][1].set_rmax(np.max(self.V[1]))
-        ax[0][1].legend(loc="best")
-        # Diagrama de voltajes en nodo 3
-        ax[1][0].quiver(V3phi_a, np.max(self.V[2][0]), angles='xy', scale_units='xy', scale=1, color='green', label='A')
-        ax[1][0].quiver(V3phi_b, np.max(self.V[2][1]), angles='xy', scale_units='xy', scale=1, color='blue', label='B')
-        ax[1][0].quiver(V3phi_c, np.max(self.V[2][2]), angles='xy', scale_units='xy', scale=1, color='red', label='C')
-        ax[1][0].set_rmax(np.max(self.V[2]))
-        ax[1][0].legend(loc="best")
-
-        # Diagrama de voltajes en nodo 4
-        ax[1][1].quiver(V4phi_a, np.max(abs(V4[0])), angles='xy', scale_units='xy', scale=1, color='green', label='A')
-        ax[1][1].quiver(V4phi_b, np.max(abs(V4[1])), angles='xy', scale_units='xy', scale=1, color='blue', label='B')
-        ax[1][1].quiver(V4phi_c, np.max(abs(V4[2])), angles='xy', scale_units='xy', scale=1, color='red', label='C')
-        ax[1][1].set_rmax(np.max(abs(V4[2])))
-        ax[1][1].legend(loc="best")
+    def datos_fasoriales(self, tipo, alimentador=0):
+        """
+        Este método calcula los ángulos y magnitudes de los diagramas fasoriales de los 4 nodos.
+        Los ángulos se miden respecto al voltaje de la fase A del nodo 1.
+        :param tipo: 'V' para tensiones o 'I' para corrientes
+        :param alimentador: Alimentador a graficar, si hay varios
+        :return: Tupla (phi, mag) con forma (nodos, fases)
+        """
+        Vf, If, Vu, Iu = self.fasores()
+        if Vf.ndim > 2:
+            Vf, If, Vu, Iu = (X[alimentador] for X in (Vf, If, Vu, Iu))
+        X = np.concatenate([Vf, Vu]) if tipo == 'V' else np.concatenate([If, Iu])
+        phi = fasores.angulo(X, Vf[0, 0])  # Ángulos respecto a la referencia
+        mag = abs(X)  # Magnitudes pico de la componente fundamental
+        return phi, mag
+
+    def diagrama_fasorial(self, tipo, fig=None, alimentador=0):
+        """
+        Este método crea la figura con los diagramas fasoriales de los 4 nodos.
+        :param tipo: 'V' para tensiones o 'I' para corrientes
+        :param fig: Figura donde se dibuja (por defecto una figura nueva de pyplot)
+        :param alimentador: Alimentador a graficar, si hay varios
+        :return: Figura con los diagramas fasoriales
+        """
+        return self.dibujar_fasorial(*self.datos_fasoriales(tipo, alimentador), tipo, fig)
+
+    @staticmethod
+    def dibujar_fasorial(phi, mag, tipo, fig=None):
+        """
+        Este método dibuja los diagramas fasoriales a partir de los datos de datos_fasoriales,
+        sin usar el analizador (la interfaz dibuja así con datos calculados en otro hilo).
+        :param phi: Ángulos (nodos, fases)
+        :param mag: Magnitudes (nodos, fases)
+        :param tipo: 'V' para tensiones o 'I' para corrientes
+        :param fig: Figura donde se dibuja (por defecto una figura nueva de pyplot)
+        :return: Figura con los diagramas fasoriales
+        """
+        if fig is None:
+            fig = _pyplot().figure(figsize=(6.5, 6.5), dpi=80)
+        columnas = max(2, int(np.ceil(np.sqrt(len(mag)))))  # 2 x 2 para los 4 nodos
+        ax = fig.subplots(-(-len(mag) // columnas), columnas, subplot_kw={'projection': 'polar'}, squeeze=False)
+        titulo = 'Voltajes' if tipo == 'V' else 'Corrientes'
+        nodos = [str(n + 1) for n in range(len(mag))]
+        ax[0][0].set_title(titulo + ' en los nodos ' + ', '.join(nodos[:-1]) + ' y ' + nodos[-1])
+        colores = ('green', 'blue', 'red', 'black', 'orange', 'purple')
+        for n, eje in enumerate(ax.flat[:len(mag)]):  # Un diagrama por nodo
+            for k, fase in enumerate(etiquetas_fases(mag.shape[1])):
+                eje.quiver(phi[n, k], mag[n, k], angles='xy', scale_units='xy', scale=1,
+                           color=colores[k % len(colores)], label=fase)
+            eje.set_rmax(np.max(mag[n]))
+            eje.legend(loc="best")
+        for eje in ax.flat[len(mag):]:  # Ejes sobrantes de la cuadrícula
+            eje.remove()
 
         return fig
 
-    def corrientes_fasorial(self):
-        # Fases de las corrientes
-        F = 60  # Frecuencia del sistema
-        I1phi_a = (np.argmax(self.V[0][0]) - np.argmax(self.I[0][0])) * (1 / (100 * F)) * 2 * np.pi * F
-        I1phi_b = (np.argmax(self.V[0][0]) - np.argmax(self.I[0][1])) * (1 / (100 * F)) * 2 * np.pi * F
-        I1phi_c = (np.argmax(self.V[0][0]) - np.argmax(self.I[0][2])) * (1 / (100 * F)) * 2 * np.pi * F
-        I2phi_a = (np.argmax(self.V[0][0]) - np.argmax(self.I[1][0])) * (1 / (100 * F)) * 2 * np.pi * F
-        I2phi_b = (np.argmax(self.V[0][0]) - np.argmax(self.I[1][1])) * (1 / (100 * F)) * 2 * np.pi * F
-        I2phi_c = (np.argmax(self.V[0][0]) - np.argmax(self.I[1][2])) * (1 / (100 * F)) * 2 * np.pi * F
-        I3phi_a = (np.argmax(self.V[0][0]) - np.argmax(self.I[2][0])) * (1 / (100 * F)) * 2 * np.pi * F
-        I3phi_b = (np.argmax(self.V[0][0]) - np.argmax(self.I[2][1])) * (1 / (100 * F)) * 2 * np.pi * F
-        I3phi_c = (np.argmax(self.V[0][0]) - np.argmax(self.I[2][2])) * (1 / (100 * F)) * 2 * np.pi * F
-
-        # Nodo 4
-        I_n4 = self.I[0] + self.I[1] + self.I[2]
-        Z = (1 / self.Zl1) + (1 / self.Zl2) + (1 / self.Zl3)
-        V4 = (I_n4 + (self.V[0] / self.Zl1) + (self.V[1] / self.Zl2) + (self.V[2] / self.Zl3)) / Z
-        V4a, I4a = Analizador.__rms(self, abs(V4[0])), Analizador.__rms(self, I_n4[0])
-        V4b, I4b = Analizador.__rms(self, abs(V4[1])), Analizador.__rms(self, I_n4[1])
-        V4c, I4c = Analizador.__rms(self, abs(V4[2])), Analizador.__rms(self, I_n4[2])
-
-        I4phi_a = (np.argmax(abs(V4[0])) - np.argmax(I_n4[0])) * (1 / (100 * F)) * 2 * np.pi * F
-        I4phi_b = (np.argmax(abs(V4[0])) - np.argmax(I_n4[1])) * (1 / (100 * F)) * 2 * np.pi * F
-        I4phi_c = (np.argmax(abs(V4[0])) - np.argmax(I_n4[2])) * (1 / (100 * F)) * 2 * np.pi * F
-
-        # Se crea la figura con los diagramas fasoriales de las corrientes
-        fig, ax = plt.subplots(2, 2, subplot_kw={'projection': 'polar'}, figsize=(6.5, 6.5), dpi=80)
-
-        # Diagrama de corrientes en el nodo 1
-        ax[0][0].set_title('Corrientes en los nodos 1, 2, 3 y 4')
-        ax[0][0].quiver(I1phi_a, np.max(self.I[0][0]), angles='xy', scale_units='xy', scale=1, color='green', label='A')
-        ax[0][0].quiver(I1phi_b, np.max(self.I[0][1]), angles='xy', scale_units='xy', scale=1, color='blue', label='B')
-        ax[0][0].quiver(I1phi_c, np.max(self.I[0][2]), angles='xy', scale_units='xy', scale=1, color='red', label='C')
-        ax[0][0].set_rmax(np.max(self.I[0]))
-        ax[0][0].legend(loc="best")
-
-        # Diagrama de corrientes en el nodo 2
-        ax[0][1].quiver(I2phi_a, np.max(self.I[1][0]), angles='xy', scale_units='xy', scale=1, color='green', label='A')
-        ax[0][1].quiver(I2phi_b, np.max(self.I[1][1]), angles='xy', scale_units='xy', scale=1, color='blue', label='B')
-        ax[0][1].quiver(I2phi_c, np.max(self.I[1][2]), angles='xy', scale_units='xy', scale=1, color='red', label='C')
-        ax[0][1].set_rmax(np.max(self.I[1]))
-        ax[0][1].legend(loc="best")
-
-        # Diagrama dee corrientes en el nodo 3
-        ax[1][0].quiver(I3phi_a, np.max(self.I[2][0]), angles='xy', scale_units='xy', scale=1, color='green', label='A')
-        ax[1][0].quiver(I3phi_b, np.max(self.I[2][1]), angles='xy', scale_units='xy', scale=1, color='blue', label='B')
-        ax[1][0].quiver(I3phi_c, np.max(self.I[2][2]), angles='xy', scale_units='xy', scale=1, color='red', label='C')
-        ax[1][0].set_rmax(np.max(self.I[2]))
-        ax[1][0].legend(loc="best")
-
-        # Diagrama de corrientes en el nodo 4
-        ax[1][1].quiver(I4phi_a, np.max(I_n4[0]), angles='xy', scale_units='xy', scale=1, color='green', label='A')
-        ax[1][1].quiver(I4phi_b, np.max(I_n4[1]), angles='xy', scale_units='xy', scale=1, color='blue', label='B')
-        ax[1][1].quiver(I4phi_c, np.max(I_n4[2]), angles='xy', scale_units='xy', scale=1, color='red', label='C')
-        ax[1][1].set_rmax(np.max(I_n4[2]))
-        ax[1][1].legend(loc="best")
+    def voltajes_fasorial(self):
+        """
+        Este método crea los diagramas fasoriales de las tensiones en los nodos 1, 2, 3 y 4.
+        :return: Figura con los diagramas fasoriales de tensiones
+        """
+        return self.diagrama_fasorial('V')
 
-        return fig
+    def corrientes_fasorial(self):
+        """
+        Este método crea los diagramas fasoriales de las corrientes en los nodos 1, 2, 3 y 4.
+        :return: Figura con los diagramas fasoriales de corrientes
+        """
+        return self.diagrama_fasorial('I')
 
 
 # Salvaguarda
 if __name__ == '__main__':
     # Pruebas unitarias:
-    url = 'https://raw.githubusercontent.com/JulianDPastrana/signal_analysis/main/seniales_sep.py'
-    # with httpimport.remote_repo(url):
-
-    r = requests.get(url)
-
-    with open('seniales_sep.py', 'w') as f:
-        f.write(r.text)
-    from seniales_sep import signal_generation
-
-    data = signal_generation()
-
-    V1, I1 = data["Node 1"]
-    V2, I2 = data["Node 2"]
-    V3, I3 = data["Node 3"]
-    V = [V1, V2, V3]
-    I = [I1, I2, I3]
+    from fuentes import cargar_senales
+    V, I = cargar_senales()
 
     # Defino el analizador:
     analizador = Analizador(V, I)
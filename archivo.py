@@ -0,0 +1,348 @@
+"""
+Este módulo contiene el archivo histórico de métricas del analizador de línea.
+Las métricas por ventana (RMS, P, Q, S, PF e impedancias de cada nodo y fase)
+se agregan al final de trozos .npy de tamaño fijo, con un índice de tiempos
+aparte. Una consulta por rango de tiempo busca los trozos y las filas con
+búsqueda binaria (O(log n)) y lee mapeado en memoria solo el tramo pedido.
+Al agregar datos se actualizan los resúmenes de 1 min, 15 min, 1 h y 1 día
+(media, mínimo y máximo de cada métrica), así que las consultas largas, como la
+demanda del último mes, no vuelven a recorrer los datos crudos.
+
+Estructura del directorio:
+    meta.json              forma de los canales, campos y filas por trozo
+    crudo/indice.npy       inicio, fin y filas de cada trozo
+    crudo/trozo_000000.npy filas con el tiempo 't' [s] y un campo por métrica
+    15m/...                lo mismo para cada resumen
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import json  # Metadatos
+import os  # Archivos y directorios
+import numpy as np  # Cálculos matemáticos
+from numpy.lib.format import open_memmap  # Trozos .npy mapeados en memoria
+
+# Métricas guardadas por nodo y fase
+CAMPOS = ('v_rms', 'i_rms', 'P', 'Q', 'S', 'PF', 'Z', 'Z_angulo')
+_METRICAS = ('v_rms', 'i_rms', 'P', 'Q', 'S', 'PF')  # Campos que vienen tal cual de motor.desde_sumas
+# Resúmenes: nombre -> ancho del intervalo [s]
+NIVELES = {'1m': 60, '15m': 900, '1h': 3600, '1d': 86400}
+TROZO = 1 << 14  # Filas por trozo
+
+_INDICE = np.dtype([('inicio', 'f8'), ('fin', 'f8'), ('filas', 'i8')])
+
+
+def _guardar_atomico(ruta, arreglo):
+    """
+    Guarda un arreglo .npy de forma atómica: un corte durante la escritura deja el anterior.
+    :param ruta: Ruta del archivo
+    :param arreglo: Arreglo a guardar
+    """
+    temporal = ruta + '.%d.tmp' % os.getpid()
+    with open(temporal, 'wb') as f:
+        np.save(f, arreglo)
+    os.replace(temporal, ruta)
+
+
+class _Serie:
+    """
+    Serie de filas ordenadas por tiempo en trozos .npy de capacidad fija con índice aparte.
+    Solo se agregan filas al final.
+    """
+
+    def __init__(self, directorio, dtype, trozo=TROZO):
+        """
+        Inicializador de la serie. Si el directorio tiene datos, la serie continúa desde ellos.
+        :param directorio: Directorio de la serie
+        :param dtype: Tipo estructurado de las filas (con el campo 't')
+        :param trozo: Filas por trozo
+        """
+        self.directorio = directorio
+        self.dtype = dtype
+        self.trozo = trozo
+        os.makedirs(directorio, exist_ok=True)
+        ruta = os.path.join(directorio, 'indice.npy')
+        self.indice = np.load(ruta) if os.path.exists(ruta) else np.empty(0, dtype=_INDICE)
+        self._abiertos = {}  # Trozos mapeados en memoria
+
+    def __len__(self):
+        """
+        Número total de filas.
+        """
+        return int(self.indice['filas'].sum())
+
+    @property
+    def fin(self):
+        """
+        Tiempo de la última fila (-inf si la serie está vacía).
+        """
+        return self.indice['fin'][-1] if len(self.indice) else -np.inf
+
+    def _trozo(self, k, escritura=False):
+        """
+        Retorna el trozo k mapeado en memoria. Las consultas lo abren de solo lectura, así que
+        las vistas que retornan no pueden modificar el archivo.
+        :param k: Número del trozo
+        :param escritura: Si se abre para completarlo (se crea si no existe)
+        :return: np.memmap estructurado con capacidad para self.trozo filas
+        """
+        clave = (k, escritura)
+        if clave not in self._abiertos:
+            ruta = os.path.join(self.directorio, 'trozo_%06d.npy' % k)
+            if os.path.exists(ruta):
+                self._abiertos[clave] = np.load(ruta, mmap_mode='r+' if escritura else 'r')
+            else:
+                self._abiertos[clave] = open_memmap(ruta, mode='w+', dtype=self.dtype, shape=(self.trozo,))
+            if len(self._abiertos) > 8:  # Solo se mantienen abiertos los trozos recientes
+                self._abiertos.pop(next(iter(self._abiertos)))
+        return self._abiertos[clave]
+
+    def agregar(self, filas):
+        """
+        Agrega filas al final de la serie y actualiza el índice.
+        :param filas: Arreglo estructurado ordenado por 't', posterior a la última fila
+        """
+        if len(filas) == 0:
+            return
+        if filas['t'][0] < self.fin or np.any(np.diff(filas['t']) < 0):
+            raise ValueError('Las filas deben estar ordenadas y ser posteriores a %s' % self.fin)
+        indice = list(self.indice.tolist())
+        hechas = 0
+        while hechas < len(filas):
+            if not indice or indice[-1][2] == self.trozo:  # Trozo lleno: se abre uno nuevo
+                indice.append((filas['t'][hechas], filas['t'][hechas], 0))
+            k = len(indice) - 1
+            inicio, _, ocupadas = indice[k]
+            n = min(self.trozo - ocupadas, len(filas) - hechas)
+            datos = self._trozo(k, escritura=True)
+            datos[ocupadas:ocupadas + n] = filas[hechas:hechas + n]
+            datos.flush()  # Los datos quedan en disco antes que el índice que los cuenta
+            indice[k] = (inicio, filas['t'][hechas + n - 1], ocupadas + n)
+            hechas += n
+        self.indice = np.array(indice, dtype=_INDICE)
+        _guardar_atomico(os.path.join(self.directorio, 'indice.npy'), self.indice)
+
+    def rango(self, inicio, fin):
+        """
+        Retorna las filas con inicio <= t < fin. Los trozos y las filas se ubican con búsqueda
+        binaria y solo se lee el tramo pedido.
+        :param inicio: Tiempo inicial [s]
+        :param fin: Tiempo final (exclusivo) [s]
+        :return: Arreglo estructurado (vista del archivo si el tramo está en un solo trozo)
+        """
+        k0 = np.searchsorted(self.indice['fin'], inicio, side='left')
+        k1 = np.searchsorted(self.indice['inicio'], fin, side='left')
+        partes = []
+        for k in range(k0, k1):
+            datos = self._trozo(k)[:self.indice['filas'][k]]
+            t = datos['t']
+            i, j = np.searchsorted(t, inicio, side='left'), np.searchsorted(t, fin, side='left')
+            if j > i:
+                partes.append(datos[i:j])
+        if not partes:
+            return np.empty(0, dtype=self.dtype)
+        return partes[0] if len(partes) == 1 else np.concatenate(partes)
+
+
+def _tipo_resumen(forma, campos):
+    """
+    Tipo de las filas de un resumen: inicio del intervalo, número de ventanas y la media, el
+    mínimo y el máximo de cada métrica.
+    :param forma: Forma de los canales (nodos, fases)
+    :param campos: Nombres de las métricas
+    :return: np.dtype estructurado
+    """
+    return np.dtype([('t', 'f8'), ('n', 'i8')] + [(c + sufijo, 'f8', forma) for c in campos
+                                                   for sufijo in ('', '_min', '_max')])
+
+
+def _resumir(filas, ancho, dtype, campos):
+    """
+    Resume filas en intervalos de ancho fijo con una sola reducción por métrica. Las filas
+    pueden ser crudas o de un resumen más fino (con 'n', '_min' y '_max'), de modo que los
+    resúmenes largos se arman desde los cortos sin volver a los datos crudos.
+    :param filas: Filas ordenadas por tiempo
+    :param ancho: Ancho del intervalo [s]
+    :param dtype: Tipo de las filas del resumen
+    :param campos: Nombres de las métricas
+    :return: Una fila de resumen por intervalo con datos
+    """
+    cubeta = np.floor(filas['t'] / ancho) * ancho
+    grupos = np.flatnonzero(np.r_[True, cubeta[1:] != cubeta[:-1]])
+    resumen = 'n' in filas.dtype.names
+    r = np.empty(len(grupos), dtype=dtype)
+    r['t'] = cubeta[grupos]
+    forma = (-1,) + (1,) * (filas[campos[0]].ndim - 1)
+    if resumen:
+        pesos = filas['n'].reshape(forma)
+        r['n'] = np.add.reduceat(filas['n'], grupos)
+    else:
+        r['n'] = np.diff(np.r_[grupos, len(filas)])
+    n = r['n'].reshape(forma)
+    for c in campos:
+        x = filas[c] * pesos if resumen else filas[c]
+        r[c] = np.add.reduceat(x, grupos, axis=0) / n
+        r[c + '_min'] = np.minimum.reduceat(filas[c + '_min'] if resumen else x, grupos, axis=0)
+        r[c + '_max'] = np.maximum.reduceat(filas[c + '_max'] if resumen else x, grupos, axis=0)
+    return r
+
+
+def _combinar(a, b, campos):
+    """
+    Combina dos resúmenes del mismo intervalo (a antes que b).
+    :param a: Fila de resumen
+    :param b: Fila de resumen
+    :param campos: Nombres de las métricas
+    :return: Fila de resumen combinada
+    """
+    r = a.copy()
+    r['n'] = a['n'] + b['n']
+    for c in campos:
+        r[c] = (a[c] * a['n'] + b[c] * b['n']) / r['n']
+        r[c + '_min'] = np.minimum(a[c + '_min'], b[c + '_min'])
+        r[c + '_max'] = np.maximum(a[c + '_max'], b[c + '_max'])
+    return r
+
+
+class Archivo:
+    """
+    Esta es la clase Archivo, la cual guarda en disco las métricas por ventana del analizador
+    con sus resúmenes por intervalos y responde consultas por rango de tiempo.
+    """
+
+    def __init__(self, directorio, forma=(3, 3), campos=CAMPOS, trozo=TROZO):
+        """
+        Inicializador de la clase Archivo. Si el directorio ya tiene un archivo, se continúa
+        con él y se usan su forma y sus campos.
+        :param directorio: Directorio del archivo
+        :param forma: Forma de los canales (nodos, fases) o (alimentadores, nodos, fases)
+        :param campos: Métricas guardadas
+        :param trozo: Filas por trozo
+        """
+        self.directorio = directorio
+        meta = os.path.join(directorio, 'meta.json')
+        if os.path.exists(meta):
+            with open(meta) as f:
+                datos = json.load(f)
+            forma, campos, trozo = tuple(datos['forma']), tuple(datos['campos']), datos['trozo']
+        else:
+            os.makedirs(directorio, exist_ok=True)
+            with open(meta, 'w') as f:
+                json.dump({'forma': list(forma), 'campos': list(campos), 'trozo': trozo}, f)
+        self.forma = tuple(forma)
+        self.campos = tuple(campos)
+        self.crudo = _Serie(os.path.join(directorio, 'crudo'),
+                            np.dtype([('t', 'f8')] + [(c, 'f8', self.forma) for c in self.campos]), trozo)
+        tipo = _tipo_resumen(self.forma, self.campos)
+        self.resumenes = {nivel: _Serie(os.path.join(directorio, nivel), tipo, trozo) for nivel in NIVELES}
+        # Intervalo abierto de cada resumen: se reconstruye desde los datos crudos posteriores
+        # al último intervalo cerrado y se cierra cuando llega una fila de un intervalo posterior
+        self._abiertos = {}
+        for nivel, serie in self.resumenes.items():
+            desde = serie.fin + NIVELES[nivel] if len(serie) else -np.inf
+            filas = self.crudo.rango(desde, np.inf)
+            self._abiertos[nivel] = None
+            if len(filas):
+                r = _resumir(filas, NIVELES[nivel], tipo, self.campos)
+                serie.agregar(r[:-1])  # Intervalos cerrados que no alcanzaron a guardarse
+                self._abiertos[nivel] = r[-1:]
+
+    def __len__(self):
+        """
+        Número de filas crudas guardadas.
+        """
+        return len(self.crudo)
+
+    def agregar(self, t, columnas):
+        """
+        Agrega filas y actualiza los resúmenes.
+        :param t: Tiempos de las filas [s desde la época Unix], crecientes
+        :param columnas: Diccionario métrica -> arreglo (filas,) + forma
+        """
+        t = np.atleast_1d(np.asarray(t, dtype=float))
+        if len(t) == 0:
+            return
+        filas = np.empty(len(t), dtype=self.crudo.dtype)
+        filas['t'] = t
+        for c in self.campos:
+            filas[c] = np.reshape(columnas[c], (len(t),) + self.forma)
+        self.crudo.agregar(filas)
+        base = filas
+        for nivel, serie in self.resumenes.items():  # De menor a mayor intervalo
+            nuevos = base = _resumir(base, NIVELES[nivel], serie.dtype, self.campos)
+            nuevos = nuevos.copy()  # El siguiente nivel se arma sin el intervalo abierto combinado
+            abierto = self._abiertos[nivel]
+            if abierto is not None and abierto[-1]['t'] == nuevos[0]['t']:
+                nuevos[0] = _combinar(abierto[-1], nuevos[0], self.campos)
+            elif abierto is not None:
+                serie.agregar(abierto)  # El intervalo abierto quedó cerrado por las filas nuevas
+            serie.agregar(nuevos[:-1])
+            self._abiertos[nivel] = nuevos[-1:]
+
+    def agregar_resultados(self, t, resultados):
+        """
+        Agrega una fila con las métricas de un objeto Resultados.
+        :param t: Tiempo de la fila [s]
+        :param resultados: Resultados del analizador
+        """
+        metricas = {c: getattr(resultados, c)[None] for c in _METRICAS}
+        self.agregar([t], self._desde_metricas(metricas, resultados.Z[None]))
+
+    def agregar_ventanas(self, ventanas, inicio, fs):
+        """
+        Agrega las ventanas de AnalizadorFlujo; el tiempo de cada una es el de su última muestra.
+        :param ventanas: Lista de diccionarios de AnalizadorFlujo.agregar
+        :param inicio: Tiempo de la primera muestra del flujo [s]
+        :param fs: Frecuencia de muestreo [Hz]
+        """
+        if not ventanas:
+            return
+        t = inicio + np.array([v['muestra'] for v in ventanas]) / fs
+        metricas = {c: np.stack([v[c] for v in ventanas]) for c in _METRICAS}
+        Z = np.stack([v['V_fasor'] for v in ventanas]) / np.stack([v['I_fasor'] for v in ventanas])
+        self.agregar(t, self._desde_metricas(metricas, Z))
+
+    def _desde_metricas(self, metricas, Z):
+        """
+        Arma las columnas de los campos a partir de las métricas y de las impedancias complejas.
+        :param metricas: Diccionario métrica -> arreglo (filas,) + forma
+        :param Z: Impedancias complejas (filas,) + forma
+        :return: Diccionario campo -> arreglo
+        """
+        columnas = dict(metricas, Z=np.abs(Z), Z_angulo=np.angle(Z, deg=True))
+        return {c: columnas[c] for c in self.campos}
+
+    def rango(self, inicio, fin, nivel=None):
+        """
+        Consulta las filas de un rango de tiempo, crudas o de un resumen.
+        :param inicio: Tiempo inicial [s]
+        :param fin: Tiempo final (exclusivo) [s]
+        :param nivel: None para los datos crudos o un resumen de NIVELES ('1m', '15m', '1h', '1d');
+                      los resúmenes incluyen el intervalo abierto (parcial)
+        :return: Arreglo estructurado con el campo 't' y las métricas (en los resúmenes también
+                 'n' y los campos '_min' y '_max')
+        """
+        if nivel is None:
+            return self.crudo.rango(inicio, fin)
+        if nivel not in NIVELES:
+            raise ValueError('Nivel desconocido: %s (use %s)' % (nivel, ', '.join(NIVELES)))
+        filas = self.resumenes[nivel].rango(inicio, fin)
+        abierto = self._abiertos[nivel]
+        if abierto is not None and inicio <= abierto[0]['t'] < fin:
+            filas = np.concatenate([filas, abierto])
+        return filas
+
+    def demanda(self, inicio, fin, nivel='15m'):
+        """
+        Calcula la demanda de cada nodo: la potencia activa media de cada intervalo, sumada
+        sobre las fases.
+        :param inicio: Tiempo inicial [s]
+        :param fin: Tiempo final (exclusivo) [s]
+        :param nivel: Intervalo de demanda (por defecto 15 min)
+        :return: Tupla (t, P) con P de forma (intervalos, ..., nodos) [W]
+        """
+        filas = self.rango(inicio, fin, nivel)
+        return filas['t'], filas['P'].sum(axis=-1)
@@ -0,0 +1,172 @@
+"""
+Este módulo contiene el análisis de armónicos del analizador de línea. Las
+señales de todos los nodos y fases se dividen en ventanas de un número entero
+de ciclos (12 ciclos a 60 Hz, como en IEC 61000-4-7) y se transforman con una
+sola FFT por lotes. Las ventanas y los planes (bins de cada armónico y
+factores de escala) se guardan en caché por longitud y frecuencia de muestreo,
+así que se reutilizan entre llamadas y entre archivos. A partir de los
+espectros se calculan el THD, el TDD y el factor K. Los canales sin fundamental
+(p. ej. una fase apagada) dan cero en lugar de inf o nan.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import functools  # Caché de ventanas y planes
+import numpy as np  # Cálculos matemáticos
+import motor  # División en bloques
+
+CICLOS = 12  # Ciclos por ventana de análisis (200 ms a 60 Hz)
+ORDEN = 50  # Orden armónico máximo por defecto
+UMBRAL = 1e-9  # Fundamental mínima, relativa al RMS del canal, para referir los armónicos a ella
+
+
+@functools.lru_cache(maxsize=32)
+def ventana(nombre, N):
+    """
+    Retorna una ventana de N muestras. Con un número entero de ciclos la ventana
+    rectangular no tiene fuga espectral; la de Hann sirve si la frecuencia se desvía.
+    :param nombre: 'rectangular' o 'hann'
+    :param N: Número de muestras
+    :return: Arreglo de solo lectura con N elementos
+    """
+    if nombre == 'rectangular':
+        w = np.ones(N)
+    elif nombre == 'hann':
+        w = np.hanning(N + 1)[:-1]  # Periódica, para que sume exactamente N/2
+    else:
+        raise ValueError('Ventana desconocida: %s' % nombre)
+    w.flags.writeable = False
+    return w
+
+
+@functools.lru_cache(maxsize=32)
+def plan(N, fs, f=60, orden=ORDEN, nombre='rectangular'):
+    """
+    Prepara el análisis de ventanas de N muestras: bins de cada armónico y factor que
+    convierte la FFT en valores RMS.
+    :param N: Muestras por ventana
+    :param fs: Frecuencia de muestreo [Hz]
+    :param f: Frecuencia del sistema [Hz]
+    :param orden: Orden armónico máximo pedido
+    :param nombre: Ventana a aplicar
+    :return: Tupla (w, bins, escala); w es None para la ventana rectangular
+    """
+    ciclos = N * f / fs  # Ciclos por ventana (bin del armónico 1)
+    orden = min(orden, int((N // 2) / ciclos))  # Límite de Nyquist
+    bins = np.round(np.arange(orden + 1) * ciclos).astype(int)
+    w = ventana(nombre, N)
+    escala = np.full(orden + 1, np.sqrt(2) / w.sum())  # Amplitud pico 2|X|/Σw, en RMS
+    escala[0] = 1 / w.sum()  # La componente continua no se duplica
+    bins.flags.writeable = escala.flags.writeable = False
+    return (None if nombre == 'rectangular' else w), bins, escala
+
+
+def muestras_ventana(n_muestras, fs, f=60, ciclos=CICLOS):
+    """
+    Calcula las muestras por ventana: ciclos completos, o todos los disponibles si la señal
+    es más corta.
+    :param n_muestras: Muestras disponibles
+    :param fs: Frecuencia de muestreo [Hz]
+    :param f: Frecuencia del sistema [Hz]
+    :param ciclos: Ciclos por ventana
+    :return: Muestras por ventana
+    """
+    ciclos = min(ciclos, int(n_muestras * f // fs))
+    if ciclos < 1:
+        raise ValueError('La señal no contiene un ciclo completo a %s Hz' % f)
+    return int(round(ciclos * fs / f))
+
+
+def espectro(x, fs, f=60, orden=ORDEN, ciclos=CICLOS, nombre='rectangular', bloque=motor.BLOQUE):
+    """
+    Calcula las magnitudes RMS y las fases de los armónicos de todos los canales. Cada bloque
+    de ventanas se transforma con una sola FFT por lotes; las magnitudes son el RMS de las
+    ventanas y las fases las del promedio complejo.
+    :param x: Señales (..., muestras); admite np.memmap
+    :param fs: Frecuencia de muestreo [Hz]
+    :param f: Frecuencia del sistema [Hz]
+    :param orden: Orden armónico máximo
+    :param ciclos: Ciclos por ventana
+    :param nombre: Ventana a aplicar
+    :param bloque: Muestras por bloque (se redondea a ventanas completas)
+    :return: Tupla (magnitudes, fases) con forma (..., orden + 1); fases en radianes
+    """
+    N = muestras_ventana(x.shape[-1], fs, f, ciclos)
+    w, bins, escala = plan(N, fs, f, orden, nombre)
+    m = x.shape[-1] // N  # Ventanas completas
+    forma = x.shape[:-1]
+    potencia = np.zeros(forma + (len(bins),))
+    suma = np.zeros(forma + (len(bins),), dtype=complex)
+    L = max(1, bloque // N)
+    for j in range(0, m, L):
+        k = min(L, m - j)
+        tramo = np.asarray(x[..., j * N:(j + k) * N], dtype=float).reshape(forma + (k, N))
+        if w is not None:
+            tramo = tramo * w
+        X = np.fft.rfft(tramo, axis=-1)[..., bins]  # Una FFT por lotes de todos los canales
+        potencia += (X.real ** 2 + X.imag ** 2).sum(axis=-2)
+        suma += X.sum(axis=-2)
+    return np.sqrt(potencia / m) * escala, np.angle(suma)
+
+
+def _dividir(a, b, valida, defecto=0.0):
+    """
+    Divide a / b donde valida es verdadero y deja defecto en el resto, sin advertencias.
+    :param a: Numerador
+    :param b: Denominador
+    :param valida: Dónde la división está definida
+    :param defecto: Valor donde no lo está
+    :return: Arreglo con la forma de a, b y valida combinadas
+    """
+    a, b, valida = np.broadcast_arrays(a, b, valida)
+    return np.divide(a, b, out=np.full(a.shape, defecto, dtype=float), where=valida)
+
+
+def relativos(magnitudes, umbral=UMBRAL):
+    """
+    Refiere las magnitudes de cada canal a su fundamental. Los canales sin fundamental (con
+    una fundamental menor que umbral veces su RMS, o todo en cero) quedan en cero.
+    :param magnitudes: Magnitudes RMS (..., orden + 1)
+    :param umbral: Fundamental mínima relativa al RMS del canal
+    :return: Magnitudes en por unidad de la fundamental, con la forma de magnitudes
+    """
+    fundamental = magnitudes[..., 1:2]
+    rms = np.sqrt(np.sum(magnitudes ** 2, axis=-1, keepdims=True))
+    return _dividir(magnitudes, fundamental, fundamental > umbral * rms)
+
+
+def thd(magnitudes, umbral=UMBRAL):
+    """
+    Calcula la distorsión armónica total respecto a la fundamental.
+    :param magnitudes: Magnitudes RMS (..., orden + 1)
+    :param umbral: Fundamental mínima relativa al RMS del canal (sin ella, el THD es cero)
+    :return: THD en por unidad
+    """
+    return np.sqrt(np.sum(relativos(magnitudes, umbral)[..., 2:] ** 2, axis=-1))
+
+
+def tdd(magnitudes, demanda):
+    """
+    Calcula la distorsión total de demanda (IEEE 519): la distorsión armónica de la
+    corriente referida a la corriente de demanda máxima en lugar de la fundamental.
+    :param magnitudes: Magnitudes RMS de las corrientes (..., orden + 1)
+    :param demanda: Corriente de demanda máxima [A] (escalar o con la forma de los canales)
+    :return: TDD en por unidad (cero donde la demanda es cero)
+    """
+    distorsion = np.sqrt(np.sum(magnitudes[..., 2:] ** 2, axis=-1))
+    return _dividir(distorsion, demanda, np.asarray(demanda) > 0)
+
+
+def factor_k(magnitudes):
+    """
+    Calcula el factor K de un transformador: Σ h²·Ih² / Σ Ih², sin la componente continua.
+    :param magnitudes: Magnitudes RMS de las corrientes (..., orden + 1)
+    :return: Factor K (1, el de una corriente sinusoidal, en los canales sin corriente)
+    """
+    h2 = np.arange(magnitudes.shape[-1]) ** 2
+    c = magnitudes[..., 1:] ** 2
+    total = np.sum(c, axis=-1)
+    return _dividir(np.sum(h2[1:] * c, axis=-1), total, total > 0, defecto=1.0)
@@ -0,0 +1,220 @@
+"""
+Este módulo contiene el detector de eventos de calidad de potencia: huecos,
+elevaciones, interrupciones y transitorios en todos los nodos y fases. Se basa en
+el valor RMS de un ciclo actualizado cada medio ciclo (Urms(1/2), IEC 61000-4-30),
+que se obtiene de sumas de cuadrados por medio ciclo calculadas por bloques. Los
+cruces de umbral, la histéresis y la fusión de eventos son operaciones vectorizadas
+sobre todos los canales a la vez, sin recorrer las ventanas en Python.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import numpy as np  # Cálculos matemáticos
+import motor  # División en bloques
+from resultados import etiquetas_fases  # Nombres de las fases
+
+# Tabla de eventos: una fila por evento, ordenada por inicio
+EVENTO = np.dtype([('tipo', 'U12'), ('alimentador', 'i4'), ('nodo', 'i4'), ('fase', 'U4'), ('muestra', 'i8'),
+                   ('inicio', 'f8'), ('duracion', 'f8'), ('profundidad', 'f8'), ('extremo', 'f8')])
+
+
+def medios_ciclos(x, N, bloque=motor.BLOQUE, transitorios=True):
+    """
+    Calcula por bloques, para cada medio ciclo, la suma de cuadrados de las muestras y el
+    máximo de min(|x[n] - x[n - N]|, |x[n] - x[n + N]|). Un transitorio difiere de los dos
+    ciclos vecinos; un cambio sostenido (el inicio de un hueco) solo del anterior, y la
+    muestra un ciclo después del transitorio solo del siguiente.
+    :param x: Señales (..., muestras); admite np.memmap y cuentas enteras
+    :param N: Muestras por ciclo
+    :param bloque: Muestras por bloque (se redondea a medios ciclos completos)
+    :param transitorios: Si se calcula el máximo de la diferencia entre ciclos
+    :return: Tupla (sumas, saltos) con forma (..., medios ciclos); saltos es None si no se pide
+    """
+    H = N // 2
+    m = x.shape[-1] // H
+    forma = x.shape[:-1]
+    sumas = np.empty(forma + (m,))
+    saltos = np.zeros(forma + (m,)) if transitorios else None
+    L = max(1, bloque // H) * H
+    for inicio in range(0, m * H, L):
+        fin = min(inicio + L, m * H)
+        j0, j1 = inicio // H, fin // H
+        tramo = np.asarray(x[..., inicio:fin], dtype=float)
+        t = tramo.reshape(forma + (j1 - j0, H))
+        sumas[..., j0:j1] = np.einsum('...jk,...jk->...j', t, t)
+        if transitorios and m * H >= 2 * N:
+            # En los extremos de la señal solo hay un ciclo vecino: se usa ese lado
+            atras = np.full_like(tramo, np.inf)
+            k0 = min(max(inicio, N), fin) - inicio
+            np.subtract(tramo[..., k0:], x[..., inicio + k0 - N:fin - N], out=atras[..., k0:])
+            adelante = np.full_like(tramo, np.inf)
+            k1 = max(min(fin, m * H - N) - inicio, 0)
+            np.subtract(tramo[..., :k1], x[..., inicio + N:inicio + N + k1], out=adelante[..., :k1])
+            dif = np.minimum(np.abs(atras, out=atras), np.abs(adelante, out=adelante), out=atras)
+            saltos[..., j0:j1] = dif.reshape(forma + (j1 - j0, H)).max(axis=-1)
+    return sumas, saltos
+
+
+def rms_medio_ciclo(sumas, N):
+    """
+    Obtiene el RMS de un ciclo actualizado cada medio ciclo a partir de las sumas por medio
+    ciclo: cada valor usa dos medios ciclos consecutivos.
+    :param sumas: Sumas de cuadrados por medio ciclo (..., medios ciclos)
+    :param N: Muestras por ciclo
+    :return: Urms(1/2) con forma (..., medios ciclos - 1)
+    """
+    return np.sqrt((sumas[..., :-1] + sumas[..., 1:]) / (2 * (N // 2)))
+
+
+def _estado(entra, sale):
+    """
+    Aplica histéresis a lo largo del último eje: el estado se activa donde se cumple la
+    condición de entrada, se desactiva donde se cumple la de salida y entre ambas conserva
+    el valor anterior. Se resuelve propagando el índice del último valor decisivo.
+    :param entra: Arreglo booleano (canales, n) de la condición de entrada
+    :param sale: Arreglo booleano (canales, n) de la condición de salida
+    :return: Arreglo booleano (canales, n) con el estado
+    """
+    indice = np.where(entra | sale, np.arange(entra.shape[-1]), -1)
+    np.maximum.accumulate(indice, axis=-1, out=indice)
+    # Antes del primer valor decisivo (índice -1) el estado es inactivo
+    return np.take_along_axis(entra, np.maximum(indice, 0), axis=-1) & (indice >= 0)
+
+
+def _tramos(estado):
+    """
+    Encuentra los tramos consecutivos en los que el estado está activo.
+    :param estado: Arreglo booleano (canales, n)
+    :return: Tupla (canal, inicio, fin) con fin exclusivo
+    """
+    borde = np.diff(np.pad(estado.astype(np.int8), ((0, 0), (1, 1))), axis=-1)
+    canal, inicio = np.nonzero(borde == 1)
+    _, fin = np.nonzero(borde == -1)  # Mismo orden (canal, tiempo) que los inicios
+    return canal, inicio, fin
+
+
+def _fusionar(canal, inicio, fin, separacion):
+    """
+    Fusiona los tramos de un mismo canal separados por menos de separacion valores.
+    :param canal: Canal de cada tramo (ordenados por canal y por inicio)
+    :param inicio: Inicio de cada tramo
+    :param fin: Fin exclusivo de cada tramo
+    :param separacion: Separación mínima entre eventos distintos
+    :return: Tupla (canal, inicio, fin) de los tramos fusionados
+    """
+    if len(canal) == 0 or separacion <= 0:
+        return canal, inicio, fin
+    nuevo = np.ones(len(canal), dtype=bool)
+    nuevo[1:] = (canal[1:] != canal[:-1]) | (inicio[1:] - fin[:-1] >= separacion)
+    grupos = np.flatnonzero(nuevo)
+    return canal[grupos], inicio[grupos], np.maximum.reduceat(fin, grupos)
+
+
+def _extremo(valores, canal, inicio, fin, funcion):
+    """
+    Reduce los valores de cada tramo (mínimo o máximo) con una sola llamada a reduceat.
+    :param valores: Arreglo (canales, n)
+    :param canal: Canal de cada tramo
+    :param inicio: Inicio de cada tramo
+    :param fin: Fin exclusivo de cada tramo
+    :param funcion: np.minimum o np.maximum
+    :return: Extremo de cada tramo
+    """
+    if len(canal) == 0:
+        return np.empty(0)
+    n = valores.shape[-1]
+    plano = np.append(valores.ravel(), 0)  # Centinela para tramos que terminan al final
+    indices = np.ravel(np.column_stack([canal * n + inicio, canal * n + fin]))
+    return funcion.reduceat(plano, indices)[::2]
+
+
+def _cerca(canal, inicio, fin, bordes, margen):
+    """
+    Indica qué tramos tienen algún borde de su mismo canal a menos de margen valores.
+    :param canal: Canal de cada tramo
+    :param inicio: Inicio de cada tramo
+    :param fin: Fin exclusivo de cada tramo
+    :param bordes: Tupla (canal, posición) de los bordes
+    :param margen: Distancia máxima
+    :return: Arreglo booleano por tramo
+    """
+    n = max(np.max(fin, initial=0), np.max(bordes[1], initial=0)) + 2 * margen + 1
+    claves = np.sort(bordes[0] * n + bordes[1] + margen)  # Un eje por canal, sin solaparse
+    desde = np.searchsorted(claves, canal * n + inicio, side='left')
+    hasta = np.searchsorted(claves, canal * n + fin + 2 * margen, side='right')
+    return hasta > desde
+
+
+def detectar(urms, fs, N, nominal=None, saltos=None, hueco=0.9, elevacion=1.1, interrupcion=0.1,
+             histeresis=0.02, transitorio=0.2, separacion=1):
+    """
+    Detecta los eventos de calidad de potencia de todos los canales a la vez.
+    :param urms: Urms(1/2) (..., nodos, fases, valores) de los voltajes; los ejes iniciales son
+                 alimentadores
+    :param fs: Frecuencia de muestreo [Hz]
+    :param N: Muestras por ciclo
+    :param nominal: Voltaje declarado por canal (por defecto la mediana de Urms de cada canal)
+    :param saltos: Máximo de |v[n] - v[n - N]| por medio ciclo (None para omitir transitorios)
+    :param hueco: Umbral de hueco en por unidad
+    :param elevacion: Umbral de elevación en por unidad
+    :param interrupcion: Umbral de interrupción en por unidad (un hueco más profundo)
+    :param histeresis: Histéresis en por unidad
+    :param transitorio: Umbral de transitorio: salto entre ciclos en por unidad del pico nominal
+    :param separacion: Medios ciclos mínimos entre dos eventos; los más cercanos se fusionan
+    :return: Arreglo estructurado con dtype EVENTO, ordenado por inicio. Los saltos en el inicio
+             y el final de un hueco, una elevación o una interrupción no se reportan como
+             transitorios
+    """
+    forma = urms.shape[:-1]
+    nodos, fases = forma[-2:]
+    u = urms.reshape(-1, urms.shape[-1])
+    if nominal is None:
+        nominal = np.median(u, axis=-1).reshape(forma)
+    nominal = np.broadcast_to(np.asarray(nominal, dtype=float), forma).reshape(-1, 1)
+    pu = u / nominal
+    H = N // 2
+    tablas = []
+    bordes = []  # (canal, medio ciclo) de los inicios y finales de los eventos RMS
+
+    def agregar(tipo, canal, inicio, fin, profundidad, extremo):
+        t = np.empty(len(canal), dtype=EVENTO)
+        t['tipo'] = tipo
+        t['alimentador'] = canal // (nodos * fases) + 1
+        t['nodo'] = canal // fases % nodos + 1
+        t['fase'] = np.array(etiquetas_fases(fases))[canal % fases]
+        t['muestra'] = inicio * H
+        t['inicio'] = inicio * H / fs
+        t['duracion'] = (fin - inicio) * H / fs
+        t['profundidad'] = profundidad
+        t['extremo'] = extremo
+        tablas.append(t)
+
+    # Huecos (y, si la tensión residual baja del umbral, interrupciones)
+    c, i, f = _fusionar(*_tramos(_estado(pu < hueco, pu >= hueco + histeresis)), separacion)
+    minimo = _extremo(pu, c, i, f, np.minimum)
+    es_interrupcion = minimo < interrupcion
+    for tipo, sel in (('hueco', ~es_interrupcion), ('interrupcion', es_interrupcion)):
+        agregar(tipo, c[sel], i[sel], f[sel], 100 * (1 - minimo[sel]), (minimo * nominal[c, 0])[sel])
+    bordes += [(c, i), (c, f)]
+
+    # Elevaciones
+    c, i, f = _fusionar(*_tramos(_estado(pu > elevacion, pu <= elevacion - histeresis)), separacion)
+    maximo = _extremo(pu, c, i, f, np.maximum)
+    agregar('elevacion', c, i, f, 100 * (maximo - 1), maximo * nominal[c, 0])
+    bordes += [(c, i), (c, f)]
+
+    # Transitorios: saltos respecto a los dos ciclos vecinos mayores que el umbral, salvo los
+    # que están a menos de un ciclo (y el medio ciclo de retardo de Urms) del borde de un evento RMS
+    if saltos is not None:
+        s = saltos.reshape(-1, saltos.shape[-1]) / (np.sqrt(2) * nominal)
+        c, i, f = _fusionar(*_tramos(s > transitorio), separacion)
+        sel = ~_cerca(c, i, f, tuple(np.concatenate(b) for b in zip(*bordes)), margen=3)
+        c, i, f = c[sel], i[sel], f[sel]
+        pico = _extremo(s, c, i, f, np.maximum)
+        agregar('transitorio', c, i, f, 100 * pico, pico * np.sqrt(2) * nominal[c, 0])
+
+    eventos = np.concatenate(tablas)
+    return eventos[np.argsort(eventos['muestra'], kind='stable')]
@@ -0,0 +1,124 @@
+"""
+Este módulo contiene la reducción de puntos (nivel de detalle) de las gráficas.
+Las señales en el tiempo se reducen con la envolvente mínimo/máximo por píxel o
+con LTTB, y las curvas de Lissajous con un histograma 2-D del cual solo se
+dibujan las celdas ocupadas. El presupuesto de puntos lo da el ancho en píxeles
+del lienzo y las reducciones se guardan por nivel de zoom.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+from collections import OrderedDict  # Caché LRU
+import numpy as np  # Cálculos matemáticos
+
+
+def minmax(y, inicio, fin, pixeles):
+    """
+    Reduce y[..., inicio:fin] a su envolvente: el mínimo y el máximo de cada grupo de muestras
+    que cae en un píxel, en el orden en que ocurren. Todas las señales comparten el eje x.
+    :param y: Señales (..., muestras)
+    :param inicio: Primera muestra del tramo visible
+    :param fin: Muestra final (exclusiva) del tramo visible
+    :param pixeles: Ancho disponible en píxeles
+    :return: Tupla (x, y_reducida) con a lo sumo 2·pixeles + 2 puntos
+    """
+    n = fin - inicio
+    if n <= 2 * pixeles:
+        return np.arange(inicio, fin), np.asarray(y[..., inicio:fin])
+    paso = -(-n // pixeles)  # Muestras por píxel (redondeo hacia arriba)
+    grupos = -(-n // paso)
+    tramo = np.asarray(y[..., inicio:fin])
+    relleno = grupos * paso - n  # El último grupo se completa repitiendo su última muestra
+    if relleno:
+        tramo = np.concatenate([tramo, np.repeat(tramo[..., -1:], relleno, axis=-1)], axis=-1)
+    tramo = tramo.reshape(*tramo.shape[:-1], grupos, paso)
+    imin, imax = tramo.argmin(axis=-1), tramo.argmax(axis=-1)
+    ymin = np.take_along_axis(tramo, imin[..., None], axis=-1)[..., 0]
+    ymax = np.take_along_axis(tramo, imax[..., None], axis=-1)[..., 0]
+    orden = imin <= imax
+    y_red = np.stack([np.where(orden, ymin, ymax), np.where(orden, ymax, ymin)], axis=-1)
+    x = inicio + np.arange(grupos)[:, None] * paso + np.array([0, paso // 2])
+    return x.ravel(), y_red.reshape(*y_red.shape[:-2], -1)
+
+
+def lttb(x, y, puntos):
+    """
+    Reduce una serie con el algoritmo Largest-Triangle-Three-Buckets, que conserva la forma
+    visual eligiendo en cada grupo el punto que forma el triángulo de mayor área.
+    :param x: Abscisas de la serie
+    :param y: Ordenadas de la serie
+    :param puntos: Número de puntos de salida
+    :return: Tupla (x_reducida, y_reducida)
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    n = len(y)
+    if puntos >= n or puntos < 3:
+        return x, y
+    bordes = np.linspace(1, n - 1, puntos - 1).astype(int)
+    elegidos = np.empty(puntos, dtype=int)
+    elegidos[0], elegidos[-1] = 0, n - 1
+    a = 0
+    for k in range(puntos - 2):
+        inicio, fin = bordes[k], bordes[k + 1]
+        siguiente = slice(fin, bordes[k + 2] if k + 2 < len(bordes) else n)
+        cx, cy = x[siguiente].mean(), y[siguiente].mean()  # Promedio del grupo siguiente
+        area = abs((x[a] - cx) * (y[inicio:fin] - y[a]) - (x[a] - x[inicio:fin]) * (cy - y[a]))
+        a = inicio + int(np.argmax(area))
+        elegidos[k + 1] = a
+    return x[elegidos], y[elegidos]
+
+
+def densidad(x, y, pixeles, rango=None):
+    """
+    Reduce una curva x-y a las celdas ocupadas de un histograma 2-D del tamaño del lienzo.
+    :param x: Abscisas de la curva
+    :param y: Ordenadas de la curva
+    :param pixeles: Celdas por eje (ancho en píxeles)
+    :param rango: Límites [[xmin, xmax], [ymin, ymax]] (por defecto los de los datos)
+    :return: Tupla (x_centros, y_centros, cuentas) de las celdas ocupadas
+    """
+    x, y = np.ravel(x), np.ravel(y)
+    if rango is None:
+        rango = [[x.min(), x.max()], [y.min(), y.max()]]
+    (x0, x1), (y0, y1) = rango
+    ancho, alto = (x1 - x0) or 1.0, (y1 - y0) or 1.0
+    # Índice de celda de cada punto (más rápido que np.histogram2d para millones de puntos)
+    i = np.clip(((x - x0) * (pixeles / ancho)).astype(np.intp), 0, pixeles - 1)
+    j = np.clip(((y - y0) * (pixeles / alto)).astype(np.intp), 0, pixeles - 1)
+    cuentas = np.bincount(i * pixeles + j, minlength=pixeles * pixeles)
+    ocupadas = np.flatnonzero(cuentas)
+    i, j = np.divmod(ocupadas, pixeles)
+    return x0 + (i + 0.5) * ancho / pixeles, y0 + (j + 0.5) * alto / pixeles, cuentas[ocupadas]
+
+
+class CacheNiveles:
+    """
+    Esta es la clase CacheNiveles, la cual guarda las reducciones ya calculadas por nivel de
+    zoom (tramo visible y ancho en píxeles) con política LRU.
+    """
+
+    def __init__(self, capacidad=64):
+        """
+        Inicializador de la clase CacheNiveles.
+        :param capacidad: Número máximo de reducciones guardadas
+        """
+        self.capacidad = capacidad
+        self._datos = OrderedDict()
+
+    def obtener(self, clave, calcular):
+        """
+        Retorna la reducción guardada con la clave dada o la calcula y la guarda.
+        :param clave: Clave del nivel de zoom (debe incluir la versión de los datos)
+        :param calcular: Función sin argumentos que calcula la reducción
+        :return: Reducción
+        """
+        if clave in self._datos:
+            self._datos.move_to_end(clave)
+            return self._datos[clave]
+        valor = self._datos[clave] = calcular()
+        if len(self._datos) > self.capacidad:
+            self._datos.popitem(last=False)
+        return valor
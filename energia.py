@@ -0,0 +1,258 @@
+"""
+Este módulo contiene el medidor de energía del analizador de línea. La energía
+activa se integra muestra a muestra (Σ v·i·Δt) y la reactiva bloque a bloque o
+ventana a ventana, a medida que llegan los datos. Los registros kWh y kVArh de
+cada nodo y fase se acumulan con suma compensada, se guardan en disco de forma
+atómica y se recuperan al reiniciar. Junto a los registros se guardan las
+huellas de las capturas ya integradas, de modo que volver a cargar la misma
+captura (p. ej. desde la caché al reiniciar el programa) no suma su energía dos
+veces. El costo se calcula con una tabla de tarifas configurable: los bloques de
+consumo se aplican a la energía total del medidor y el costo se reparte entre
+nodos y fases en proporción a su energía.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import hashlib  # Huellas de las capturas integradas
+import json  # Tabla de tarifas
+import os  # Archivos de respaldo
+import numpy as np  # Cálculos matemáticos
+import motor  # Sumas por bloques
+
+_JOULES_KWH = 3.6e6  # Joules (o var·s) por kWh (o kVArh)
+HUELLAS = 1024  # Huellas de capturas integradas que se recuerdan
+
+
+def huella(V, I, bloque=motor.BLOQUE):
+    """
+    Calcula la huella del contenido de una captura, para reconocerla si se vuelve a cargar.
+    :param V: Voltajes (..., muestras); admite np.memmap
+    :param I: Corrientes (..., muestras)
+    :param bloque: Muestras por bloque de la lectura
+    :return: Cadena hexadecimal
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for x in (V, I):
+        h.update(repr((x.shape, x.dtype.str)).encode())
+        for s in motor.bloques(x.shape[-1], bloque):
+            h.update(np.ascontiguousarray(x[..., s]).data)
+    return h.hexdigest()
+
+
+def _kwh(x):
+    """
+    Formatea una energía para las tablas.
+    :param x: Energía [kWh o kVArh]
+    :return: Cadena con seis decimales
+    """
+    return '%.6f' % x
+
+
+class Tarifa:
+    """
+    Esta es la clase Tarifa, la cual calcula el costo de la energía con una tarifa por
+    bloques de consumo y un precio opcional para la energía reactiva.
+    """
+
+    def __init__(self, bloques=((float('inf'), 800.0),), precio_kvarh=0.0):
+        """
+        Inicializador de la clase Tarifa.
+        :param bloques: Tuplas (hasta_kWh, precio por kWh) ordenadas por límite creciente
+        :param precio_kvarh: Precio por kVArh
+        """
+        self.bloques = [(float(limite), float(precio)) for limite, precio in bloques]
+        self.precio_kvarh = float(precio_kvarh)
+
+    @classmethod
+    def desde_archivo(cls, ruta):
+        """
+        Lee la tabla de tarifas de un archivo JSON de la forma
+        {"bloques": [[100, 600], [null, 800]], "precio_kvarh": 50}, donde null es un bloque sin límite.
+        :param ruta: Ruta del archivo JSON
+        :return: Tarifa
+        """
+        with open(ruta) as f:
+            datos = json.load(f)
+        bloques = [(float('inf') if limite is None else limite, precio) for limite, precio in datos['bloques']]
+        return cls(bloques, datos.get('precio_kvarh', 0.0))
+
+    def costo(self, kwh, kvarh=0.0):
+        """
+        Calcula el costo de un consumo.
+        :param kwh: Energía activa [kWh] (escalar o arreglo)
+        :param kvarh: Energía reactiva [kVArh] (escalar o arreglo)
+        :return: Costo con la forma de kwh
+        """
+        kwh = np.asarray(kwh, dtype=float)
+        costo, anterior = np.zeros_like(kwh), 0.0
+        for limite, precio in self.bloques:
+            costo += np.clip(kwh - anterior, 0, limite - anterior) * precio
+            anterior = limite
+        return costo + np.asarray(kvarh, dtype=float) * self.precio_kvarh
+
+    def repartir(self, kwh, kvarh=0.0):
+        """
+        Calcula el costo del consumo total de un medidor y lo reparte entre sus partes (nodos,
+        fases) en proporción a su energía. Los bloques se aplican al total: aplicarlos a cada
+        parte por separado dejaría todo el consumo en los bloques más baratos.
+        :param kwh: Energía activa de cada parte [kWh] (arreglo)
+        :param kvarh: Energía reactiva de cada parte [kVArh] (escalar o arreglo)
+        :return: Costo de cada parte con la forma de kwh; su suma es el costo del total
+        """
+        kwh = np.asarray(kwh, dtype=float)
+        total = kwh.sum()
+        activa = np.divide(kwh * self.costo(total), total, out=np.zeros_like(kwh), where=total > 0)
+        return activa + np.asarray(kvarh, dtype=float) * self.precio_kvarh
+
+    def descripcion(self):
+        """
+        Retorna la descripción corta de la tarifa para las tablas.
+        :return: Cadena, por ejemplo '$800/kWh'
+        """
+        precios = '/'.join('$%g' % precio for _, precio in self.bloques)
+        return precios + '/kWh' + (' + $%g/kVArh' % self.precio_kvarh if self.precio_kvarh else '')
+
+
+class MedidorEnergia:
+    """
+    Esta es la clase MedidorEnergia, la cual mantiene los registros de energía activa y
+    reactiva de cada nodo y fase y los respalda en disco.
+    """
+
+    def __init__(self, n_nodos=3, n_fases=3, fs=6000, archivo=None):
+        """
+        Inicializador de la clase MedidorEnergia. Si el archivo de respaldo existe, los
+        registros continúan desde sus valores.
+        :param n_nodos: Número de nodos medidos
+        :param n_fases: Número de fases por nodo
+        :param fs: Frecuencia de muestreo [Hz]
+        :param archivo: Ruta del respaldo .npz (None para no respaldar)
+        """
+        self.fs = fs
+        self.archivo = archivo
+        self._registros = np.zeros((2, n_nodos, n_fases))  # Energía activa y reactiva [J], [var·s]
+        self._compensacion = np.zeros_like(self._registros)  # Error de redondeo (suma de Kahan)
+        self.segundos = 0.0  # Tiempo integrado
+        self.huellas = []  # Huellas de las capturas integradas, de la más antigua a la más reciente
+        if archivo and os.path.exists(archivo):
+            with np.load(archivo) as datos:
+                if datos['registros'].shape != self._registros.shape:
+                    raise ValueError('El respaldo %s es de %s nodos y fases, no de %s'
+                                     % (archivo, datos['registros'].shape[1:], self._registros.shape[1:]))
+                self._registros[...] = datos['registros']
+                self._compensacion[...] = datos['compensacion']
+                self.segundos = float(datos['segundos'])
+                if 'huellas' in datos.files:  # Los respaldos anteriores no las tienen
+                    self.huellas = datos['huellas'].tolist()
+
+    @property
+    def kwh(self):
+        """
+        Energía activa acumulada por nodo y fase [kWh].
+        """
+        return self._registros[0] / _JOULES_KWH
+
+    @property
+    def kvarh(self):
+        """
+        Energía reactiva acumulada por nodo y fase [kVArh].
+        """
+        return self._registros[1] / _JOULES_KWH
+
+    def _acumular(self, activa, reactiva):
+        """
+        Suma un incremento a los registros con suma compensada, para que millones de
+        incrementos pequeños no pierdan precisión frente al total acumulado.
+        :param activa: Incremento de energía activa por nodo y fase [J]
+        :param reactiva: Incremento de energía reactiva por nodo y fase [var·s]
+        """
+        y = np.stack([activa, reactiva]) - self._compensacion
+        t = self._registros + y
+        self._compensacion[...] = (t - self._registros) - y
+        self._registros[...] = t
+
+    def integrada(self, clave):
+        """
+        Indica si la captura con esta huella ya se integró.
+        :param clave: Huella de la captura (de huella)
+        :return: True si ya está en los registros
+        """
+        return clave in self.huellas
+
+    def integrar(self, V, I, bloque=motor.BLOQUE, clave=None):
+        """
+        Integra un bloque de muestras. La energía activa es Σ v·i·Δt muestra a muestra; la
+        reactiva es Q·Δt del bloque, por lo que conviene que los bloques tengan ciclos completos.
+        :param V: Voltajes (nodos, fases, muestras)
+        :param I: Corrientes (nodos, fases, muestras)
+        :param bloque: Muestras por bloque de las sumas
+        :param clave: Huella de la captura; si se da, se recuerda (y se respalda con guardar)
+        """
+        n = V.shape[-1]
+        if clave is not None:
+            self.huellas = (self.huellas + [clave])[-HUELLAS:]
+        if n == 0:
+            return
+        svv, sii, svi = motor.sumas(V, I, bloque)
+        Q = motor.desde_sumas(svv, sii, svi, n)['Q']
+        self._acumular(svi / self.fs, Q * n / self.fs)
+        self.segundos += n / self.fs
+
+    def integrar_ventana(self, P, Q, segundos):
+        """
+        Integra una ventana ya procesada, por ejemplo las de AnalizadorFlujo con
+        segundos = paso / fs.
+        :param P: Potencia activa por nodo y fase [W]
+        :param Q: Potencia reactiva por nodo y fase [VAr]
+        :param segundos: Duración que representa la ventana
+        """
+        self._acumular(np.asarray(P) * segundos, np.asarray(Q) * segundos)
+        self.segundos += segundos
+
+    def guardar(self):
+        """
+        Guarda los registros en el archivo de respaldo con escritura atómica: un corte durante
+        la escritura deja el respaldo anterior intacto.
+        """
+        if not self.archivo:
+            return
+        directorio = os.path.dirname(os.path.abspath(self.archivo))
+        os.makedirs(directorio, exist_ok=True)
+        temporal = self.archivo + '.%d.tmp' % os.getpid()
+        with open(temporal, 'wb') as f:
+            np.savez(f, registros=self._registros, compensacion=self._compensacion, segundos=self.segundos,
+                     huellas=np.array(self.huellas, dtype=str))
+        os.replace(temporal, self.archivo)
+
+    def reiniciar(self):
+        """
+        Pone los registros en cero y actualiza el respaldo. Las huellas se conservan: las
+        capturas ya integradas no vuelven a contar.
+        """
+        self._registros[...] = 0
+        self._compensacion[...] = 0
+        self.segundos = 0.0
+        self.guardar()
+
+    def tabla(self, tarifa=None):
+        """
+        Retorna la tabla con la energía de cada nodo y fase y su costo.
+        :param tarifa: Tarifa a aplicar (por defecto $800/kWh)
+        :return: Tabla de energía y costos
+        """
+        from tabulate import tabulate  # Crear tablas (solo cuando se muestra la tabla)
+        tarifa = tarifa or Tarifa()
+        E, R = abs(self.kwh), abs(self.kvarh)
+        e_nodo, r_nodo = E.sum(axis=-1), R.sum(axis=-1)
+        costo = tarifa.repartir(e_nodo, r_nodo)  # Bloques sobre el total del medidor
+        filas = [['E' + f + ' [kWh]', *map(_kwh, E[:, k]), '-'] for k, f in enumerate('abc')]
+        filas += [['Etotal [kWh]', *map(_kwh, e_nodo), _kwh(e_nodo.sum())],
+                  ['Qtotal [kVArh]', *map(_kwh, r_nodo), _kwh(r_nodo.sum())],
+                  ['Costo ' + tarifa.descripcion(), *[' '] * (len(e_nodo) + 1)],
+                  ['Costo total', *['$%.2f' % c for c in costo], '$%.2f' % costo.sum()]]
+        encabezados = ['Energía'] + ['Nodo %d ' % (n + 1) for n in range(len(e_nodo))] + ['Total']
+        return tabulate(filas, headers=encabezados, tablefmt="fancy_outline", disable_numparse=True) \
+            + '\nTiempo integrado: %.3f s' % self.segundos
@@ -0,0 +1,54 @@
+"""
+Este módulo contiene las piezas del estimador de fasores del analizador de línea:
+el núcleo del término de la DFT correspondiente a la frecuencia del sistema, la
+ventana de un número entero de ciclos y los ángulos respecto a una referencia. El
+fasor de todos los canales se obtiene en la pasada fusionada de motor.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import functools  # Caché de los núcleos de la DFT
+import numpy as np  # Cálculos matemáticos
+
+
+@functools.lru_cache(maxsize=32)
+def nucleo(N, k):
+    """
+    Retorna el núcleo del término k de una DFT de N puntos, escalado para dar amplitudes pico.
+    :param N: Número de muestras de la ventana
+    :param k: Término de la DFT (número de ciclos dentro de la ventana)
+    :return: Arreglo complejo de solo lectura con N elementos
+    """
+    w = np.exp(-2j * np.pi * k * np.arange(N) / N) * (2 / N)
+    w.flags.writeable = False
+    return w
+
+
+def ventana(n_muestras, fs, f=60, ciclos=None):
+    """
+    Calcula el número de ciclos y de muestras que se usan para estimar los fasores.
+    :param n_muestras: Número de muestras disponibles
+    :param fs: Frecuencia de muestreo [Hz]
+    :param f: Frecuencia del sistema [Hz]
+    :param ciclos: Ciclos a usar (por defecto todos los ciclos completos disponibles)
+    :return: Tupla (ciclos, muestras)
+    """
+    if ciclos is None:
+        ciclos = int(n_muestras * f // fs)
+    N = int(round(ciclos * fs / f))
+    if ciclos < 1 or N > n_muestras:
+        raise ValueError('La señal no contiene %s ciclos completos a %s Hz' % (ciclos, f))
+    return ciclos, N
+
+
+def angulo(X, referencia):
+    """
+    Calcula el ángulo de los fasores respecto a un fasor de referencia.
+    :param X: Fasores
+    :param referencia: Fasor de referencia
+    :return: Ángulos en radianes
+    """
+    return np.angle(X * np.conj(referencia))
@@ -0,0 +1,145 @@
+"""
+Este módulo contiene el analizador en flujo continuo. Las muestras llegan por
+bloques y se mantienen sumas móviles de v², i² y v·i por canal sobre una ventana
+deslizante, junto con una DFT deslizante recursiva para los fasores. Cada muestra
+nueva suma su aporte y resta el de la muestra que sale de la ventana, por lo que
+nunca se vuelve a recorrer la señal.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import numpy as np  # Cálculos matemáticos
+import fasores  # Núcleo de la DFT
+import motor  # Métricas a partir de las sumas
+
+# Cada cuántas vueltas del búfer se recalculan las sumas exactas (evita la deriva numérica)
+_RESINCRONIZAR = 64
+
+
+def ciclos_ventana(tipo, f=60):
+    """
+    Retorna el número de ciclos de las ventanas normalizadas.
+    :param tipo: 'ciclo' (un ciclo), 'iec' (10 ciclos a 50 Hz o 12 ciclos a 60 Hz) o '3s'
+    :param f: Frecuencia del sistema [Hz]
+    :return: Número de ciclos de la ventana
+    """
+    if tipo == 'ciclo':
+        return 1
+    if tipo == 'iec':
+        return 10 if f == 50 else 12
+    if tipo == '3s':
+        return int(3 * f)
+    raise ValueError('Tipo de ventana desconocido: %s' % tipo)
+
+
+class AnalizadorFlujo:
+    """
+    Esta es la clase AnalizadorFlujo, la cual calcula RMS, P, Q, S, PF y fasores por ventana
+    sobre señales que llegan por bloques, con actualizaciones O(1) por muestra.
+    """
+
+    def __init__(self, n_nodos=3, n_fases=3, fs=6000, f=60, ciclos=1, paso=None):
+        """
+        Inicializador de la clase AnalizadorFlujo.
+        :param n_nodos: Número de nodos medidos
+        :param n_fases: Número de fases por nodo
+        :param fs: Frecuencia de muestreo [Hz]
+        :param f: Frecuencia del sistema [Hz]
+        :param ciclos: Ciclos de la ventana (ver ciclos_ventana)
+        :param paso: Muestras entre ventanas emitidas (por defecto una ventana completa)
+        """
+        self.fs = fs
+        self.f = f
+        self.ciclos = ciclos
+        self.W = int(round(ciclos * fs / f))  # Muestras por ventana
+        self.paso = paso or self.W
+        forma = (n_nodos, n_fases)
+        self._v = np.zeros(forma + (self.W,))  # Búfer circular de voltajes
+        self._i = np.zeros(forma + (self.W,))  # Búfer circular de corrientes
+        self._svv = np.zeros(forma)  # Sumas móviles
+        self._sii = np.zeros(forma)
+        self._svi = np.zeros(forma)
+        self._Xv = np.zeros(forma, dtype=complex)  # DFT deslizante (fasores)
+        self._Xi = np.zeros(forma, dtype=complex)
+        self._w = fasores.nucleo(self.W, ciclos)
+        self.muestras = 0  # Total de muestras recibidas
+
+    def agregar(self, V, I):
+        """
+        Procesa un bloque de muestras.
+        :param V: Voltajes (nodos, fases, muestras del bloque)
+        :param I: Corrientes (nodos, fases, muestras del bloque)
+        :return: Lista con las métricas de cada ventana completada en el bloque
+        """
+        V = np.asarray(V, dtype=float)
+        I = np.asarray(I, dtype=float)
+        ventanas = []
+        # Trozos de a lo sumo una ventana: cada posición del búfer se escribe una vez por trozo
+        for inicio in range(0, V.shape[-1], self.W):
+            fin = inicio + self.W
+            ventanas += self._procesar(V[..., inicio:fin], I[..., inicio:fin])
+        return ventanas
+
+    def _procesar(self, v, i):
+        """
+        Actualiza las sumas móviles con un trozo de hasta W muestras.
+        :param v: Voltajes del trozo
+        :param i: Corrientes del trozo
+        :return: Lista con las métricas de las ventanas completadas en el trozo
+        """
+        b = v.shape[-1]
+        t = self.muestras + np.arange(1, b + 1)  # Muestras recibidas tras cada muestra del trozo
+        pos = (t - 1) % self.W
+        v_sal, i_sal = self._v[..., pos], self._i[..., pos]  # Muestras que salen de la ventana
+        w = self._w[pos]
+
+        # Aporte neto de cada muestra (entra - sale), acumulado a lo largo del trozo
+        dvv = np.cumsum(v * v - v_sal * v_sal, axis=-1)
+        dii = np.cumsum(i * i - i_sal * i_sal, axis=-1)
+        dvi = np.cumsum(v * i - v_sal * i_sal, axis=-1)
+        dXv = np.cumsum((v - v_sal) * w, axis=-1)
+        dXi = np.cumsum((i - i_sal) * w, axis=-1)
+
+        ventanas = []
+        emitir = np.flatnonzero((t >= self.W) & ((t - self.W) % self.paso == 0))
+        for k in emitir:
+            m = motor.desde_sumas(self._svv + dvv[..., k], self._sii + dii[..., k],
+                                  self._svi + dvi[..., k], self.W)
+            m['V_fasor'] = self._Xv + dXv[..., k]
+            m['I_fasor'] = self._Xi + dXi[..., k]
+            m['muestra'] = int(t[k])  # Fin (exclusivo) de la ventana
+            ventanas.append(m)
+
+        # Estado al final del trozo
+        self._svv += dvv[..., -1]
+        self._sii += dii[..., -1]
+        self._svi += dvi[..., -1]
+        self._Xv += dXv[..., -1]
+        self._Xi += dXi[..., -1]
+        self._v[..., pos] = v
+        self._i[..., pos] = i
+        vueltas = self.muestras // self.W
+        self.muestras += b
+        if self.muestras // self.W // _RESINCRONIZAR > vueltas // _RESINCRONIZAR:
+            self._resincronizar()
+        return ventanas
+
+    def _resincronizar(self):
+        """
+        Recalcula las sumas exactas desde el búfer para eliminar el error acumulado.
+        """
+        self._svv, self._sii, self._svi = motor.sumas(self._v, self._i)
+        self._Xv = self._v @ self._w
+        self._Xi = self._i @ self._w
+
+    def ventanas(self, bloques):
+        """
+        Analiza un flujo de bloques, por ejemplo un generador.
+        :param bloques: Iterable de tuplas (V, I) con forma (nodos, fases, muestras del bloque)
+        :return: Generador con las métricas de cada ventana
+        """
+        for V, I in bloques:
+            yield from self.agregar(V, I)
@@ -0,0 +1,207 @@
+"""
+Este módulo contiene el seguimiento de la frecuencia del sistema y el
+remuestreo a ciclos enteros. La frecuencia se estima por ventanas a partir de
+los cruces ascendentes por cero de todos los voltajes, interpolados linealmente
+entre muestras; todos los cruces de todos los canales se encuentran con
+operaciones vectorizadas, sin recorrer las ventanas en Python. Con la frecuencia
+de cada ventana se arma el mapa entre ciclos y tiempo, y todas las señales se
+remuestrean a la vez (interpolación cúbica) a un número fijo de muestras por
+ciclo. Así cualquier frecuencia de muestreo y cualquier desvío de frecuencia
+quedan en ventanas de ciclos enteros, sin fuga espectral en los fasores ni
+errores en P y Q. El remuestreo avanza por bloques de salida; con grabaciones
+mapeadas en memoria, las señales remuestreadas van a archivos temporales
+mapeados, de modo que la memoria no crece con el largo de la grabación.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import tempfile  # Señales remuestreadas en disco
+import warnings  # Ventanas sin cruces
+import numpy as np  # Cálculos matemáticos
+import motor  # División en bloques
+
+CICLOS = 12  # Ciclos nominales por ventana de estimación
+MUESTRAS_CICLO = 100  # Muestras por ciclo de las señales remuestreadas
+
+
+def cruces(x, fs, f=60):
+    """
+    Encuentra los cruces ascendentes por cero de cada canal, interpolados linealmente entre
+    las dos muestras que los rodean. Los rebotes por ruido (cruces a menos de medio periodo
+    nominal del anterior) se descartan.
+    :param x: Señales (canales, muestras), sin componente continua
+    :param fs: Frecuencia de muestreo [Hz]
+    :param f: Frecuencia nominal del sistema [Hz]
+    :return: Tupla (canal, t) ordenada por canal y por tiempo; t en segundos
+    """
+    a, b = x[:, :-1], x[:, 1:]
+    canal, n = np.nonzero((a < 0) & (b >= 0))
+    ya, yb = a[canal, n], b[canal, n]
+    t = (n + ya / (ya - yb)) / fs
+    nuevo = np.ones(len(t), dtype=bool)
+    nuevo[1:] = (canal[1:] != canal[:-1]) | (np.diff(t) > 0.5 / f)
+    return canal[nuevo], t[nuevo]
+
+
+def estimar(x, fs, f=60, ciclos=CICLOS, bloque=motor.BLOQUE):
+    """
+    Estima la frecuencia del sistema en ventanas consecutivas de ciclos nominales. En cada
+    canal y ventana la frecuencia es (cruces - 1) / (último cruce - primer cruce); la del
+    sistema es la mediana de los canales. Las ventanas sin al menos dos cruces en algún
+    canal (p. ej. durante una interrupción) toman la frecuencia nominal.
+    :param x: Voltajes (..., muestras), en voltios o en cuentas del ADC; admite np.memmap
+    :param fs: Frecuencia de muestreo [Hz]
+    :param f: Frecuencia nominal del sistema [Hz]
+    :param ciclos: Ciclos nominales por ventana
+    :param bloque: Muestras por bloque (se redondea a ventanas completas)
+    :return: Frecuencia de cada ventana [Hz], con ventanas de round(ciclos·fs/f) muestras
+             (la última incluye las muestras sobrantes)
+    """
+    n = x.shape[-1]
+    W = int(round(ciclos * fs / f))
+    m = max(1, n // W)
+    x = x.reshape(-1, n)
+    # La componente continua desplaza los cruces: se resta la media de cada canal
+    continua = sum(np.asarray(x[:, s], dtype=float).sum(axis=-1) for s in motor.bloques(n, bloque))[:, None] / n
+    frecuencias = np.full(m, np.nan)
+    L = max(1, bloque // W) * W
+    for inicio in range(0, m * W, L):
+        fin = n if inicio + L >= m * W else inicio + L  # El último bloque toma las muestras sobrantes
+        # Una muestra de más: el cruce entre dos bloques pertenece al bloque de la izquierda
+        tramo = np.asarray(x[:, inicio:min(fin + 1, n)], dtype=float) - continua
+        canal, t = cruces(tramo, fs, f)
+        t += inicio / fs
+        j0, j1 = inicio // W, m if fin == n else fin // W  # Ventanas del bloque
+        k = j1 - j0
+        ventana = np.clip((t * fs // W).astype(np.int64), j0, j1 - 1) - j0
+        # Primer y último cruce de cada (canal, ventana): los cruces están ordenados por ambos
+        grupo = canal * k + ventana
+        borde = np.flatnonzero(np.r_[True, grupo[1:] != grupo[:-1], True])
+        cuenta = np.diff(borde)
+        duracion = t[borde[1:] - 1] - t[borde[:-1]]
+        valida = cuenta > 1
+        estimada = np.full((x.shape[0], k), np.nan)
+        g = grupo[borde[:-1]][valida]
+        estimada[g // k, g % k] = (cuenta[valida] - 1) / duracion[valida]
+        with np.errstate(all='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # Ventanas sin cruces en ningún canal
+            frecuencias[j0:j1] = np.nanmedian(estimada, axis=0)
+    return np.where(np.isnan(frecuencias), f, frecuencias)
+
+
+def tiempos(n_muestras, fs, frecuencias, W, muestras_ciclo=MUESTRAS_CICLO, tramo=slice(None)):
+    """
+    Calcula los instantes de las muestras remuestreadas: muestras_ciclo por ciclo, con la
+    frecuencia constante dentro de cada ventana de estimar. Los ciclos acumulados en los
+    bordes de las ventanas se invierten con una sola interpolación.
+    :param n_muestras: Muestras de la señal original
+    :param fs: Frecuencia de muestreo original [Hz]
+    :param frecuencias: Frecuencia de cada ventana (de estimar)
+    :param W: Muestras por ventana (la última incluye las sobrantes)
+    :param muestras_ciclo: Muestras por ciclo de la señal remuestreada
+    :param tramo: Muestras remuestreadas pedidas (por defecto todas); los bloques se piden por
+                  tramos para no crear un arreglo del largo de la señal
+    :return: Instantes [s] de las muestras del tramo; la señal completa abarca ciclos enteros
+    """
+    m = len(frecuencias)
+    bordes = np.r_[np.arange(m) * W, n_muestras] / fs
+    acumulados = np.r_[0, np.cumsum(frecuencias * np.diff(bordes))]  # Ciclos hasta cada borde
+    completos = int(acumulados[-1] + 1e-9)
+    inicio, fin, _ = tramo.indices(completos * muestras_ciclo)
+    return np.interp(np.arange(inicio, fin) / muestras_ciclo, acumulados, bordes)
+
+
+def muestras_remuestreadas(n_muestras, fs, frecuencias, W, muestras_ciclo=MUESTRAS_CICLO):
+    """
+    Cuenta las muestras de la señal remuestreada (ciclos completos por muestras_ciclo).
+    :param n_muestras: Muestras de la señal original
+    :param fs: Frecuencia de muestreo original [Hz]
+    :param frecuencias: Frecuencia de cada ventana (de estimar)
+    :param W: Muestras por ventana (la última incluye las sobrantes)
+    :param muestras_ciclo: Muestras por ciclo de la señal remuestreada
+    :return: Número de muestras
+    """
+    duraciones = np.diff(np.r_[np.arange(len(frecuencias)) * W, n_muestras]) / fs
+    return int(np.sum(frecuencias * duraciones) + 1e-9) * muestras_ciclo
+
+
+def interpolar(x, posiciones, bloque=motor.BLOQUE, dtype=None, salida=None):
+    """
+    Remuestrea todos los canales en las mismas posiciones fraccionarias con interpolación
+    cúbica (Catmull-Rom), por bloques de salida.
+    :param x: Señales (..., muestras); admite np.memmap y cuentas enteras
+    :param posiciones: Posiciones crecientes en muestras de x, entre 0 y muestras - 1
+    :param bloque: Muestras de salida por bloque
+    :param dtype: Tipo real de la salida (por defecto float32 si x es float32 y float64 si no)
+    :param salida: Arreglo (..., len(posiciones)) donde se escribe el resultado (por defecto uno nuevo)
+    :return: Arreglo (..., len(posiciones))
+    """
+    n = x.shape[-1]
+    if dtype is None:
+        dtype = np.float32 if x.dtype == np.float32 else np.float64
+    y = np.empty(x.shape[:-1] + (len(posiciones),), dtype=dtype) if salida is None else salida
+    for s in motor.bloques(len(posiciones), bloque):
+        p = posiciones[s]
+        i = np.floor(p).astype(np.int64)
+        u = p - i
+        lo, hi = max(int(i[0]) - 1, 0), min(int(i[-1]) + 3, n)
+        tramo = np.asarray(x[..., lo:hi], dtype=float)  # Solo las muestras que usa el bloque
+        indice = [np.clip(i + d, 0, n - 1) - lo for d in (-1, 0, 1, 2)]
+        u2, u3 = u * u, u * u * u
+        pesos = (0.5 * (-u3 + 2 * u2 - u), 0.5 * (3 * u3 - 5 * u2 + 2), 0.5 * (-3 * u3 + 4 * u2 + u),
+                 0.5 * (u3 - u2))
+        y[..., s] = sum(tramo[..., k] * w for k, w in zip(indice, pesos))
+    return y
+
+
+def _arreglo(forma, dtype, en_disco):
+    """
+    Crea el arreglo de una señal remuestreada, en memoria o en un archivo temporal anónimo
+    mapeado en memoria (se borra solo cuando se libera el arreglo).
+    :param forma: Forma del arreglo
+    :param dtype: Tipo de dato
+    :param en_disco: Si el arreglo va en disco
+    :return: np.ndarray o np.memmap
+    """
+    if not en_disco:
+        return np.empty(forma, dtype=dtype)
+    with tempfile.TemporaryFile() as archivo:  # El mapa conserva el archivo abierto
+        return np.memmap(archivo, dtype=dtype, mode='w+', shape=forma)
+
+
+def remuestrear(V, I, fs, f=60, muestras_ciclo=MUESTRAS_CICLO, ciclos=CICLOS, bloque=motor.BLOQUE, en_disco=None):
+    """
+    Sigue la frecuencia de los voltajes y remuestrea voltajes y corrientes a muestras_ciclo
+    muestras por ciclo y un número entero de ciclos. La frecuencia se estima sobre todos los
+    canales de voltaje a la vez (una sola frecuencia del sistema por ventana). Las señales se
+    remuestrean por bloques de salida, así que la memoria de trabajo no depende de su largo.
+    :param V: Voltajes (..., nodos, fases, muestras)
+    :param I: Corrientes con la forma de V
+    :param fs: Frecuencia de muestreo [Hz] (cualquiera)
+    :param f: Frecuencia nominal del sistema [Hz]
+    :param muestras_ciclo: Muestras por ciclo de la salida
+    :param ciclos: Ciclos nominales por ventana de estimación
+    :param bloque: Muestras por bloque (para 9 canales; con más canales se acorta)
+    :param en_disco: Si las señales remuestreadas van en archivos temporales mapeados en memoria
+                     (por defecto, si V es un np.memmap)
+    :return: Tupla (V, I, frecuencias) con las señales remuestreadas y la frecuencia de cada
+             ventana; los instantes originales salen de tiempos
+    """
+    frecuencias = estimar(V, fs, f, ciclos, bloque)
+    W = int(round(ciclos * fs / f))
+    total = muestras_remuestreadas(V.shape[-1], fs, frecuencias, W, muestras_ciclo)
+    if total == 0:
+        raise ValueError('La señal no contiene un ciclo completo')
+    if en_disco is None:
+        en_disco = isinstance(V, np.memmap)
+    dtype = np.float32 if V.dtype == np.float32 else np.float64
+    Vr, Ir = (_arreglo(X.shape[:-1] + (total,), dtype, en_disco) for X in (V, I))
+    paso = motor.bloque_canales(bloque, int(np.prod(V.shape[:-1])))
+    for s in motor.bloques(total, paso):
+        posiciones = np.minimum(tiempos(V.shape[-1], fs, frecuencias, W, muestras_ciclo, s) * fs, V.shape[-1] - 1)
+        interpolar(V, posiciones, paso, dtype, Vr[..., s])
+        interpolar(I, posiciones, paso, dtype, Ir[..., s])
+    return Vr, Ir, frecuencias
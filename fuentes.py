@@ -0,0 +1,249 @@
+"""
+Este módulo contiene las fuentes de señales del analizador de línea. Hay tres
+fuentes intercambiables: una función generadora, un directorio de capturas
+.npy/.npz y una caché binaria local. Las señales generadas se guardan una sola
+vez en la caché, de modo que los arranques siguientes las leen con una única
+lectura binaria, sin red y sin generar código.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import glob  # Búsqueda de capturas
+import hashlib  # Claves de la caché
+import importlib  # Importación del módulo de señales
+import os  # Rutas y archivos
+import sys  # Ruta de búsqueda de módulos
+import numpy as np  # Cálculos matemáticos
+
+# Módulo de señales del curso y directorio de la caché local
+URL = 'https://raw.githubusercontent.com/JulianDPastrana/signal_analysis/main/seniales_sep.py'
+CACHE = os.environ.get('ANALIZADOR_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'analizador'))
+ESPERA = 30  # Tiempo máximo de la descarga [s]
+
+
+def a_arreglos(data):
+    """
+    Convierte el diccionario {"Node k": (V, I)} de signal_generation en arreglos apilados.
+    :param data: Diccionario con las señales de cada nodo
+    :return: Tupla (V, I) con forma (nodos, fases, muestras)
+    """
+    nodos = sorted(data, key=lambda n: int(n.split()[-1]))
+    V = np.stack([np.asarray(data[n][0], dtype=float) for n in nodos])
+    I = np.stack([np.asarray(data[n][1], dtype=float) for n in nodos])
+    return V, I
+
+
+def senales_curso(directorio=CACHE):
+    """
+    Genera las señales del curso con signal_generation(). El módulo seniales_sep.py solo
+    se descarga si no se encuentra ya en el directorio indicado.
+    :param directorio: Directorio donde se guarda seniales_sep.py
+    :return: Diccionario {"Node k": (V, I)}
+    """
+    ruta = os.path.join(directorio, 'seniales_sep.py')
+    if not os.path.exists(ruta):
+        import requests  # Solo se necesita la primera vez
+        os.makedirs(directorio, exist_ok=True)
+        r = requests.get(URL, timeout=ESPERA)  # Sin límite, una red caída bloquea el arranque
+        r.raise_for_status()
+        temporal = ruta + '.%d.tmp' % os.getpid()
+        with open(temporal, 'w') as f:
+            f.write(r.text)
+        os.replace(temporal, ruta)  # Una descarga interrumpida no deja un módulo a medias
+    if directorio not in sys.path:
+        sys.path.insert(0, directorio)
+    return importlib.import_module('seniales_sep').signal_generation()
+
+
+class FuenteGenerador:
+    """
+    Fuente que obtiene las señales de una función generadora.
+    """
+
+    def __init__(self, generador, nombre=None, **parametros):
+        """
+        Inicializador de la clase FuenteGenerador.
+        :param generador: Función que retorna (V, I) o el diccionario {"Node k": (V, I)}
+        :param nombre: Nombre de la fuente para la clave de la caché
+        :param parametros: Parámetros con los que se llama al generador
+        """
+        self.generador = generador
+        self.nombre = nombre or generador.__module__ + '.' + generador.__qualname__
+        self.parametros = parametros
+
+    def clave(self):
+        """
+        Retorna la clave de la caché de esta fuente, según su nombre y parámetros.
+        :return: Cadena hexadecimal
+        """
+        texto = repr((self.nombre, sorted(self.parametros.items())))
+        return hashlib.sha1(texto.encode()).hexdigest()[:16]
+
+    def cargar(self):
+        """
+        Ejecuta el generador.
+        :return: Tupla (V, I) con forma (nodos, fases, muestras)
+        """
+        data = self.generador(**self.parametros)
+        return a_arreglos(data) if isinstance(data, dict) else tuple(np.asarray(x) for x in data)
+
+
+class FuenteDirectorio:
+    """
+    Fuente que lee capturas guardadas en un directorio. Cada captura es un .npz con los
+    arreglos 'V' e 'I', o un .npy con forma (2, nodos, fases, muestras).
+    """
+
+    def __init__(self, ruta, captura=None):
+        """
+        Inicializador de la clase FuenteDirectorio.
+        :param ruta: Directorio de las capturas
+        :param captura: Nombre del archivo a leer (por defecto el primero en orden alfabético)
+        """
+        self.ruta = ruta
+        self.captura = captura
+
+    def capturas(self):
+        """
+        Lista las capturas del directorio.
+        :return: Lista de rutas .npy/.npz ordenadas
+        """
+        return sorted(glob.glob(os.path.join(self.ruta, '*.np[yz]')))
+
+    def clave(self):
+        """
+        Retorna la clave de la caché de esta fuente.
+        :return: Cadena hexadecimal
+        """
+        texto = repr((os.path.abspath(self.ruta), self.captura))
+        return hashlib.sha1(texto.encode()).hexdigest()[:16]
+
+    def cargar(self):
+        """
+        Lee la captura seleccionada.
+        :return: Tupla (V, I) con forma (nodos, fases, muestras)
+        """
+        if self.captura is not None:
+            return leer_captura(os.path.join(self.ruta, self.captura))
+        capturas = self.capturas()
+        if not capturas:
+            raise FileNotFoundError('No hay capturas .npy/.npz en %s' % self.ruta)
+        return leer_captura(capturas[0])
+
+
+class FuenteCache:
+    """
+    Fuente que guarda una instantánea binaria de otra fuente y la reutiliza en los
+    arranques siguientes.
+    """
+
+    def __init__(self, fuente, directorio=CACHE):
+        """
+        Inicializador de la clase FuenteCache.
+        :param fuente: Fuente original (se usa solo si la instantánea no existe)
+        :param directorio: Directorio de la caché
+        """
+        self.fuente = fuente
+        self.directorio = directorio
+
+    def ruta(self):
+        """
+        Retorna la ruta de la instantánea de la fuente original.
+        :return: Ruta del archivo .npy
+        """
+        return os.path.join(self.directorio, self.fuente.clave() + '.npy')
+
+    def clave(self):
+        """
+        Retorna la clave de la caché (la misma de la fuente original).
+        :return: Cadena hexadecimal
+        """
+        return self.fuente.clave()
+
+    def cargar(self):
+        """
+        Lee la instantánea con una sola lectura sin conversión (mapeo en memoria). Si no
+        existe, la genera a partir de la fuente original y la guarda.
+        :return: Tupla (V, I) con forma (nodos, fases, muestras)
+        """
+        ruta = self.ruta()
+        if not os.path.exists(ruta):
+            V, I = self.fuente.cargar()
+            os.makedirs(self.directorio, exist_ok=True)
+            temporal = ruta + '.%d.tmp' % os.getpid()
+            with open(temporal, 'wb') as f:
+                np.save(f, np.stack([V, I]).astype(float))
+            os.replace(temporal, ruta)  # Escritura atómica
+        X = np.load(ruta, mmap_mode='r')
+        return X[0], X[1]
+
+
+def sintetizar(n_muestras, n_nodos=3, fs=6000, f=60, semilla=0, ruta=None, bloque=1 << 20):
+    """
+    Genera señales trifásicas sintéticas deterministas (sin descargas): fundamental con
+    amplitud y desfase de carga propios de cada nodo, 5.º armónico del 3 % y ruido. Las mismas
+    entradas producen siempre las mismas muestras.
+    :param n_muestras: Muestras por canal
+    :param n_nodos: Número de nodos
+    :param fs: Frecuencia de muestreo [Hz]
+    :param f: Frecuencia del sistema [Hz]
+    :param semilla: Semilla del generador aleatorio
+    :param ruta: Archivo .npy (2, nodos, 3, muestras) donde se escriben las señales por bloques,
+                 para grabaciones que no caben en memoria (por defecto se crean en memoria)
+    :param bloque: Muestras generadas por bloque
+    :return: Tupla (V, I) con forma (nodos, 3, muestras)
+    """
+    rng = np.random.default_rng(semilla)
+    Vp = 120 * np.sqrt(2) * (1 + 0.05 * rng.uniform(-1, 1, (n_nodos, 1, 1)))  # Amplitudes pico
+    Ip = 10 * np.sqrt(2) * rng.uniform(0.5, 1.5, (n_nodos, 1, 1))
+    carga = np.deg2rad(rng.uniform(10, 40, (n_nodos, 1, 1)))  # Ángulo de la carga
+    fases = np.deg2rad([0, -120, 120])[:, None]
+    if ruta is None:
+        X = np.empty((2, n_nodos, 3, n_muestras))
+    else:
+        X = np.lib.format.open_memmap(ruta, mode='w+', dtype=float, shape=(2, n_nodos, 3, n_muestras))
+    for k, inicio in enumerate(range(0, n_muestras, bloque)):
+        wt = 2 * np.pi * f * np.arange(inicio, min(inicio + bloque, n_muestras)) / fs
+        ruido = np.random.default_rng((semilla, k))  # Un generador por bloque: resultado reproducible
+        X[0, ..., inicio:inicio + len(wt)] = Vp * (np.cos(wt + fases) + 0.03 * np.cos(5 * (wt + fases))) \
+            + ruido.normal(0, 0.5, (n_nodos, 3, len(wt)))
+        X[1, ..., inicio:inicio + len(wt)] = Ip * (np.cos(wt + fases - carga) + 0.03 * np.cos(5 * (wt + fases)))\
+            + ruido.normal(0, 0.05, (n_nodos, 3, len(wt)))
+    if ruta is not None:
+        X.flush()
+        X = np.load(ruta, mmap_mode='r')
+    return X[0], X[1]
+
+
+def leer_captura(ruta):
+    """
+    Lee una captura .npz (arreglos 'V' e 'I') o .npy (forma (2, nodos, fases, muestras)).
+    :param ruta: Ruta del archivo
+    :return: Tupla (V, I) con forma (nodos, fases, muestras)
+    """
+    if ruta.endswith('.npz'):
+        with np.load(ruta) as datos:
+            return datos['V'], datos['I']
+    X = np.load(ruta, mmap_mode='r')
+    return X[0], X[1]
+
+
+def fuente_predeterminada():
+    """
+    Retorna la fuente que usan la interfaz y el analizador: las señales del curso guardadas
+    en la caché local.
+    :return: Fuente de señales
+    """
+    return FuenteCache(FuenteGenerador(senales_curso, nombre='seniales_sep'))
+
+
+def cargar_senales(fuente=None):
+    """
+    Carga las señales de una fuente.
+    :param fuente: Fuente de señales (por defecto fuente_predeterminada())
+    :return: Tupla (V, I) con forma (nodos, fases, muestras)
+    """
+    return (fuente or fuente_predeterminada()).cargar()
@@ -0,0 +1,459 @@
+"""
+Este programa es la entrada de muestras de muchos medidores a la vez. Cada
+medidor envía por TCP tramas binarias con bloques de muestras; un solo ciclo de
+asyncio atiende todas las conexiones. Las muestras de cada trama se decodifican
+con np.frombuffer directamente en el anillo preasignado de su medidor (sin un
+objeto de Python por muestra), dividido en ranuras de una ventana. Cada ventana
+completa queda lista para el análisis; un único analizador toma las ventanas
+listas de todos los medidores, las apila con los medidores como alimentadores
+y calcula sus métricas en un ejecutor, sin bloquear el ciclo de eventos.
+
+Si un medidor no tiene ranuras libres porque el análisis va atrasado, con la
+política 'esperar' se deja de leer su conexión (el control de flujo de TCP frena
+al medidor) y con 'descartar' se descarta su ventana lista más antigua. Cada
+medidor cuenta sus tramas tardías o repetidas, las muestras perdidas en huecos
+de la secuencia, las ventanas descartadas, las esperas y los reinicios: si un
+medidor abre una conexión nueva y empieza en una secuencia menor (se reinició),
+su secuencia vuelve a empezar allí en lugar de rechazar sus tramas como tardías.
+
+Trama (little endian):
+    cabecera  'MED1', medidor (u32), secuencia de la primera muestra (u64), muestras (u16),
+              nodos (u8), fases (u8)
+    datos     float32 con forma (2, nodos, fases, muestras): voltajes y corrientes
+
+Uso: python ingesta.py servidor --puerto 8760
+     python ingesta.py simulador --puerto 8760 --medidores 200 --duracion 10
+     python ingesta.py demo --medidores 200 --duracion 10
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import argparse  # Argumentos de la línea de comandos
+import asyncio  # Conexiones concurrentes en un solo hilo
+import collections  # Ventanas listas por medidor
+import struct  # Cabecera de las tramas
+import sys  # Mensajes
+import time  # Tiempos de las ventanas
+import numpy as np  # Cálculos matemáticos
+from nucleo import AnalizadorNumerico  # Núcleo numérico (solo NumPy)
+
+MAGIA = b'MED1'
+CABECERA = struct.Struct('<4sIQHBB')
+DATOS = np.dtype('<f4')
+
+
+def trama(medidor, secuencia, V, I):
+    """
+    Codifica una trama.
+    :param medidor: Identificador del medidor
+    :param secuencia: Número de la primera muestra del bloque en el flujo del medidor
+    :param V: Voltajes (nodos, fases, muestras)
+    :param I: Corrientes (nodos, fases, muestras)
+    :return: bytes
+    """
+    nodos, fases, muestras = np.shape(V)
+    datos = np.stack([V, I]).astype(DATOS, copy=False)
+    return CABECERA.pack(MAGIA, medidor, secuencia, muestras, nodos, fases) + datos.tobytes()
+
+
+def _metricas(ventanas, fs, f):
+    """
+    Calcula las métricas de un lote de ventanas de varios medidores en una sola pasada del
+    núcleo, con los medidores como alimentadores. Se ejecuta en el ejecutor.
+    :param ventanas: Lista de arreglos (2, nodos, fases, W)
+    :param fs: Frecuencia de muestreo [Hz]
+    :param f: Frecuencia del sistema [Hz]
+    :return: Diccionario de métricas con el medidor en el primer eje, con 'V_fasor' e 'I_fasor'
+    """
+    X = np.stack(ventanas)  # (ventanas, 2, nodos, fases, W): copia contigua, libera los anillos
+    a = AnalizadorNumerico(X[:, 0], X[:, 1], fs=fs, f=f)
+    metricas = dict(a.metricas())
+    _, _, _, metricas['V_fasor'], metricas['I_fasor'] = a.pasada()
+    return metricas
+
+
+class _Medidor:
+    """
+    Estado de un medidor: anillo de ranuras de una ventana, ranuras listas y contadores.
+    """
+
+    def __init__(self, identificador, forma, W, profundidad):
+        """
+        Inicializador del estado de un medidor.
+        :param identificador: Identificador del medidor
+        :param forma: Forma de los canales (nodos, fases)
+        :param W: Muestras por ventana
+        :param profundidad: Ranuras del anillo
+        """
+        self.identificador = identificador
+        self.anillo = np.zeros((profundidad, 2) + forma + (W,), dtype=DATOS)
+        self.inicio = np.zeros(profundidad, dtype=np.int64)  # Secuencia de la primera muestra de cada ranura
+        self.libres = collections.deque(range(1, profundidad))
+        self.listas = collections.deque()  # Ranuras completas, de la más antigua a la más reciente
+        self.ranura = 0  # Ranura que se está llenando
+        self.posicion = 0  # Muestras escritas en la ranura actual
+        self.esperada = None  # Secuencia de la próxima muestra
+        self.liberada = asyncio.Event()
+        self.contadores = dict.fromkeys(('tramas', 'muestras', 'ventanas', 'tardias', 'perdidas', 'huecos',
+                                         'descartadas', 'esperas', 'reinicios'), 0)
+
+
+class Ingesta:
+    """
+    Esta es la clase Ingesta, la cual recibe las tramas de muchos medidores en un ciclo de
+    asyncio, arma ventanas en anillos preasignados y las analiza por lotes en un ejecutor.
+    """
+
+    def __init__(self, forma=(3, 3), fs=6000, f=60, ciclos=12, profundidad=4, lote=256, politica='esperar',
+                 ejecutor=None, al_resultado=None):
+        """
+        Inicializador de la clase Ingesta.
+        :param forma: Forma de los canales de cada medidor (nodos, fases)
+        :param fs: Frecuencia de muestreo [Hz]
+        :param f: Frecuencia del sistema [Hz]
+        :param ciclos: Ciclos por ventana (12 ciclos a 60 Hz, como en IEC 61000-4-30)
+        :param profundidad: Ranuras del anillo de cada medidor (ventanas en memoria)
+        :param lote: Ventanas por lote de análisis como máximo
+        :param politica: 'esperar' (frena la conexión del medidor) o 'descartar' (descarta su
+                         ventana lista más antigua) cuando el medidor no tiene ranuras libres
+        :param ejecutor: Ejecutor del análisis (por defecto el del ciclo de eventos)
+        :param al_resultado: Función (medidor, ventana) llamada con cada ventana analizada; la
+                             ventana es un diccionario como los de AnalizadorFlujo.agregar
+        """
+        if politica not in ('esperar', 'descartar'):
+            raise ValueError('Política desconocida: %s' % politica)
+        if profundidad < 2:
+            raise ValueError('El anillo necesita al menos 2 ranuras')
+        self.forma = tuple(forma)
+        self.fs = fs
+        self.f = f
+        self.W = int(round(ciclos * fs / f))  # Muestras por ventana
+        self.profundidad = profundidad
+        self.lote = lote
+        self.politica = politica
+        self.ejecutor = ejecutor
+        self.al_resultado = al_resultado
+        self.medidores = {}
+        self.ultimas = {}  # Última ventana analizada de cada medidor
+        self.invalidas = 0  # Tramas con cabecera o forma inválida (cierran la conexión)
+        self.lotes = 0
+        self.errores = 0  # Lotes cuyo análisis falló y ventanas cuyo al_resultado falló
+        self.conexiones = 0  # Conexiones abiertas
+        self._en_curso = False  # Si hay un lote en el ejecutor
+        self._hay_listas = asyncio.Event()  # Desde Python 3.10 no queda atado a un ciclo al crearlo
+        self._analisis = None
+
+    # ------------------------------ Recepción ------------------------------
+    async def iniciar(self, host='127.0.0.1', puerto=8760):
+        """
+        Arranca el análisis y el servidor TCP.
+        :param host: Dirección de escucha
+        :param puerto: Puerto (0 para uno libre)
+        :return: asyncio.Server
+        """
+        self._analisis = asyncio.create_task(self._analizar())
+        return await asyncio.start_server(self._conexion, host, puerto)
+
+    async def vaciar(self, intervalo=0.01):
+        """
+        Espera a que se cierren todas las conexiones y se analicen todas las ventanas listas.
+        :param intervalo: Intervalo de revisión [s]
+        """
+        while self.conexiones or self._en_curso or any(m.listas for m in self.medidores.values()):
+            await asyncio.sleep(intervalo)
+
+    async def cerrar(self):
+        """
+        Detiene el análisis (las ventanas listas que no se alcanzaron a analizar se pierden).
+        """
+        if self._analisis is not None:
+            self._analisis.cancel()
+            try:
+                await self._analisis
+            except asyncio.CancelledError:
+                pass
+
+    async def _conexion(self, lector, escritor):
+        """
+        Atiende la conexión de uno o varios medidores hasta que se cierra.
+        :param lector: asyncio.StreamReader
+        :param escritor: asyncio.StreamWriter
+        """
+        self.conexiones += 1
+        vistos = set()  # Medidores que ya enviaron tramas por esta conexión
+        try:
+            while True:
+                cabecera = await lector.readexactly(CABECERA.size)
+                magia, identificador, secuencia, muestras, nodos, fases = CABECERA.unpack(cabecera)
+                if magia != MAGIA or (nodos, fases) != self.forma:  # Flujo desalineado o medidor ajeno
+                    self.invalidas += 1
+                    break
+                datos = await lector.readexactly(2 * nodos * fases * muestras * DATOS.itemsize)
+                X = np.frombuffer(datos, dtype=DATOS).reshape((2, nodos, fases, muestras))
+                await self.recibir(identificador, secuencia, X, nueva=identificador not in vistos)
+                vistos.add(identificador)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass  # El medidor cerró la conexión
+        finally:
+            self.conexiones -= 1
+            escritor.close()
+
+    async def recibir(self, identificador, secuencia, X, nueva=False):
+        """
+        Escribe un bloque de muestras en el anillo de su medidor. Las tramas tardías o repetidas
+        se descartan; un hueco en la secuencia descarta la ventana incompleta. La primera trama
+        de una conexión con una secuencia menor que la esperada es un reinicio del medidor: la
+        ventana incompleta se descarta y la secuencia sigue desde la trama.
+        :param identificador: Identificador del medidor
+        :param secuencia: Número de la primera muestra del bloque
+        :param X: Muestras (2, nodos, fases, muestras)
+        :param nueva: Si es la primera trama del medidor en su conexión
+        """
+        m = self.medidores.get(identificador)
+        if m is None:
+            m = self.medidores[identificador] = _Medidor(identificador, self.forma, self.W, self.profundidad)
+        c = m.contadores
+        c['tramas'] += 1
+        n = X.shape[-1]
+        if m.esperada is not None and secuencia < m.esperada:
+            if not nueva:
+                c['tardias'] += 1
+                return
+            c['reinicios'] += 1
+            m.esperada, m.posicion = None, 0
+        if m.esperada is not None and secuencia > m.esperada:
+            c['huecos'] += 1
+            c['perdidas'] += secuencia - m.esperada
+            m.posicion = 0  # La ventana en curso quedó incompleta: se vuelve a llenar
+        if m.posicion == 0:
+            m.inicio[m.ranura] = secuencia
+        m.esperada = secuencia + n
+        c['muestras'] += n
+        hechas = 0
+        while hechas < n:
+            k = min(n - hechas, self.W - m.posicion)
+            m.anillo[m.ranura, ..., m.posicion:m.posicion + k] = X[..., hechas:hechas + k]
+            m.posicion += k
+            hechas += k
+            if m.posicion == self.W:  # Ventana completa: pasa a las listas y se toma una ranura libre
+                m.listas.append(m.ranura)
+                c['ventanas'] += 1
+                self._hay_listas.set()
+                await self._ranura_libre(m)
+                m.ranura, m.posicion = m.libres.popleft(), 0
+                m.inicio[m.ranura] = secuencia + hechas
+
+    async def _ranura_libre(self, m):
+        """
+        Espera a que el medidor tenga una ranura libre, según la política.
+        :param m: Estado del medidor
+        """
+        while not m.libres:
+            if self.politica == 'descartar' and m.listas:
+                m.libres.append(m.listas.popleft())  # Se descarta la ventana lista más antigua
+                m.contadores['descartadas'] += 1
+            else:  # Todas las ranuras están en análisis, o la política es esperar
+                m.contadores['esperas'] += 1
+                m.liberada.clear()
+                await m.liberada.wait()
+
+    # ------------------------------- Análisis -------------------------------
+    async def _analizar(self):
+        """
+        Ciclo del análisis: toma las ventanas listas de todos los medidores (a lo sumo self.lote),
+        las analiza juntas en el ejecutor y libera sus ranuras. Mientras un lote se analiza se
+        acumulan las siguientes, así que los lotes crecen con la carga.
+        """
+        bucle = asyncio.get_running_loop()
+        while True:
+            await self._hay_listas.wait()
+            self._hay_listas.clear()
+            tomadas = []
+            for m in self.medidores.values():
+                while m.listas and len(tomadas) < self.lote:
+                    tomadas.append((m, m.listas.popleft()))
+            if not tomadas:
+                continue
+            if any(m.listas for m in self.medidores.values()):
+                self._hay_listas.set()  # Quedaron ventanas para el próximo lote
+            self._en_curso = True
+            try:
+                metricas = await bucle.run_in_executor(self.ejecutor, _metricas,
+                                                       [m.anillo[s] for m, s in tomadas], self.fs, self.f)
+            except Exception as error:  # El lote se pierde, pero el análisis sigue con los siguientes
+                self._error('el análisis de un lote de %d ventanas' % len(tomadas), error)
+                continue
+            finally:  # Con o sin error, las ranuras se liberan y los medidores que esperan siguen
+                self._en_curso = False
+                for m, s in tomadas:
+                    m.libres.append(s)
+                    m.liberada.set()
+            self.lotes += 1
+            ahora = time.time()
+            for j, (m, s) in enumerate(tomadas):
+                ventana = {c: x[j] for c, x in metricas.items()}
+                ventana['muestra'] = int(m.inicio[s]) + self.W  # Fin (exclusivo) de la ventana
+                ventana['recibida'] = ahora
+                self.ultimas[m.identificador] = ventana
+                if self.al_resultado is not None:
+                    try:
+                        self.al_resultado(m.identificador, ventana)
+                    except Exception as error:
+                        self._error('al_resultado del medidor %d' % m.identificador, error)
+
+    def _error(self, donde, error):
+        """
+        Cuenta y registra un error del análisis sin detenerlo.
+        :param donde: Descripción de lo que falló
+        :param error: Excepción
+        """
+        self.errores += 1
+        print('Error en %s: %s: %s' % (donde, type(error).__name__, error), file=sys.stderr)
+
+    def estado(self):
+        """
+        Retorna los contadores de todos los medidores y sus totales.
+        :return: Diccionario con 'medidores' (identificador -> contadores), 'total', 'invalidas',
+                 'lotes' y 'errores'
+        """
+        medidores = {i: dict(m.contadores, pendientes=len(m.listas)) for i, m in self.medidores.items()}
+        total = collections.Counter()
+        for c in medidores.values():
+            total.update(c)
+        return {'medidores': medidores, 'total': dict(total), 'invalidas': self.invalidas, 'lotes': self.lotes,
+                'errores': self.errores}
+
+
+# ------------------------------- Simulador -------------------------------
+async def simular(host='127.0.0.1', puerto=8760, medidores=100, duracion=10.0, forma=(3, 3), fs=6000, f=60,
+                  muestras=600, perdidas=0.0, tiempo_real=True, semilla=0):
+    """
+    Simula medidores que envían tramas por TCP, una conexión por medidor. Cada medidor genera
+    un sistema trifásico con su propia carga.
+    :param host: Dirección del servidor
+    :param puerto: Puerto del servidor
+    :param medidores: Número de medidores
+    :param duracion: Segundos de señal por medidor
+    :param forma: Forma de los canales (nodos, fases)
+    :param fs: Frecuencia de muestreo [Hz]
+    :param f: Frecuencia del sistema [Hz]
+    :param muestras: Muestras por trama
+    :param perdidas: Probabilidad de que una trama no se envíe (para probar los huecos)
+    :param tiempo_real: Si se envía al ritmo de fs; si no, tan rápido como se pueda
+    :param semilla: Semilla del generador aleatorio
+    :return: Número de tramas enviadas
+    """
+    ruido = np.random.default_rng(semilla)
+    fases = -2 * np.pi / 3 * np.arange(forma[1])[:, None]
+    enviadas = 0
+
+    async def medidor(identificador):
+        nonlocal enviadas
+        _, escritor = await asyncio.open_connection(host, puerto)
+        Vp = 120 * np.sqrt(2) * (1 + 0.02 * ruido.standard_normal(forma[0]))[:, None, None]
+        Ip = 10 * ruido.uniform(0.5, 1.5, forma[0])[:, None, None]
+        carga = ruido.uniform(0.1, 0.6, forma[0])[:, None, None]
+        inicio = time.perf_counter()
+        for secuencia in range(0, int(duracion * fs), muestras):
+            wt = 2 * np.pi * f * (secuencia + np.arange(muestras)) / fs
+            if ruido.random() >= perdidas:
+                escritor.write(trama(identificador, secuencia, Vp * np.cos(wt + fases),
+                                     Ip * np.cos(wt + fases - carga)))
+                enviadas += 1
+                await escritor.drain()  # Aquí actúa la contrapresión del servidor
+            if tiempo_real:
+                await asyncio.sleep(max(0.0, inicio + (secuencia + muestras) / fs - time.perf_counter()))
+        escritor.close()
+        await escritor.wait_closed()
+
+    await asyncio.gather(*(medidor(k) for k in range(medidores)))
+    return enviadas
+
+
+def _imprimir(ingesta, duracion):
+    """
+    Imprime los totales de la ingesta.
+    :param ingesta: Ingesta
+    :param duracion: Tiempo transcurrido [s]
+    """
+    e = ingesta.estado()
+    t = e['total']
+    print('%d medidores, %.1f s: %d tramas, %.2e muestras/s, %d ventanas en %d lotes; tardías %d, '
+          'huecos %d (%d muestras), descartadas %d, esperas %d, reinicios %d, inválidas %d, errores %d'
+          % (len(e['medidores']), duracion, t.get('tramas', 0), t.get('muestras', 0) / duracion,
+             t.get('ventanas', 0), e['lotes'], t.get('tardias', 0), t.get('huecos', 0), t.get('perdidas', 0),
+             t.get('descartadas', 0), t.get('esperas', 0), t.get('reinicios', 0), e['invalidas'], e['errores']),
+          file=sys.stderr)
+
+
+async def _servidor(args):
+    """
+    Ejecuta el servidor de ingesta e imprime los totales periódicamente.
+    :param args: Argumentos de la línea de comandos
+    """
+    ingesta = Ingesta(fs=args.fs, f=args.f, ciclos=args.ciclos, politica=args.politica)
+    servidor = await ingesta.iniciar(args.host, args.puerto)
+    inicio = time.perf_counter()
+    async with servidor:
+        while True:
+            await asyncio.sleep(5)
+            _imprimir(ingesta, time.perf_counter() - inicio)
+
+
+async def _demo(args):
+    """
+    Ejecuta el servidor y el simulador en el mismo proceso y muestra los totales.
+    :param args: Argumentos de la línea de comandos
+    """
+    ingesta = Ingesta(fs=args.fs, f=args.f, ciclos=args.ciclos, politica=args.politica)
+    servidor = await ingesta.iniciar(args.host, 0)
+    inicio = time.perf_counter()
+    await simular(args.host, servidor.sockets[0].getsockname()[1], args.medidores, args.duracion, fs=args.fs,
+                  f=args.f, perdidas=args.perdidas, tiempo_real=not args.rapido)
+    await ingesta.vaciar()
+    servidor.close()
+    await ingesta.cerrar()
+    _imprimir(ingesta, time.perf_counter() - inicio)
+
+
+def main(argumentos=None):
+    """
+    Función principal de la línea de comandos.
+    :param argumentos: Lista de argumentos (por defecto sys.argv)
+    :return: Código de salida
+    """
+    parser = argparse.ArgumentParser(description='Entrada de muestras de muchos medidores por TCP')
+    parser.add_argument('modo', choices=('servidor', 'simulador', 'demo'))
+    parser.add_argument('--host', default='127.0.0.1', help='Dirección del servidor')
+    parser.add_argument('--puerto', type=int, default=8760, help='Puerto del servidor')
+    parser.add_argument('--fs', type=float, default=6000, help='Frecuencia de muestreo [Hz]')
+    parser.add_argument('--f', type=float, default=60, help='Frecuencia del sistema [Hz]')
+    parser.add_argument('--ciclos', type=int, default=12, help='Ciclos por ventana')
+    parser.add_argument('--politica', choices=('esperar', 'descartar'), default='esperar',
+                        help='Qué hacer cuando un medidor no tiene ranuras libres')
+    parser.add_argument('--medidores', type=int, default=100, help='Medidores simulados')
+    parser.add_argument('--duracion', type=float, default=10, help='Segundos de señal simulada')
+    parser.add_argument('--perdidas', type=float, default=0.0, help='Probabilidad de perder una trama')
+    parser.add_argument('--rapido', action='store_true', help='Simular sin esperar el ritmo de fs')
+    args = parser.parse_args(argumentos)
+
+    try:
+        if args.modo == 'servidor':
+            asyncio.run(_servidor(args))
+        elif args.modo == 'simulador':
+            enviadas = asyncio.run(simular(args.host, args.puerto, args.medidores, args.duracion, fs=args.fs,
+                                           f=args.f, perdidas=args.perdidas, tiempo_real=not args.rapido))
+            print('%d tramas enviadas' % enviadas, file=sys.stderr)
+        else:
+            asyncio.run(_demo(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+# Salvaguarda
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Este programa analiza por lotes un directorio (o patrón glob) de capturas .npy/.npz
+sin interfaz gráfica. Las capturas se reparten entre varios procesos y el
+resultado es una sola tabla resumen (CSV, JSON, Parquet o Arrow) con las métricas
+de cada archivo, nodo y fase.
+
+Uso: python lote.py capturas/ --salida resumen.csv --trabajadores 8
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import argparse  # Argumentos de la línea de comandos
+import glob  # Búsqueda de capturas
+import os  # Rutas y número de núcleos
+import sys  # Mensajes de progreso
+import time  # Medición del rendimiento
+from concurrent.futures import ProcessPoolExecutor, as_completed  # Procesos de trabajo
+from fuentes import leer_captura  # Lectura de capturas
+from nucleo import AnalizadorNumerico  # Núcleo numérico (solo NumPy)
+from red import Red  # Modelo de la red
+from resultados import Resultados, concatenar, escribir  # Resultados y exportaciones
+
+
+def capturas(entrada):
+    """
+    Lista las capturas de un directorio o de un patrón glob.
+    :param entrada: Directorio o patrón glob
+    :return: Lista ordenada de rutas .npy/.npz
+    """
+    if os.path.isdir(entrada):
+        entrada = os.path.join(entrada, '*.np[yz]')
+    return sorted(glob.glob(entrada))
+
+
+def analizar_archivo(ruta, fs=6000, f=60, seguimiento=False, red=None):
+    """
+    Analiza una captura. Esta función se ejecuta en los procesos de trabajo.
+    :param ruta: Ruta de la captura
+    :param fs: Frecuencia de muestreo [Hz]
+    :param f: Frecuencia del sistema [Hz]
+    :param seguimiento: Si se sigue la frecuencia y se remuestrea a ciclos enteros
+    :param red: Modelo de la red (por defecto según el número de nodos de la captura)
+    :return: Resultados de la captura (sin los nodos no medidos)
+    """
+    V, I = leer_captura(ruta)
+    if seguimiento:
+        analizador = AnalizadorNumerico.con_seguimiento(V, I, fs=fs, f=f, red=red)
+    else:
+        analizador = AnalizadorNumerico(V, I, red=red, fs=fs, f=f)
+    return Resultados.desde_analizador(analizador, ruta, no_medidos=False)
+
+
+def ejecutar(rutas, salida, trabajadores=None, fs=6000, f=60, seguimiento=False, red=None):
+    """
+    Reparte las capturas entre los procesos de trabajo y escribe la tabla resumen.
+    :param rutas: Lista de capturas
+    :param salida: Ruta de la tabla resumen
+    :param trabajadores: Número de procesos (por defecto todos los núcleos)
+    :param fs: Frecuencia de muestreo [Hz]
+    :param f: Frecuencia del sistema [Hz]
+    :param seguimiento: Si se sigue la frecuencia y se remuestrea a ciclos enteros
+    :param red: Modelo de la red (por defecto según el número de nodos de cada captura)
+    :return: Número de capturas que fallaron
+    """
+    resultados, fallas = {}, 0
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=trabajadores) as pool:
+        tareas = {pool.submit(analizar_archivo, ruta, fs, f, seguimiento, red): ruta for ruta in rutas}
+        for hechas, tarea in enumerate(as_completed(tareas), 1):
+            ruta = tareas[tarea]
+            try:
+                resultados[ruta] = tarea.result()
+            except Exception as error:  # Una captura dañada no detiene el lote
+                fallas += 1
+                print('\nError en %s: %s' % (ruta, error), file=sys.stderr)
+            tasa = hechas / (time.perf_counter() - inicio)
+            print('\r[%d/%d] %.1f archivos/s' % (hechas, len(rutas), tasa), end='', file=sys.stderr)
+    print(file=sys.stderr)
+    escribir(concatenar([resultados[ruta] for ruta in rutas if ruta in resultados]), salida)
+    return fallas
+
+
+def main(argumentos=None):
+    """
+    Función principal de la línea de comandos.
+    :param argumentos: Lista de argumentos (por defecto sys.argv)
+    :return: Código de salida
+    """
+    parser = argparse.ArgumentParser(description='Análisis por lotes de capturas .npy/.npz')
+    parser.add_argument('entrada', help='Directorio o patrón glob de las capturas')
+    parser.add_argument('--salida', default='resumen.csv', help='Tabla resumen (.csv, .json, .parquet o .arrow)')
+    parser.add_argument('--trabajadores', type=int, default=os.cpu_count(), help='Procesos de trabajo')
+    parser.add_argument('--fs', type=float, default=6000, help='Frecuencia de muestreo [Hz]')
+    parser.add_argument('--f', type=float, default=60, help='Frecuencia del sistema [Hz]')
+    parser.add_argument('--seguimiento', action='store_true',
+                        help='Seguir la frecuencia y remuestrear a ciclos enteros (cualquier fs)')
+    parser.add_argument('--red', help='Red en JSON (por defecto: 4 nodos con 3 medidos, estrella con otro número)')
+    args = parser.parse_args(argumentos)
+
+    rutas = capturas(args.entrada)
+    if not rutas:
+        print('No se encontraron capturas en %s' % args.entrada, file=sys.stderr)
+        return 1
+    inicio = time.perf_counter()
+    red = Red.desde_archivo(args.red) if args.red else None
+    fallas = ejecutar(rutas, args.salida, args.trabajadores, args.fs, args.f, args.seguimiento, red)
+    duracion = time.perf_counter() - inicio
+    print('%d archivos en %.2f s (%.1f archivos/s), %d con error -> %s'
+          % (len(rutas), duracion, len(rutas) / duracion, fallas, args.salida), file=sys.stderr)
+    return 1 if fallas else 0
+
+
+# Salvaguarda
+if __name__ == '__main__':
+    sys.exit(main())
@@ -9,15 +9,19 @@ Universidad Tecnológica de Pereira
 """
 
 # Librería y módulos necesarios
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from tkinter import messagebox as mb  # Mensajes en la interfaz gráfica
-from tkinter import Entry, ttk, Tk, Frame, Button, Text, INSERT  # Crear interfaz con widgets
+from tkinter import Entry, ttk, Tk, Frame, Button, Text, INSERT, END  # Crear interfaz con widgets
 import numpy as np
 import time  # Para generar el temporizador (reloj)
 from analizador import Analizador  # Módulo analizador
-import requests
-from tabulate import tabulate
+from fuentes import cargar_senales, CACHE  # Fuentes de señales
+from energia import MedidorEnergia, Tarifa, huella  # Registros de energía
+from archivo import Archivo  # Histórico de métricas
+from trabajador import TrabajadorCalculo  # Cálculo en segundo plano
+import decimacion  # Reducción de puntos de las gráficas
+import perfil  # Instrumentación (ANALIZADOR_PERFIL=perfil.json)
 import os
 
 
@@ -44,7 +48,56 @@ def restart():
     os.execl(sys.executable, sys.executable, *sys.argv)
 
 
+# El dibujo de matplotlib ocurre después, en el ciclo de Tk: se mide por separado
+perfil.registrar(FigureCanvasTkAgg, 'draw', 'matplotlib.draw')
+
+
+# Creando la clase GestorVistas
+class GestorVistas:
+    """
+    Esta es la clase GestorVistas, la cual crea una sola vez la figura y el lienzo de cada
+    vista y, cuando cambian los datos, actualiza sus artistas en el mismo lugar.
+    """
+
+    def __init__(self, root, x=210, y=60):
+        """
+        Inicializador de la clase GestorVistas
+        :param root: Ventana de la interfaz gráfica de usuario (GUI)
+        :param x: Posición horizontal de los lienzos
+        :param y: Posición vertical de los lienzos
+        """
+        self.root = root
+        self.x, self.y = x, y
+        self.vistas = {}  # nombre -> {'lienzo', 'artistas', 'version'}
+        self.actual = None  # Vista visible
+
+    def mostrar(self, nombre, crear, actualizar, version=0):
+        """
+        Muestra una vista. La primera vez crea su figura y su lienzo; después solo actualiza
+        los datos si la versión cambió y redibuja únicamente ese lienzo.
+        :param nombre: Nombre de la vista
+        :param crear: Función que recibe la figura, crea los ejes y retorna sus artistas
+        :param actualizar: Función que recibe los artistas y les asigna los datos actuales
+        :param version: Versión de los datos que muestra la vista
+        """
+        vista = self.vistas.get(nombre)
+        if vista is None:
+            fig = Figure(figsize=(6.5, 6.5), dpi=80)  # Fuera de pyplot: no queda registrada
+            vista = {'artistas': crear(fig), 'lienzo': FigureCanvasTkAgg(fig, master=self.root), 'version': None}
+            self.vistas[nombre] = vista
+        if vista['version'] != version:
+            actualizar(vista['artistas'])
+            vista['version'] = version
+            vista['lienzo'].draw_idle()
+        if self.actual != nombre:
+            if self.actual is not None:
+                self.vistas[self.actual]['lienzo'].get_tk_widget().place_forget()
+            vista['lienzo'].get_tk_widget().place(x=self.x, y=self.y)
+            self.actual = nombre
+
+
 # Creando la clase interfaz
+@perfil.instrumentable('plot_', 'Table_', 'table_')
 class Interfaz:
     """
     Esta es la clase Interfaz, la cual se encarga de presentar en pantalla
@@ -61,38 +114,21 @@ class Interfaz:
         self.root = root
         self.root.geometry('1350x800')  # Dimensiones de la ventana
         self.root.resizable(0, 0)  # No deja modificar las dimensiones de la pantalla
+        self.vistas = GestorVistas(self.root)  # Un lienzo por vista, creado una sola vez
+        self.version_datos = 0  # Cambia cuando cambian los datos a graficar
+        self.niveles = decimacion.CacheNiveles()  # Reducciones por nivel de zoom
+        self.reduccion = 'minmax'  # Reducción de las señales en el tiempo: 'minmax' o 'lttb'
+        self._series = {}  # eje -> señales completas (fases, muestras) que muestra
+        self.datos = Text(self.root, background="white", width=71, height=10, cursor='none')
+        self.datos.place(x=740, y=60)
+        self.datos.bind("<Key>", lambda a: "break")
         self.plot_empty()  # Muestra en pantalla el espacio donde van las gráficas
         self.message_data()  # Muestra en pantalla el espacio donde van los datos
 
-        # Se extraen los datos de las señales a analizar:
-        self.url = 'https://raw.githubusercontent.com/JulianDPastrana/signal_analysis/main/seniales_sep.py'
-        self.r = requests.get(self.url)
-
-        with open('seniales_sep.py', 'w') as f:
-            f.write(self.r.text)
-        from seniales_sep import signal_generation
-
-        self.data = signal_generation()
-
-        # Señales extraídas:
-        self.V1, self.I1 = self.data["Node 1"]
-        self.V2, self.I2 = self.data["Node 2"]
-        self.V3, self.I3 = self.data["Node 3"]
-        self.V = [self.V1, self.V2, self.V3]
-        self.I = [self.I1, self.I2, self.I3]
-
-        # Usamos la clase Analizador:
-        self.analizador = Analizador(self.V, self.I)
-
-        # Corrientes en el nodo 4:
-        self.I_n4 = self.I[0] + self.I[1] + self.I[2]
-
-        self.pinst = self.analizador.pot_instantanea()
-        self.tabla_rms = self.analizador.tabla_rms()
-        self.tabla_inpedancia = self.analizador.impedancias()
-        self.P = self.analizador.pot_activa()
-        self.Q = self.analizador.pot_reactiva()
-        self.tabla_pot = self.analizador.tabla_potencias()
+        # Los datos se cargan y analizan en segundo plano (ver calcular):
+        self.analizador = None
+        self.trabajador = TrabajadorCalculo()
+        self._mostrar = False  # Si la tarea vigente debe mostrar la selección al terminar
 
         # Se crean los widgets de la GUI
 
@@ -117,7 +153,7 @@ class Interfaz:
         self.select_label = ttk.Label(self.root, text="SELECTOR DE DATOS", style="BW.TLabel").place(x=23, y=440)
         self.select_data = ttk.Combobox(self.root,
                                         values=['  ', 'Valores RMS', "Datos de Potencia", "Valores de Impedancias",
-                                                "Energía"])
+                                                "Armónicos", "Energía", "Eventos de calidad"])
 
         self.select_data.place(x=23, y=460)
         self.select_data.current(0)
@@ -145,10 +181,20 @@ class Interfaz:
         self.label.place(x=675, y=600)
         self.actualizar_tiempo()
         self.tiempo_actual = time.strftime("%H:%M:%S")  # Inicializar el tiempo
-        # Extrae los valores de hora, minutos y segundos
-        self.hora = int(self.tiempo_actual[:2])
-        self.minutos = int(self.tiempo_actual[3:5])
-        self.segundos = int(self.tiempo_actual[6:])
+
+        # Registros de energía (respaldados en disco) y tabla de tarifas configurable
+        self.medidor = MedidorEnergia(archivo=os.path.join(CACHE, 'energia.npz'))
+        ruta_tarifa = os.path.join(CACHE, 'tarifa.json')
+        self.tarifa = Tarifa.desde_archivo(ruta_tarifa) if os.path.exists(ruta_tarifa) else Tarifa()
+        self.historico = Archivo(os.path.join(CACHE, 'historico'))  # Métricas de cada carga, con resúmenes
+
+        # Progreso del cálculo en segundo plano
+        self.progreso = ttk.Progressbar(self.root, length=290, mode='determinate')
+        self.progreso.place(x=23, y=650)
+        self.estado = ttk.Label(self.root, text="", style="BW.TLabel")
+        self.estado.place(x=23, y=675)
+        self.calcular(mostrar=False)  # Carga inicial de las señales
+        self.revisar_trabajador()
 
     def actualizar_tiempo(self):
         """
@@ -161,209 +207,257 @@ class Interfaz:
 
     # ----------- Gráficas de las señales -------------------------------
 
+    def _crear_series(self, fig, filas, titulo, ylabel=None, xlabel=None):
+        """
+        Crea los ejes y las líneas (vacías) de una vista de señales por fase.
+        :param fig: Figura de la vista
+        :param filas: Número de gráficas (una por nodo)
+        :param titulo: Título de la primera gráfica
+        :param ylabel: Etiqueta del eje vertical
+        :param xlabel: Etiqueta del eje horizontal de la última gráfica
+        :return: Lista de tuplas (eje, líneas de las fases A, B y C)
+        """
+        axs = np.atleast_1d(fig.subplots(filas, 1))
+        artistas = []
+        for eje in axs:
+            lineas = eje.plot(np.empty((0, 3)))
+            eje.legend(["Fase A", "Fase B", "Fase C"])
+            if ylabel:
+                eje.set_ylabel(ylabel)
+            eje.grid()
+            eje.callbacks.connect('xlim_changed', self._redecimar)  # Zoom: se reduce el tramo visible
+            artistas.append((eje, lineas))
+        axs[0].set_title(titulo)
+        if xlabel:
+            axs[-1].set_xlabel(xlabel)
+        return artistas
+
+    def _actualizar_series(self, artistas, Y, X=None):
+        """
+        Actualiza en el mismo lugar los datos de las líneas de una vista de señales. Las señales
+        en el tiempo se reducen al ancho del eje en píxeles y las curvas x-y (Lissajous) a las
+        celdas ocupadas de un histograma 2-D del mismo tamaño.
+        :param artistas: Lista de tuplas (eje, líneas) creada por _crear_series
+        :param Y: Señales (gráficas, fases, muestras) del eje vertical
+        :param X: Señales del eje horizontal (por defecto el número de muestra)
+        """
+        for n, (eje, lineas) in enumerate(artistas):
+            if X is None:
+                self._series[eje] = np.asarray(Y[n])
+                self._redecimar(eje, 0, self._series[eje].shape[-1])
+            else:
+                self._actualizar_densidad(eje, lineas, np.asarray(X[n]), np.asarray(Y[n]))
+            eje.relim()
+            eje.autoscale_view()
+
+    def _redecimar(self, eje, inicio=None, fin=None):
+        """
+        Reduce el tramo visible de las señales de un eje al ancho del eje en píxeles. Se llama
+        al actualizar los datos y cada vez que cambian los límites horizontales (zoom).
+        :param eje: Eje de una vista de señales en el tiempo
+        :param inicio: Primera muestra del tramo (por defecto según los límites del eje)
+        :param fin: Muestra final del tramo (por defecto según los límites del eje)
+        """
+        Y = self._series.get(eje)
+        if Y is None:
+            return
+        N = Y.shape[-1]
+        if inicio is None:
+            x0, x1 = eje.get_xlim()
+            inicio, fin = max(0, int(np.floor(x0))), min(N, int(np.ceil(x1)) + 1)
+        pixeles = max(1, int(eje.bbox.width))
+        clave = (id(eje), self.version_datos, self.reduccion, inicio, fin, pixeles)
+        x, y = self.niveles.obtener(clave, lambda: self._reducir(Y, inicio, fin, pixeles))
+        for k, linea in enumerate(eje.lines[:len(y)]):
+            linea.set_data(x[k] if x.ndim > 1 else x, y[k])
+
+    def _reducir(self, Y, inicio, fin, pixeles):
+        """
+        Reduce un tramo de las señales de un eje con el método elegido en self.reduccion.
+        :param Y: Señales (fases, muestras)
+        :param inicio: Primera muestra del tramo
+        :param fin: Muestra final (exclusiva) del tramo
+        :param pixeles: Ancho del eje en píxeles
+        :return: Tupla (x, y); x es común a las fases o tiene una fila por fase
+        """
+        if self.reduccion == 'lttb':
+            x = np.arange(inicio, fin)
+            reducidas = [decimacion.lttb(x, y[inicio:fin], 2 * pixeles) for y in Y]
+            return np.array([r[0] for r in reducidas]), np.array([r[1] for r in reducidas])
+        return decimacion.minmax(Y, inicio, fin, pixeles)
+
+    def _actualizar_densidad(self, eje, lineas, X, Y):
+        """
+        Actualiza las curvas x-y de un eje. Si tienen más puntos que el presupuesto del eje se
+        dibujan como las celdas ocupadas de un histograma 2-D con la resolución del eje.
+        :param eje: Eje de la vista
+        :param lineas: Líneas de las fases A, B y C
+        :param X: Señales del eje horizontal (fases, muestras)
+        :param Y: Señales del eje vertical (fases, muestras)
+        """
+        pixeles = max(1, int(eje.bbox.width))
+        if X.shape[-1] <= 2 * pixeles:
+            for k, linea in enumerate(lineas):
+                linea.set_data(X[k], Y[k])
+                linea.set(linestyle='-', marker='None')
+            return
+        rango = [[X.min(), X.max()], [Y.min(), Y.max()]]  # Malla común a las tres fases
+        clave = (id(eje), self.version_datos, 'densidad', pixeles)
+        celdas = self.niveles.obtener(clave, lambda: [decimacion.densidad(X[k], Y[k], pixeles, rango)[:2]
+                                                      for k in range(len(lineas))])
+        for linea, (x, y) in zip(lineas, celdas):
+            linea.set_data(x, y)
+            linea.set(linestyle='None', marker='.', markersize=1)
+
     def plot_empty(self):
         """
         Crea un gráfico vacío que se pondrá cuando se ejecute la función main.
         :return: Contorno de gráfica.
         """
-        Emptyfig = plt.figure(figsize=(6.5, 6.5), dpi=80)
-        plt.grid()
-        chart = FigureCanvasTkAgg(Emptyfig, master=self.root)
-        chart.get_tk_widget().place(x=210, y=60)
+        self.vistas.mostrar('vacia', lambda fig: fig.add_subplot().grid(), lambda artistas: None)
 
     def plot_voltages(self):
         """
         Método que contiene las gráficas de las señales de los voltajes trifásicos en los nodos.
         :return: Gráficas de voltajes.
         """
-        fig, axs = plt.subplots(3, 1, figsize=(6.5, 6.5), dpi=80)  # Se crea la figura
-        axs[0].plot(self.V[0].T)  # Grafica las señales de voltaje en el nodo 1
-        axs[0].set_title("Tensiones en los nodos 1, 2 y 3")
-        axs[0].legend(["Fase A", "Fase B", "Fase C"])
-
-        axs[1].plot(self.V[1].T)  # Grafica las señales de voltaje en el nodo 2
-        axs[1].legend(["Fase A", "Fase B", "Fase C"])
-        axs[2].plot(self.V[2].T)  # Grafica las señales de voltaje en el nodo 3
-        axs[2].legend(["Fase A", "Fase B", "Fase C"])
-        axs[0].set_ylabel('Amplitud [V]')
-        axs[1].set_ylabel('Amplitud [V]')
-        axs[2].set_ylabel('Amplitud [V]')
-        axs[0].grid()
-        axs[1].grid()
-        axs[2].grid()
-
-        # Poner las gráficas en la GUI
-        chart = FigureCanvasTkAgg(fig, master=self.root)
-        chart.get_tk_widget().place(x=210, y=60)
+        self.vistas.mostrar('voltajes',
+                            lambda fig: self._crear_series(fig, 3, "Tensiones en los nodos 1, 2 y 3",
+                                                           'Amplitud [V]'),
+                            lambda artistas: self._actualizar_series(artistas, self.V),
+                            self.version_datos)
 
     def plot_currents(self):
         """
         Método que contiene las gráficas de las señales de las corrientes trifásicas en los nodos.
         :return: Gráficas de corrientes.
         """
-        fig, axs = plt.subplots(3, 1, figsize=(6.5, 6.5), dpi=80)  # Se crea la figura
-        axs[0].plot(self.I[0].T)  # Grafica las señales de corrientes en el nodo 1
-        axs[0].set_title("Corrientes en los nodos 1, 2 y 3")
-        axs[0].legend(["Fase A", "Fase B", "Fase C"])
-        axs[0].set_ylabel('Amplitud [A]')
-        axs[0].grid()
-        axs[1].plot(self.I[1].T)  # Grafica las señales de corriente en el nodo 2
-
-        axs[1].legend(["Fase A", "Fase B", "Fase C"])
-        axs[1].set_ylabel('Amplitud [A]')
-        axs[1].grid()
-        axs[2].plot(self.I[2].T)  # Grafica las señales de corriente en el nodo 3
-
-        axs[2].legend(["Fase A", "Fase B", "Fase C"])
-        axs[2].set_ylabel('Amplitud [A]')
-        axs[2].grid()
-        chart = FigureCanvasTkAgg(fig, master=self.root)
-        chart.get_tk_widget().place(x=210, y=60)
+        self.vistas.mostrar('corrientes',
+                            lambda fig: self._crear_series(fig, 3, "Corrientes en los nodos 1, 2 y 3",
+                                                           'Amplitud [A]'),
+                            lambda artistas: self._actualizar_series(artistas, self.I),
+                            self.version_datos)
 
     def plot_node4(self):
         """
         Este método contiene las señales de corrientes en el nodo 4
         :return: Gráfica de corrientes en el nodo 4.
         """
-        fig, axs = plt.subplots(1, 1, figsize=(6.5, 6.5), dpi=80)  # Se crea la figura
-        axs.plot(self.I_n4.T)  # Grafica las señales de corriente en el nodo 4
-        axs.set_title("Corrientes en el Nodo 4")
-        axs.legend(["Fase A", "Fase B", "Fase C"])
-        axs.set_ylabel('Amplitud [A]')
-        plt.grid()
-        chart = FigureCanvasTkAgg(fig, master=self.root)
-        chart.get_tk_widget().place(x=210, y=60)
+        self.vistas.mostrar('nodo4',
+                            lambda fig: self._crear_series(fig, 1, "Corrientes en el Nodo 4", 'Amplitud [A]'),
+                            lambda artistas: self._actualizar_series(artistas, [self.I_n4]),
+                            self.version_datos)
 
     def plot_lissajous(self):
         """
         Este método contiene las gráficas de Lissajous en los nodos 1, 2 y 3.
         :return: Gráficas de Lissajous.
         """
-        fig, axs = plt.subplots(3, 1, figsize=(6.5, 6.5), dpi=80)  # Se crea la figura
-        axs[0].plot(self.V[0].T, self.I[0].T)  # Grafica las señales de Lissajous en el nodo 1
-        axs[0].set_title("Diagramas de Lissajous en los nodos 1, 2 y 3")
-        axs[0].legend(["Fase A", "Fase B", "Fase C"])
-        axs[0].grid()
-
-        axs[1].plot(self.V[1].T, self.I[1].T)  # Grafica las señales de Lissajous en el nodo 2
-
-        axs[1].legend(["Fase A", "Fase B", "Fase C"])
-        axs[1].grid()
-
-        axs[2].plot(self.V[2].T, self.I[2].T)  # Grafica las señales de Lissajous en el nodo 3
-
-        axs[2].legend(["Fase A", "Fase B", "Fase C"])
-        axs[2].set_xlabel('$V$ [V]')
-        axs[2].grid()
-        axs[0].set_ylabel('$I$ [A]')
-        axs[1].set_ylabel('$I$ [A]')
-        axs[2].set_ylabel('$I$ [A]')
-
-        chart = FigureCanvasTkAgg(fig, master=self.root)
-        chart.get_tk_widget().place(x=210, y=60)
+        self.vistas.mostrar('lissajous',
+                            lambda fig: self._crear_series(fig, 3, "Diagramas de Lissajous en los nodos 1, 2 y 3",
+                                                           '$I$ [A]', '$V$ [V]'),
+                            lambda artistas: self._actualizar_series(artistas, self.I, self.V),
+                            self.version_datos)
 
     def plot_lissajous_nodo4(self):
         """
         Este método contiene las gráficas de Lissajous del nodo 4.
         :return: Gráficas de Lissajous.
         """
+        def actualizar(artistas):
+            self._actualizar_series(artistas, [self.I_n4], [abs(self.V4)])
 
-        Y = (1 / self.analizador.Zl1) + (1 / self.analizador.Zl2) + (1 / self.analizador.Zl3)
-        V4 = (self.I_n4 + (self.V[0] / self.analizador.Zl1) + (self.V[1] / self.analizador.Zl2) + (
-                self.V[2] / self.analizador.Zl3)) / Y
+        self.vistas.mostrar('lissajous_nodo4',
+                            lambda fig: self._crear_series(fig, 1, "Diagramas de Lissajous en el nodo 4"),
+                            actualizar, self.version_datos)
 
-        fig, axs = plt.subplots(1, 1, figsize=(6.5, 6.5), dpi=80)  # Se crea la figura
-        axs.plot(abs(V4).T, self.I_n4.T)  # Gráfica de Lissajous en el nodo 4
-        axs.set_title("Diagramas de Lissajous en el nodo 4")
-        axs.legend(["Fase A", "Fase B", "Fase C"])
-        axs.grid()
-        chart = FigureCanvasTkAgg(fig, master=self.root)
-        chart.get_tk_widget().place(x=210, y=60)
+    def _crear_fasorial(self, fig, tipo):
+        """
+        Crea los diagramas fasoriales con una flecha (quiver) por fase en cada nodo.
+        :param fig: Figura de la vista
+        :param tipo: 'V' para tensiones o 'I' para corrientes
+        :return: Lista de tuplas (eje, flechas de las fases A, B y C)
+        """
+        Analizador.dibujar_fasorial(*getattr(self, 'fasores_' + tipo), tipo, fig)
+        return [(eje, eje.collections[:3]) for eje in fig.axes]
+
+    def _actualizar_fasorial(self, artistas, tipo):
+        """
+        Actualiza en el mismo lugar las flechas de los diagramas fasoriales.
+        :param artistas: Lista de tuplas (eje, flechas) creada por _crear_fasorial
+        :param tipo: 'V' para tensiones o 'I' para corrientes
+        """
+        phi, mag = getattr(self, 'fasores_' + tipo)
+        for n, (eje, flechas) in enumerate(artistas):
+            for k, flecha in enumerate(flechas):
+                flecha.set_UVC(phi[n, k], mag[n, k])
+            eje.set_rmax(np.max(mag[n]))
 
     def plot_phasor_voltage(self):
         """
         Este método contiene los diagramas fasoriales de las tensiones.
         :return: Diagramas fasoriales de tensiones.
         """
-        fig = self.analizador.voltajes_fasorial()
-        chart = FigureCanvasTkAgg(fig, master=self.root)
-        chart.get_tk_widget().place(x=210, y=60)
+        self.vistas.mostrar('fasorial_V', lambda fig: self._crear_fasorial(fig, 'V'),
+                            lambda artistas: self._actualizar_fasorial(artistas, 'V'), self.version_datos)
+
+    def _crear_triangulos(self, fig):
+        """
+        Crea los triángulos de potencia con las flechas P, Q y S de cada nodo.
+        :param fig: Figura de la vista
+        :return: Lista de tuplas (eje, flechas P, Q y S)
+        """
+        ax = fig.subplots(3, 1)
+        artistas = []
+        for eje in ax:
+            flechas = [eje.quiver(0, 0, 0, 0, angles='xy', color=[color], scale_units='xy', scale=1, label=nombre)
+                       for color, nombre in (('green', 'P'), ('purple', 'Q'), ('red', 'S'))]
+            eje.legend(loc='upper left')
+            eje.grid()
+            artistas.append((eje, flechas))
+        ax[0].set_title("Triángulos de potencia en los nodos 1, 2 y 3")
+        return artistas
+
+    def _actualizar_triangulos(self, artistas):
+        """
+        Actualiza en el mismo lugar las flechas de los triángulos de potencia.
+        :param artistas: Lista de tuplas (eje, flechas) creada por _crear_triangulos
+        """
+        for n, (eje, (p, q, s)) in enumerate(artistas):
+            P, Q = self.P[n], self.Q[n]
+            p.set_UVC(P, 0)
+            q.set_offsets([[P, 0]])
+            q.set_UVC(0, Q)
+            s.set_UVC(P, Q)
+            eje.set_ylim(sorted((-Q * 0.1, Q * 1.1)))
+            eje.set_xlim(sorted((-P * 0.1, P * 1.1)))  # Con flujo inverso P < 0: el triángulo va a la izquierda
 
     def plot_powertriangles(self):
         """
         Este método contiene los triángulos de potencia
         :return: Gráfica de triángulos de potencia.
         """
-        # Potencias:
-        P = self.P
-        Q = self.Q
-
-        fig, ax = plt.subplots(3, 1, figsize=(6.5, 6.5), dpi=80)
-        ax[0].quiver(0, 0, P[0], 0, angles='xy', color=['green'], scale_units='xy', scale=1, label='P')
-        ax[0].quiver(P[0], 0, 0, Q[0], angles='xy', color=['purple'], scale_units='xy', scale=1, label='Q')
-        ax[0].quiver(0, 0, P[0], Q[0], angles='xy', color=['red'], scale_units='xy', scale=1, label='S')
-        ax[0].set_ylim(-Q[0] * 0.1, Q[0] * 1.1)
-        plt.axis([0, P[0] + 10, -10, Q[0] + 10])
-        ax[0].set_xlim(-P[0] * 0.1, P[0] * 1.1)
-        ax[0].set_title("Triángulos de potencia en los nodos 1, 2 y 3")
-
-        ax[1].quiver(0, 0, P[1], 0, angles='xy', color=['green'], scale_units='xy', scale=1, label='P')
-        ax[1].quiver(P[1], 0, 0, Q[1], angles='xy', color=['purple'], scale_units='xy', scale=1, label='Q')
-        ax[1].quiver(0, 0, P[1], Q[1], angles='xy', color=['red'], scale_units='xy', scale=1, label='S')
-        ax[1].set_ylim(-Q[1] * 0.1, Q[1] * 1.1)
-        plt.axis([0, P[1] + 10, -10, Q[1] + 10])
-        ax[1].set_xlim(-P[1] * 0.1, P[1] * 1.1)
-
-        ax[2].quiver(0, 0, P[2], 0, angles='xy', color=['green'], scale_units='xy', scale=1, label='P')
-        ax[2].quiver(P[2], 0, 0, Q[2], angles='xy', color=['purple'], scale_units='xy', scale=1, label='Q')
-        ax[2].quiver(0, 0, P[2], Q[2], angles='xy', color=['red'], scale_units='xy', scale=1, label='S')
-        ax[2].set_ylim(-Q[2] * 0.1, Q[2] * 1.1)
-        plt.axis([0, P[2] + 10, -10, Q[2] + 10])
-        ax[2].set_xlim(-P[2] * 0.1, P[2] * 1.1)
-
-        ax[0].legend(loc='upper left')
-        ax[0].grid()
-        ax[1].legend(loc='upper left')
-        ax[1].grid()
-        ax[2].legend(loc='upper left')
-        ax[2].grid()
-        chart = FigureCanvasTkAgg(fig, master=self.root)
-        chart.get_tk_widget().place(x=210, y=60)
+        self.vistas.mostrar('triangulos', self._crear_triangulos, self._actualizar_triangulos,
+                            self.version_datos)
 
     def plot_powerInstant(self):
         """
         Este método contiene las señales de potencias instantáneas.
         :return: Gráfico de potencias instantáneas.
         """
-        fig, axs = plt.subplots(3, 1, figsize=(6.5, 6.5), dpi=80)  # Se crea la figura
-        axs[0].plot(self.pinst[0].T)  # Grafica las señales de potencias instantáneas nodo 1
-
-        axs[0].set_title("Potencias instantaneas en los nodos 1, 2 y 3")
-        axs[0].legend(["Fase A", "Fase B", "Fase C"])
-        axs[0].set_ylabel('Amplitud')
-        axs[0].grid()
-
-        axs[1].plot(self.pinst[1].T)  # Grafica las señales de potencias instantáneas nodo 2
-        axs[1].legend(["Fase A", "Fase B", "Fase C"])
-        axs[1].set_ylabel('Amplitud')
-        axs[1].grid()
-
-        axs[2].plot(self.pinst[2].T)  # Grafica las señales de potencias instantáneas nodo 3
-        axs[2].legend(["Fase A", "Fase B", "Fase C"])
-        axs[2].grid()
-        axs[2].set_ylabel('Amplitud')
-
-        chart = FigureCanvasTkAgg(fig, master=self.root)
-        chart.get_tk_widget().place(x=210, y=60)
+        self.vistas.mostrar('potencia_instantanea',
+                            lambda fig: self._crear_series(fig, 3, "Potencias instantaneas en los nodos 1, 2 y 3",
+                                                           'Amplitud'),
+                            lambda artistas: self._actualizar_series(artistas, self.pinst[:3]),
+                            self.version_datos)
 
     def plot_phasor_current(self):
         """
         Este método contiene los diagramas fasoriales de la corrientes.
         :return: Gráfica de diagramas fasoriales de corrientes.
         """
-        fig = self.analizador.corrientes_fasorial()
-        chart = FigureCanvasTkAgg(fig, master=self.root)
-        chart.get_tk_widget().place(x=210, y=60)
+        self.vistas.mostrar('fasorial_I', lambda fig: self._crear_fasorial(fig, 'I'),
+                            lambda artistas: self._actualizar_fasorial(artistas, 'I'), self.version_datos)
 
         # -------- Seleccionando la señal -----------------------
 
@@ -408,93 +502,68 @@ class Interfaz:
         Método que contiene la tabla de datos RMS de las señales (V e I).
         :return: Tabla con voltajes y corrientes RMS.
         """
-        Data1 = Text(self.root, background="white", width=71, height=10, cursor='none')
-        Data1.config(state="normal")
-        Data1.place(x=740, y=60)
-        Data1.edit_modified(arg=False)
-        Data1.bind("<Key>", lambda a: "break")
-        Data1.insert(INSERT, self.tabla_rms)
+        self.mostrar_tabla(self.tabla_rms)
 
     def Table_power(self):
         """
         Este método contiene la tabla de valores de potencias del sistema.
         :return: Tabla con los valores de potencias.
         """
-        Data2 = Text(self.root, background="white", width=71, height=10, cursor='none')
-        Data2.config(state="normal")
-        Data2.place(x=740, y=60)
-        Data2.edit_modified(arg=False)
-        Data2.bind("<Key>", lambda a: "break")
-        Data2.insert(INSERT, self.tabla_pot)
+        self.mostrar_tabla(self.tabla_pot)
+
+    def registrar_energia(self, V, I):
+        """
+        Este método integra en los registros de energía las señales recién cargadas y los
+        respalda en disco. Se ejecuta en el hilo de cálculo, una vez por cada carga. Una
+        captura ya integrada (la misma de la caché al abrir el programa o con REINICIAR) no
+        se vuelve a sumar: su huella queda en el respaldo.
+        :param V: Voltajes (nodos, fases, muestras)
+        :param I: Corrientes (nodos, fases, muestras)
+        :return: True si la captura es nueva y se integró
+        """
+        clave = huella(V, I)
+        if self.medidor.integrada(clave):
+            return False
+        self.medidor.integrar(V, I, clave=clave)
+        self.medidor.guardar()
+        return True
+
+    def registrar_historico(self, analizador):
+        """
+        Este método agrega al archivo histórico las métricas de las señales recién cargadas,
+        con la hora de la carga. Se ejecuta en el hilo de cálculo, una vez por cada captura nueva.
+        :param analizador: Analizador de las señales cargadas
+        """
+        self.historico.agregar_resultados(time.time(), analizador.resultados())
 
     def table_energy(self):
         """
         Este método contiene la tabla con los valores de energía en las cargas con su costo total.
         :return: Tabla con valores de energía en las cargas y su costo total.
         """
+        self.mostrar_tabla(self.tabla_energia)
+
+    def Table_harmonics(self):
+        """
+        Este método contiene la tabla de distorsión armónica (THD, TDD y factor K) de los nodos.
+        :return: Tabla con los armónicos.
+        """
+        self.mostrar_tabla(self.tabla_armonicos)
 
-        P_inst = []
-        P = []
-
-        for i in range(len(self.I)):
-            p_inst1 = self.V[0][i] * self.I[0][i]
-            p_inst2 = self.V[1][i] * self.I[1][i]
-            p_inst3 = self.V[2][i] * self.I[2][i]
-            p = [p_inst1, p_inst2, p_inst3]
-
-            P_inst.append(p)
-
-        for i in P_inst:
-            act_power1 = abs(np.mean(i[0])) / 1000
-            act_power2 = abs(np.mean(i[1])) / 1000
-            act_power3 = abs(np.mean(i[2])) / 1000
-            act_power = [act_power1, act_power2, act_power3]
-            P.append(act_power)
-
-        E = []  # Lista que contiene los valores de energía.
-        for i in range(len(P)):
-            e1 = P[0][i] * self.hora + P[0][i] * self.minutos / 60 + P[0][i] * self.segundos / 3600
-            e2 = P[1][i] * self.hora + P[1][i] * self.minutos / 60 + P[1][i] * self.segundos / 3600
-            e3 = P[2][i] * self.hora + P[2][i] * self.minutos / 60 + P[2][i] * self.segundos / 3600
-            e = [e1, e2, e3]  # energía total
-            E.append(e)
-        e1a, e1b, e1c = np.round(E[0][0], 2), np.round(E[0][1], 2), np.round(E[0][2], 2)
-        e2a, e2b, e2c = np.round(E[1][0], 2), np.round(E[1][1], 2), np.round(E[1][2], 2)
-        e3a, e3b, e3c = np.round(E[2][0], 2), np.round(E[2][1], 2), np.round(E[2][2], 2)
-        e1t = np.round(e1a + e1b + e1c, 2)
-        e2t = np.round(e2a + e2b + e2c, 2)
-        e3t = np.round(e3a + e3b + e3c, 2)
-        et = np.round(e1t + e2t + e3t, 2)
-        ct1 = np.round(800 * e1t, 2)
-        ct2 = np.round(800 * e2t, 2)
-        ct3 = np.round(800 * e3t, 2)
-        ct = ct1 + ct2 + ct3
-        tabla = tabulate([
-            ['Ea [kWh]', e1a, e2a, e3a, '-'],
-            ['Eb [kWh]', e1b, e2b, e3b, '-'],
-            ['Ec [kWh]', e1c, e2c, e3c, '-'],
-            ['Etotal [kWh]', e1t, e2t, e3t, et],
-            ['Costo $800/kWh', '  ', ' ', ' ', ' '],
-            ['Costo total', '$' + str(ct1), '$' + str(ct2), '$' + str(ct3), '$' + str(ct)]],
-            headers=["Energía", "Nodo 1 ", "Nodo 2 ", "Nodo 3 ", "Total"], tablefmt="fancy_outline")
-        datos = Text(self.root, background="white", width=71, height=10, cursor='none')
-        datos.config(state="normal")
-        datos.place(x=740, y=60)
-        datos.edit_modified(arg=False)
-        datos.bind("<Key>", lambda a: "break")
-        datos.insert(INSERT, tabla)
+    def Table_events(self):
+        """
+        Este método contiene la tabla de eventos de calidad de potencia (huecos, elevaciones,
+        interrupciones y transitorios).
+        :return: Tabla con los eventos detectados.
+        """
+        self.mostrar_tabla(self.tabla_eventos)
 
     def Table_impedance(self):
         """
         Este método contiene la tabla con los valores de impedancia en las cargas.
         :return: Tabla con valores de impedancias de carga.
         """
-        Data3 = Text(self.root, background="white", width=71, height=10, cursor='none')
-        Data3.config(state="normal")
-        Data3.place(x=740, y=60)
-        Data3.edit_modified(arg=False)
-        Data3.bind("<Key>", lambda a: "break")
-        Data3.insert(INSERT, self.tabla_inpedancia)
+        self.mostrar_tabla(self.tabla_inpedancia)
 
     def message_data(self):
         """
@@ -506,12 +575,15 @@ class Interfaz:
                   "   Aquí aparecen las tablas con los datos del\n      " \
                   "   Selector de datos  \n\n" \
                   "   --------------------------------------------"
-        Data = Text(self.root, background="white", width=71, height=10, cursor='none')
-        Data.config(state="normal")
-        Data.place(x=740, y=60)
-        Data.edit_modified(arg=False)
-        Data.bind("<Key>", lambda a: "break")
-        Data.insert(INSERT, message)
+        self.mostrar_tabla(message)
+
+    def mostrar_tabla(self, texto):
+        """
+        Este método reemplaza el contenido del cuadro de datos, que se crea una sola vez.
+        :param texto: Tabla o mensaje a mostrar
+        """
+        self.datos.delete("1.0", END)
+        self.datos.insert(INSERT, texto)
 
         ## ----------- Selección de los datos -----------------------------
 
@@ -530,18 +602,103 @@ class Interfaz:
         elif self.select_data.get() == "Valores de Impedancias":
             self.Table_impedance()
 
+        elif self.select_data.get() == "Armónicos":
+            self.Table_harmonics()
+
         elif self.select_data.get() == "Energía":
             self.table_energy()
+
+        elif self.select_data.get() == "Eventos de calidad":
+            self.Table_events()
         ## ---------- Updating Values and Graphics -------------------
 
     def update(self, event=None):
         """
         Este método es usado por el Botón Generar, para mostrar las señales y los datos seleccionados.
+        Los cálculos se hacen en segundo plano y una nueva solicitud cancela la anterior.
         :param event: Evento que se presenta (inicialmente no hay evento).
         :return: Actualización de los selectores.
         """
-        self.change_signal()
-        self.change_data()
+        self.calcular(mostrar=True)
+
+    ## ---------- Cálculo en segundo plano -------------------
+
+    def _pasos(self):
+        """
+        Este método arma los pasos de cálculo que se ejecutan en el hilo de cálculo. Los
+        métodos del analizador guardan sus resultados en caché, así que repetirlos no cuesta.
+        :return: Lista de tuplas (nombre, función)
+        """
+        pasos = []
+        if self.analizador is None:
+            pasos += [('senales', lambda r: cargar_senales()),  # Caché local, sin red
+                      ('analizador', lambda r: Analizador(*r['senales'])),
+                      ('registro_energia', lambda r: self.registrar_energia(*r['senales'])),
+                      # Solo las capturas nuevas (las que el medidor integró) van al histórico
+                      ('registro_historico',
+                       lambda r: r['registro_energia'] and self.registrar_historico(r['analizador']))]
+
+        def analizador(r):
+            return r.get('analizador', self.analizador)
+
+        # Todo lo que usan las vistas sale de aquí: el hilo de la interfaz no toca el analizador
+        pasos += [('V4', lambda r: analizador(r).nodo4()[0]),
+                  ('I_n4', lambda r: analizador(r).nodo4()[1]),
+                  ('fasores_V', lambda r: analizador(r).datos_fasoriales('V')),
+                  ('fasores_I', lambda r: analizador(r).datos_fasoriales('I')),
+                  ('pinst', lambda r: analizador(r).pot_instantanea()),
+                  ('resultados', lambda r: analizador(r).resultados()),  # Todas las tablas salen de aquí
+                  ('tabla_rms', lambda r: r['resultados'].tabla_rms()),
+                  ('tabla_inpedancia', lambda r: r['resultados'].tabla_impedancias()),
+                  ('P', lambda r: np.round(r['resultados'].P_nodo, 4)),
+                  ('Q', lambda r: np.round(r['resultados'].Q_nodo, 4)),
+                  ('tabla_pot', lambda r: r['resultados'].tabla_potencias()),
+                  ('tabla_armonicos', lambda r: analizador(r).tabla_armonicos()),
+                  ('tabla_eventos', lambda r: analizador(r).tabla_eventos()),
+                  ('tabla_energia', lambda r: self.medidor.tabla(self.tarifa))]  # Solo lee los registros
+        return pasos
+
+    def calcular(self, mostrar=True):
+        """
+        Este método envía una tarea de cálculo al hilo de cálculo.
+        :param mostrar: Si se debe mostrar la selección cuando termine la tarea
+        """
+        self._mostrar = mostrar
+        self.trabajador.enviar(self._pasos())
+
+    def revisar_trabajador(self):
+        """
+        Este método revisa periódicamente la cola del hilo de cálculo y actualiza el progreso.
+        """
+        for tipo, datos in self.trabajador.recibir():
+            if tipo == 'progreso':
+                fraccion, nombre = datos
+                self.progreso['value'] = 100 * fraccion
+                self.estado.configure(text="Calculando: " + nombre)
+            elif tipo == 'listo':
+                self.progreso['value'] = 100
+                self.estado.configure(text="Listo")
+                self._recibir(datos)
+            elif tipo == 'error':
+                self.estado.configure(text="")
+                mb.showerror("ANALIZADOR DE LÍNEA", str(datos))
+        self.root.after(50, self.revisar_trabajador)
+
+    def _recibir(self, resultados):
+        """
+        Este método guarda en la interfaz los resultados del hilo de cálculo y, si se pidió,
+        muestra la selección.
+        :param resultados: Diccionario con los resultados de cada paso
+        """
+        if 'senales' in resultados:
+            self.V, self.I = resultados.pop('senales')
+        if 'analizador' in resultados:  # Datos nuevos: las vistas los actualizan la próxima vez que se muestren
+            self.version_datos += 1
+        for nombre, valor in resultados.items():
+            setattr(self, nombre, valor)
+        if self._mostrar:
+            self.change_signal()
+            self.change_data()
 
 
 # Salvaguarda:
@@ -0,0 +1,196 @@
+"""
+Este módulo contiene el motor de cálculo por lotes del analizador de línea.
+Las señales de todos los nodos se apilan en un solo arreglo contiguo de forma
+(nodos, fases, muestras), o (alimentadores, nodos, fases, muestras) para varios
+alimentadores, y las métricas se obtienen con unas pocas reducciones sobre el
+eje de las muestras.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import functools  # Caché de los núcleos de la DFT
+import numpy as np  # Cálculos matemáticos
+
+# Muestras por bloque: la memoria de trabajo es un múltiplo fijo de este tamaño
+BLOQUE = 1 << 16
+# Muestras por bloque de la pasada fusionada: los bloques de V e I caben en la caché L2
+BLOQUE_CACHE = 1 << 13
+
+# Canales de referencia de los tamaños de bloque (3 nodos × 3 fases); con más canales
+# los bloques se acortan para que la memoria de trabajo no crezca
+CANALES = 9
+
+# Políticas de precisión: tipo real de almacenamiento y cálculo. Las reducciones siempre
+# acumulan en float64.
+PRECISIONES = {'float64': np.float64, 'float32': np.float32}
+
+
+def apilar(X, dtype=None):
+    """
+    Apila las señales de los nodos en un arreglo contiguo. Los np.memmap y las cuentas enteras
+    del ADC se usan tal cual, sin copiarlos ni ensancharlos: se convierten bloque a bloque.
+    :param X: Lista de arreglos (fases, muestras) o arreglo (..., nodos, fases, muestras)
+    :param dtype: Tipo real de almacenamiento (por defecto el de los arreglos, o float64)
+    :return: Arreglo de forma (..., nodos, fases, muestras)
+    """
+    if isinstance(X, np.ndarray) and (dtype is None or X.dtype == dtype or X.dtype.kind in 'iu'
+                                      or isinstance(X, np.memmap)):
+        return X
+    return np.ascontiguousarray(X, dtype=dtype or float)
+
+
+def bloque_canales(bloque, canales):
+    """
+    Acorta un tamaño de bloque pensado para CANALES canales cuando se procesan más canales a la
+    vez (p. ej. muchos alimentadores), para que un bloque de todos ellos ocupe lo mismo.
+    :param bloque: Muestras por bloque para CANALES canales
+    :param canales: Número de canales procesados juntos
+    :return: Muestras por bloque
+    """
+    return max(1024, bloque * CANALES // max(canales, CANALES))
+
+
+def bloques(n, bloque=BLOQUE):
+    """
+    Divide el eje de las muestras en bloques de tamaño acotado.
+    :param n: Número total de muestras
+    :param bloque: Muestras por bloque
+    :return: Generador de objetos slice
+    """
+    for inicio in range(0, n, bloque):
+        yield slice(inicio, min(inicio + bloque, n))
+
+
+@functools.lru_cache(maxsize=32)
+def _nucleo_real(N, k, bloque):
+    """
+    Retorna las primeras muestras del núcleo del término k de una DFT de N puntos como matriz
+    real (muestras, 2) con las partes real e imaginaria, escalado para dar amplitudes pico.
+    Multiplicar un bloque real por esta matriz no crea una copia compleja del bloque.
+    :param N: Número de muestras de la ventana
+    :param k: Término de la DFT
+    :param bloque: Número de muestras del núcleo
+    :return: Arreglo de solo lectura (bloque, 2)
+    """
+    w = np.exp(-2j * np.pi * k * np.arange(bloque) / N) * (2 / N)
+    W = np.ascontiguousarray(np.stack([w.real, w.imag], axis=1))
+    W.flags.writeable = False
+    return W
+
+
+def pasada(V, I, bloque=BLOQUE_CACHE, escala_v=1.0, escala_i=1.0, ventana=None):
+    """
+    Recorre una sola vez cada par de canales V/I por bloques del tamaño de la caché y acumula
+    en float64 Σv², Σi², Σv·i y, si se pide, el término fundamental de la DFT. Los bloques
+    que no son float64 (float32, cuentas del ADC) se convierten una vez a un búfer de trabajo
+    reutilizado, en lugar de una vez por cada suma.
+    :param V: Voltajes (nodos, fases, muestras)
+    :param I: Corrientes (nodos, fases, muestras)
+    :param bloque: Muestras por bloque
+    :param escala_v: Factor por canal que convierte las muestras de V a voltios
+    :param escala_i: Factor por canal que convierte las muestras de I a amperios
+    :param ventana: Tupla (N, k) de la DFT (N muestras desde el inicio, término k), o None
+    :return: Tupla (svv, sii, svi, Xv, Xi) con forma (nodos, fases); Xv y Xi son los fasores
+             (None sin ventana)
+    """
+    forma = V.shape[:-1]
+    svv, sii, svi = np.zeros(forma), np.zeros(forma), np.zeros(forma)
+    N, k = ventana or (0, 0)
+    Xv, Xi = np.zeros(forma, dtype=complex), np.zeros(forma, dtype=complex)
+    W = _nucleo_real(N, k, bloque) if ventana else None
+    trabajo_v = None if V.dtype == np.float64 else np.empty(forma + (bloque,))
+    trabajo_i = None if I.dtype == np.float64 else np.empty(forma + (bloque,))
+    for s in bloques(V.shape[-1], bloque):
+        m = s.stop - s.start
+        v, i = V[..., s], I[..., s]
+        if trabajo_v is not None:
+            np.copyto(trabajo_v[..., :m], v)
+            v = trabajo_v[..., :m]
+        if trabajo_i is not None:
+            np.copyto(trabajo_i[..., :m], i)
+            i = trabajo_i[..., :m]
+        svv += np.einsum('...k,...k->...', v, v)
+        sii += np.einsum('...k,...k->...', i, i)
+        svi += np.einsum('...k,...k->...', v, i)
+        if s.start < N:  # Término de la DFT: núcleo del primer bloque rotado al inicio del bloque
+            n = min(m, N - s.start)
+            giro = np.exp(-2j * np.pi * k * s.start / N)
+            pv, pi = v[..., :n] @ W[:n], i[..., :n] @ W[:n]
+            Xv += (pv[..., 0] + 1j * pv[..., 1]) * giro
+            Xi += (pi[..., 0] + 1j * pi[..., 1]) * giro
+    # Las escalas son lineales: se aplican a las sumas y no a cada muestra
+    escala_v, escala_i = np.asarray(escala_v, dtype=float), np.asarray(escala_i, dtype=float)
+    fasores = (Xv * escala_v, Xi * escala_i) if ventana else (None, None)
+    return (svv * escala_v ** 2, sii * escala_i ** 2, svi * escala_v * escala_i) + fasores
+
+
+def gram(V, I, bloque=BLOQUE, escala_v=1.0, escala_i=1.0):
+    """
+    Calcula por bloques, para cada fase, la matriz de Gram de las señales medidas: Σz·zᵀ con
+    z = [v de cada nodo, i de cada nodo]. Con ella se obtiene la energía de cualquier
+    combinación lineal de las señales (p. ej. los nodos no medidos) sin calcular sus muestras.
+    :param V: Voltajes (..., nodos, fases, muestras)
+    :param I: Corrientes (..., nodos, fases, muestras)
+    :param bloque: Muestras por bloque
+    :param escala_v: Factor por canal que convierte las muestras de V a voltios
+    :param escala_i: Factor por canal que convierte las muestras de I a amperios
+    :return: Matriz de Gram (..., fases, 2·nodos, 2·nodos) en float64
+    """
+    G = 0
+    for s in bloques(V.shape[-1], bloque):
+        z = np.concatenate([V[..., s], I[..., s]], axis=-3, dtype=np.float64).swapaxes(-3, -2)
+        G = G + z @ z.swapaxes(-1, -2)
+    # Las escalas se aplican a la matriz acumulada y no a cada muestra
+    escala = np.concatenate([np.broadcast_to(escala_v, V.shape[:-1]), np.broadcast_to(escala_i, I.shape[:-1])],
+                            axis=-2).swapaxes(-2, -1)
+    return G * escala[..., :, None] * escala[..., None, :]
+
+
+def sumas(V, I, bloque=BLOQUE_CACHE, escala_v=1.0, escala_i=1.0):
+    """
+    Calcula por bloques las sumas de segundo orden de cada canal: Σv², Σi² y Σv·i. Los
+    totales se acumulan en float64 aunque las muestras sean float32 o cuentas enteras del ADC.
+    :param V: Voltajes (nodos, fases, muestras)
+    :param I: Corrientes (nodos, fases, muestras)
+    :param bloque: Muestras por bloque
+    :param escala_v: Factor por canal que convierte las muestras de V a voltios
+    :param escala_i: Factor por canal que convierte las muestras de I a amperios
+    :return: Tupla (svv, sii, svi) con forma (nodos, fases)
+    """
+    return pasada(V, I, bloque, escala_v, escala_i)[:3]
+
+
+def desde_sumas(svv, sii, svi, n):
+    """
+    Obtiene todas las métricas de potencia a partir de las sumas de segundo orden.
+    Las métricas por nodo promedian las fases, igual que los métodos del Analizador.
+    :param svv: Suma de v² por canal
+    :param sii: Suma de i² por canal
+    :param svi: Suma de v·i por canal
+    :param n: Número de muestras sumadas
+    :return: Diccionario con RMS, P, Q, S y PF por fase y por nodo
+    """
+    v_rms = np.sqrt(svv / n)
+    i_rms = np.sqrt(sii / n)
+    P = svi / n  # Potencia activa: valor medio de la potencia instantánea
+    S = v_rms * i_rms
+    Q = np.sqrt(abs(S ** 2 - P ** 2))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        PF = np.where(S > 0, P / S, 0.0)
+
+    # Métricas por nodo (promedio sobre el eje de las fases)
+    v_nodo = np.sqrt(np.mean(svv, axis=-1) / n)
+    i_nodo = np.sqrt(np.mean(sii, axis=-1) / n)
+    P_nodo = np.mean(P, axis=-1)
+    S_nodo = v_nodo * i_nodo
+    Q_nodo = np.sqrt(abs(S_nodo ** 2 - P_nodo ** 2))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        PF_nodo = np.where(S_nodo > 0, P_nodo / S_nodo, 0.0)  # Con signo, como el de cada fase
+
+    return {'v_rms': v_rms, 'i_rms': i_rms, 'P': P, 'Q': Q, 'S': S, 'PF': PF,
+            'v_rms_nodo': v_nodo, 'i_rms_nodo': i_nodo, 'P_nodo': P_nodo, 'Q_nodo': Q_nodo,
+            'S_nodo': S_nodo, 'PF_nodo': PF_nodo}
+
@@ -0,0 +1,489 @@
+"""
+Este módulo contiene el núcleo numérico del analizador de línea de un sistema de
+distribución de energía de 4 nodos. Solo depende de NumPy, por lo que se importa
+rápido y sin backend gráfico; las tablas y las gráficas están en analizador.py.
+Las señales pueden tener cualquier número de nodos y fases y ejes iniciales
+adicionales, por ejemplo (alimentadores, nodos, fases, muestras): todas las
+métricas de una flota de alimentadores se calculan en una sola llamada.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+# Importación de las librerías y módulos necesarios
+import functools  # Memorización de las cantidades derivadas
+import numpy as np  # Cálculos matemáticos
+import motor  # Motor de cálculo por lotes
+import fasores  # Estimador de fasores
+import armonicos  # Análisis de armónicos
+import calidad  # Detector de eventos de calidad de potencia
+import frecuencia  # Seguimiento de frecuencia y remuestreo
+import perfil  # Instrumentación (sin costo si está desactivada)
+from red import Red  # Modelo de la red de distribución
+from resultados import Resultados  # Contenedor de resultados
+
+
+# Datos de entrada observados y grafo de dependencias de las cantidades derivadas
+_SENALES = ('V', 'I', 'escala_V', 'escala_I', 'precision')
+_OBSERVADOS = _SENALES + ('red', 'fs', 'f', 'ciclos', 'orden')
+_DEPENDENCIAS = {
+    'pasada': _SENALES + ('fs', 'f', 'ciclos'),
+    'metricas': _SENALES + ('fs', 'f', 'ciclos'),
+    'nodos_no_medidos': _SENALES + ('red',),
+    'fasores': _SENALES + ('red', 'fs', 'f', 'ciclos'),
+    'rms_no_medidos': _SENALES + ('red',),
+    'medios_ciclos': _SENALES + ('fs', 'f'),
+    'armonicos': _SENALES + ('fs', 'f', 'orden'),
+    'resultados': _SENALES + ('red', 'fs', 'f', 'ciclos'),
+}
+
+
+def _perezoso(metodo):
+    """
+    Decorador que calcula una cantidad derivada a lo sumo una vez por conjunto de datos.
+    El resultado se guarda en la caché del analizador con la firma de sus dependencias.
+    :param metodo: Método sin argumentos del analizador
+    :return: Método memorizado
+    """
+    cantidad = metodo.__name__
+
+    @functools.wraps(metodo)
+    def envoltura(self):
+        firma = self._firma(cantidad)
+        entrada = self._cache.get(cantidad)
+        if entrada is None or entrada[0] != firma:
+            entrada = (firma, metodo(self))
+            self._cache[cantidad] = entrada
+        return entrada[1]
+
+    envoltura.__perezoso__ = cantidad  # La instrumentación distingue así los aciertos de la caché
+    return envoltura
+
+
+# Creando el objeto AnalizadorNumerico
+@perfil.instrumentable()
+class AnalizadorNumerico:
+    """
+    Esta es la clase AnalizadorNumerico, la cual contiene los cálculos del analizador de un sistema
+    de distribución de energía de 4 nodos, sin tablas ni gráficas.
+    """
+
+    def __init__(self, V, I, red=None, fs=6000, f=60, ciclos=None, bloque=motor.BLOQUE, precision=None,
+                 escala_V=None, escala_I=None, orden=armonicos.ORDEN):
+        """
+        Método que inicializa la clase. También conocido como Constructor.
+        :param V: Voltajes (..., nodos, fases, muestras) en voltios o en cuentas enteras del ADC;
+                  los ejes iniciales, si los hay, son alimentadores con la misma red
+        :param I: Corrientes con la forma de V, en amperios o en cuentas enteras del ADC
+        :param red: Modelo de la red, con un nodo medido por cada nodo de V (por defecto la red
+                    de 4 nodos con 3 nodos medidos y una red en estrella con otro número)
+        :param fs: Frecuencia de muestreo [Hz] (100 muestras por ciclo a 60 Hz)
+        :param f: Frecuencia del sistema [Hz]
+        :param ciclos: Ciclos usados para estimar los fasores (por defecto todos los completos)
+        :param bloque: Muestras por bloque en las reducciones (acota la memoria de trabajo)
+        :param precision: 'float64' o 'float32' (y complex64) para almacenar y calcular las
+                          señales; las reducciones siempre acumulan en float64. Por defecto
+                          float32 si V es float32 y float64 en otro caso.
+        :param escala_V: Factor por canal (escalar, (nodos, 1) o (nodos, fases)) que convierte
+                         las muestras de V a voltios
+        :param escala_I: Factor por canal que convierte las muestras de I a amperios
+        :param orden: Orden armónico máximo del análisis de armónicos
+        """
+        # Caché de cantidades derivadas y versión de cada dato de entrada
+        self._cache = {}
+        self._versiones = {}
+
+        # Atributos de la clase
+        # Voltajes y corrientes en los nodos:
+        self.precision = precision  # Política de precisión
+        self.V = motor.apilar(V, motor.PRECISIONES.get(precision))  # Voltajes (..., nodos, fases, muestras)
+        self.I = motor.apilar(I, motor.PRECISIONES.get(precision))  # Corrientes (..., nodos, fases, muestras)
+        self.escala_V = escala_V  # Escalas del ADC (None si V e I ya están en unidades físicas)
+        self.escala_I = escala_I
+        n_nodos = self.V.shape[-3]
+        if red is None:
+            red = Red.para_nodos(n_nodos)
+        elif len(red.medidos) != n_nodos:
+            raise ValueError('La red tiene %d nodos medidos y las señales %d nodos'
+                             % (len(red.medidos), n_nodos))
+        self.red = red  # Líneas de la red
+        self.fs = fs  # Frecuencia de muestreo
+        self.f = f  # Frecuencia del sistema
+        self.ciclos = ciclos  # Ciclos de la ventana de estimación de fasores
+        self.bloque = bloque  # Muestras por bloque
+        self.orden = orden  # Orden armónico máximo
+        self.f_medida = None  # Frecuencia medida por ventana, si las señales se remuestrearon
+        self.remuestreo = None  # (muestras, fs, muestras por ventana, muestras por ciclo) originales
+
+    @classmethod
+    def desde_archivo(cls, ruta, nodos=3, fases=3, dtype='float64', offset=0, **kwargs):
+        """
+        Crea un analizador sobre una grabación en disco mapeada en memoria. La grabación puede
+        ser un .npy o un archivo binario crudo con disposición (2, nodos, fases, muestras) en
+        orden C: primero todos los voltajes y luego todas las corrientes. Las grabaciones en
+        cuentas del ADC (dtype 'int16' o 'int32') se usan sin ensancharlas, con escala_V y
+        escala_I en kwargs.
+        :param ruta: Ruta del archivo
+        :param nodos: Número de nodos medidos (archivos crudos)
+        :param fases: Número de fases por nodo (archivos crudos)
+        :param dtype: Tipo de dato de las muestras (archivos crudos)
+        :param offset: Bytes de encabezado a omitir (archivos crudos)
+        :param kwargs: Argumentos adicionales del constructor
+        :return: Analizador sobre la grabación
+        """
+        if str(ruta).endswith('.npy'):
+            X = np.load(ruta, mmap_mode='r')
+        else:
+            X = np.memmap(ruta, dtype=dtype, mode='r', offset=offset).reshape(2, nodos, fases, -1)
+        return cls(X[0], X[1], **kwargs)
+
+    @classmethod
+    def con_seguimiento(cls, V, I, fs=6000, f=60, muestras_ciclo=frecuencia.MUESTRAS_CICLO,
+                        ciclos_ventana=frecuencia.CICLOS, en_disco=None, **kwargs):
+        """
+        Crea un analizador sobre las señales remuestreadas a ciclos enteros: se sigue la
+        frecuencia por ventanas y cada ciclo queda con muestras_ciclo muestras. Sirve para
+        cualquier frecuencia de muestreo y para frecuencias fuera de la nominal, que de otro
+        modo dejan ciclos incompletos (fuga espectral y errores en P y Q). Las métricas
+        temporales del analizador (eventos, muestras) quedan en la escala de ciclos nominales;
+        self.instantes da el instante real de cada muestra. Las grabaciones mapeadas en memoria
+        se remuestrean a archivos temporales mapeados, con memoria acotada.
+        :param V: Voltajes (..., nodos, fases, muestras)
+        :param I: Corrientes con la forma de V
+        :param fs: Frecuencia de muestreo de las señales [Hz]
+        :param f: Frecuencia nominal del sistema [Hz]
+        :param muestras_ciclo: Muestras por ciclo de las señales remuestreadas
+        :param ciclos_ventana: Ciclos nominales por ventana de seguimiento
+        :param en_disco: Si las señales remuestreadas van a disco (por defecto, si V es np.memmap)
+        :param kwargs: Argumentos adicionales del constructor
+        :return: Analizador con fs = muestras_ciclo·f
+        """
+        V, I = motor.apilar(V), motor.apilar(I)
+        Vr, Ir, f_medida = frecuencia.remuestrear(V, I, fs, f, muestras_ciclo, ciclos_ventana, en_disco=en_disco)
+        analizador = cls(Vr, Ir, fs=muestras_ciclo * f, f=f, **kwargs)
+        analizador.f_medida = f_medida
+        analizador.remuestreo = (V.shape[-1], fs, int(round(ciclos_ventana * fs / f)), muestras_ciclo)
+        return analizador
+
+    def instantes(self, tramo=slice(None)):
+        """
+        Retorna el instante original de las muestras de un tramo. Sin remuestreo es n / fs.
+        :param tramo: Muestras pedidas (por defecto todas)
+        :return: Instantes [s]
+        """
+        if self.remuestreo is None:
+            return np.arange(*tramo.indices(self.V.shape[-1])) / self.fs
+        n, fs, W, muestras_ciclo = self.remuestreo
+        return frecuencia.tiempos(n, fs, self.f_medida, W, muestras_ciclo, tramo)
+
+    def __setattr__(self, nombre, valor):
+        """
+        Asigna un atributo e invalida las cantidades derivadas que dependen de él.
+        :param nombre: Nombre del atributo
+        :param valor: Nuevo valor del atributo
+        """
+        object.__setattr__(self, nombre, valor)
+        if nombre in _OBSERVADOS:
+            self.invalidar(nombre)
+
+    def invalidar(self, *nombres):
+        """
+        Invalida las cantidades derivadas de los datos indicados. Se debe llamar después
+        de modificar V o I en el mismo lugar (p. ej. self.V[0] *= 2).
+        :param nombres: Datos modificados ('V', 'I', 'red'). Sin argumentos se invalida todo.
+        """
+        for nombre in nombres or _OBSERVADOS:
+            self._versiones[nombre] = self._versiones.get(nombre, 0) + 1
+            for cantidad, dependencias in _DEPENDENCIAS.items():
+                if nombre in dependencias:
+                    self._cache.pop(cantidad, None)
+
+    def _firma(self, cantidad):
+        """
+        Retorna la firma (versiones de las entradas) con la que se guarda una cantidad en caché.
+        :param cantidad: Nombre de la cantidad derivada
+        :return: Tupla con las versiones de sus dependencias
+        """
+        return tuple(self._versiones.get(d, 0) for d in _DEPENDENCIAS[cantidad])
+
+    def _bloque(self, bloque=None):
+        """
+        Retorna las muestras por bloque de las reducciones, acortadas si hay más canales que
+        los de referencia (p. ej. muchos alimentadores) para acotar la memoria de trabajo.
+        :param bloque: Muestras por bloque para los canales de referencia (por defecto self.bloque)
+        :return: Muestras por bloque
+        """
+        return motor.bloque_canales(self.bloque if bloque is None else bloque, int(np.prod(self.V.shape[:-1])))
+
+    def _real(self):
+        """
+        Retorna el tipo real de cálculo según la política de precisión.
+        :return: np.float32 o np.float64
+        """
+        if self.precision is not None:
+            return motor.PRECISIONES[self.precision]
+        return np.float32 if self.V.dtype == np.float32 else np.float64
+
+    def _escalas(self):
+        """
+        Retorna las escalas del ADC de V e I con la forma de los canales (..., nodos, fases).
+        :return: Tupla (escala_V, escala_I) en float64
+        """
+        return tuple(np.broadcast_to(np.asarray(1.0 if e is None else e, dtype=float), self.V.shape[:-1])
+                     for e in (self.escala_V, self.escala_I))
+
+    def _senales(self, s=slice(None)):
+        """
+        Retorna un tramo de V e I en unidades físicas y en el tipo de cálculo. Sin escalas y
+        con el tipo correcto no se copia nada.
+        :param s: Tramo de muestras
+        :return: Tupla (V, I) con forma (..., nodos, fases, muestras del tramo)
+        """
+        real = self._real()
+        senales = []
+        for X, escala, e in zip((self.V, self.I), self._escalas(), (self.escala_V, self.escala_I)):
+            X = X[..., s]
+            if e is None:
+                senales.append(X.astype(real, copy=False))
+            else:
+                senales.append(np.multiply(X, escala[..., None].astype(real), dtype=real))
+        return tuple(senales)
+
+    # -------------------------------------------------------
+    # Métodos de la clase AnalizadorNumerico:
+    @_perezoso
+    def pasada(self):
+        """
+        Este método recorre una sola vez las señales medidas con el núcleo fusionado del motor:
+        sumas de segundo orden y término fundamental de la DFT de todos los canales.
+        :return: Tupla (svv, sii, svi, Vf, If); Vf e If son None si no hay un ciclo completo
+        """
+        try:
+            ventana = fasores.ventana(self.V.shape[-1], self.fs, self.f, self.ciclos)[::-1]
+        except ValueError:  # Señal sin ciclos completos: solo las sumas (fasores() da el error)
+            ventana = None
+        return motor.pasada(self.V, self.I, self._bloque(min(self.bloque, motor.BLOQUE_CACHE)),
+                            *self._escalas(), ventana=ventana)
+
+    def frecuencia(self, ciclos=frecuencia.CICLOS):
+        """
+        Este método retorna la frecuencia del sistema por ventana: la medida antes de
+        remuestrear (con_seguimiento) o la que se estima de los voltajes.
+        :param ciclos: Ciclos nominales por ventana
+        :return: Frecuencia de cada ventana [Hz]
+        """
+        if self.f_medida is not None:
+            return self.f_medida
+        return frecuencia.estimar(self.V, self.fs, self.f, ciclos, self.bloque)
+
+    @_perezoso
+    def metricas(self):
+        """
+        Este método calcula los valores RMS, P, Q, S y PF de todos los nodos y fases a partir
+        de las sumas de la pasada fusionada.
+        :return: Diccionario con las métricas por fase y por nodo
+        """
+        svv, sii, svi, _, _ = self.pasada()
+        return motor.desde_sumas(svv, sii, svi, self.V.shape[-1])
+
+    # Cálculo de los voltajes RMS
+    def v_rms(self):
+        """
+        Este método calcula los valores RMS de voltajes en los nodos.
+        :return: El valor RMS de las tensiones
+        """
+        return np.round(self.metricas()['v_rms_nodo'], 4)
+
+    def i_rms(self):
+        """
+        Este método calcula los valores RMS de corrientes en los nodos.
+        :return: El valor RMS de las corrientes
+        """
+        return np.round(self.metricas()['i_rms_nodo'], 4)
+
+    @_perezoso
+    def nodos_no_medidos(self):
+        """
+        Este método resuelve con el modelo de la red los voltajes y corrientes de todos los
+        nodos no medidos.
+        :return: Tupla (Vu, Iu) con forma (..., no medidos, fases, muestras)
+        """
+        return self.red.resolver(*self._senales(), eje=-3)
+
+    @_perezoso
+    def fasores(self):
+        """
+        Este método retorna los fasores fundamentales de todos los canales, que la pasada
+        fusionada estima con el término de la DFT. Los fasores de los nodos no medidos se
+        obtienen resolviendo la red en el dominio fasorial.
+        :return: Tupla (Vf, If, Vu, Iu) con forma (..., nodos, fases)
+        """
+        Vf, If = self._fasores_medidos()
+        Vu, Iu = self.red.resolver(Vf, If, eje=-2)
+        return Vf, If, Vu, Iu
+
+    def _fasores_medidos(self):
+        """
+        Retorna los fasores de los nodos medidos, calculados junto con las sumas en la misma
+        pasada (sin resolver la red).
+        :return: Tupla (Vf, If) con forma (..., nodos, fases)
+        """
+        _, _, _, Vf, If = self.pasada()
+        if Vf is None:
+            fasores.ventana(self.V.shape[-1], self.fs, self.f, self.ciclos)  # Informa el error
+        return Vf, If
+
+    @_perezoso
+    def rms_no_medidos(self):
+        """
+        Este método calcula los valores RMS de los nodos no medidos a partir de la matriz de
+        Gram de las señales medidas, sin calcular sus muestras.
+        :return: Tupla (Vu_rms, Iu_rms) con forma (..., no medidos, fases)
+        """
+        G = motor.gram(self.V, self.I, self._bloque(), *self._escalas())
+        suma_v, suma_i = self.red.cuadrados(G)
+        n = self.V.shape[-1]
+        return np.sqrt(suma_v / n), np.sqrt(suma_i / n)
+
+    def _muestras_ciclo(self):
+        """
+        Retorna el número de muestras por ciclo de la frecuencia fundamental.
+        :return: Muestras por ciclo
+        """
+        return int(round(self.fs / self.f))
+
+    @_perezoso
+    def medios_ciclos(self):
+        """
+        Este método calcula por bloques, para cada medio ciclo de los voltajes, la suma de
+        cuadrados y el máximo salto respecto al ciclo anterior, en unidades físicas.
+        :return: Tupla (sumas, saltos) con forma (..., nodos, fases, medios ciclos)
+        """
+        sumas, saltos = calidad.medios_ciclos(self.V, self._muestras_ciclo(), self._bloque())
+        if self.escala_V is not None:  # Las escalas del ADC se aplican después de reducir
+            escala = self._escalas()[0][..., None]
+            sumas, saltos = sumas * escala ** 2, saltos * escala
+        return sumas, saltos
+
+    def rms_medio_ciclo(self):
+        """
+        Este método calcula el RMS de un ciclo de los voltajes actualizado cada medio ciclo.
+        :return: Urms(1/2) con forma (..., nodos, fases, medios ciclos - 1)
+        """
+        return calidad.rms_medio_ciclo(self.medios_ciclos()[0], self._muestras_ciclo())
+
+    def eventos(self, **umbrales):
+        """
+        Este método detecta los huecos, elevaciones, interrupciones y transitorios de los
+        voltajes de todos los nodos y fases.
+        :param umbrales: Umbrales de calidad.detectar (nominal, hueco, elevacion, ...)
+        :return: Arreglo estructurado con dtype calidad.EVENTO, ordenado por inicio
+        """
+        N = self._muestras_ciclo()
+        return calidad.detectar(self.rms_medio_ciclo(), self.fs, N, saltos=self.medios_ciclos()[1],
+                                **umbrales)
+
+    @_perezoso
+    def armonicos(self):
+        """
+        Este método calcula las magnitudes RMS y las fases de los armónicos de los voltajes y
+        corrientes de todos los nodos y fases, en ventanas de 12 ciclos.
+        :return: Tupla (Vh, Ih, fases_V, fases_I) con forma (..., nodos, fases, orden + 1)
+        """
+        resultado = []
+        for X, escala, e in zip((self.V, self.I), self._escalas(), (self.escala_V, self.escala_I)):
+            mag, fase = armonicos.espectro(X, self.fs, self.f, self.orden, bloque=self._bloque())
+            resultado.append((mag if e is None else mag * escala[..., None], fase))
+        (Vh, fases_V), (Ih, fases_I) = resultado
+        return Vh, Ih, fases_V, fases_I
+
+    def thd(self):
+        """
+        Este método calcula la distorsión armónica total de voltajes y corrientes.
+        :return: Tupla (THD_V, THD_I) en por unidad con forma (..., nodos, fases)
+        """
+        Vh, Ih, _, _ = self.armonicos()
+        return armonicos.thd(Vh), armonicos.thd(Ih)
+
+    def tdd(self, demanda=None):
+        """
+        Este método calcula la distorsión total de demanda de las corrientes.
+        :param demanda: Corriente de demanda máxima [A] (por defecto el RMS medido de cada fase)
+        :return: TDD en por unidad con forma (..., nodos, fases)
+        """
+        if demanda is None:
+            demanda = self.metricas()['i_rms']
+        return armonicos.tdd(self.armonicos()[1], demanda)
+
+    def factor_k(self):
+        """
+        Este método calcula el factor K de las corrientes de cada nodo y fase.
+        :return: Factor K con forma (..., nodos, fases)
+        """
+        return armonicos.factor_k(self.armonicos()[1])
+
+    @_perezoso
+    def resultados(self):
+        """
+        Este método reúne en un solo objeto las métricas por nodo y fase, las impedancias y
+        los valores RMS de los nodos no medidos. Las tablas y exportaciones salen de él.
+        :return: Resultados
+        """
+        return Resultados.desde_analizador(self)
+
+    def nodo4(self):
+        """
+        Este método retorna el voltaje y la corriente en el nodo 4.
+        :return: Tupla (V4, I_n4) con forma (..., fases, muestras)
+        """
+        Vu, Iu = self.nodos_no_medidos()
+        return Vu[..., 0, :, :], Iu[..., 0, :, :]
+
+    def pot_instantanea(self):
+        """
+        Este método calcula las potencias instantáneas en los nodos. No se memoriza: ocupa
+        nodos² veces las señales, y quien la usa (la vista de potencias) guarda su copia.
+        :return: Potencias instantáneas V[i]·I[j] de cada par de nodos (..., nodos², fases, muestras)
+        """
+        V, I = self._senales()
+        n = V.shape[-3]
+        return (V[..., :, None, :, :] * I[..., None, :, :, :]).reshape(*V.shape[:-3], n * n, *V.shape[-2:])
+
+    def pot_activa(self):
+        """
+        Este método calcula las potencias activas en los nodos, con signo: son negativas si el
+        flujo se invierte, igual que el factor de potencia.
+        :return: Potencias activas en los nodos
+        """
+        return np.round(self.metricas()['P_nodo'], 4)
+
+    def pot_reactiva(self):
+        """
+        Este método calcula la potencia reactiva en los nodos.
+        :return: Los valores de potencias reactivas.
+        """
+        return np.round(self.metricas()['Q_nodo'], 4)
+
+    def pot_aparente(self):
+        """
+        Este método calcula la potencia aparente en los nodos.
+        :return: Los valores de potencias aparentes.
+        """
+        return np.round(self.metricas()['S_nodo'], 4)
+
+    def factor_potencia(self):
+        """
+        Este método calcula el factor de potencia del sistema.
+        :return: Los factores de potencia en los nodos.
+        """
+        return np.round(self.metricas()['PF_nodo'], 4)
+
+    def impedancias_complejas(self):
+        """
+        Este método calcula las impedancias de carga a partir de los fasores fundamentales.
+        :return: Impedancias complejas (..., nodos, fases)
+        """
+        Vf, If = self._fasores_medidos()  # Solo los nodos medidos: no se resuelve la red
+        return Vf / If
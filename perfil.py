@@ -0,0 +1,291 @@
+"""
+Este módulo contiene la instrumentación del analizador. Los métodos registrados
+cuentan llamadas, tiempo, bytes asignados (tracemalloc) y aciertos de la caché,
+agrupados por pila de llamadas. Desactivada no cuesta nada: los métodos
+originales solo se reemplazan por sus envolturas mientras está activa. Los datos
+se exportan como JSON y en formato de pilas plegadas (flame graph).
+
+Para perfilar una ejecución completa: ANALIZADOR_PERFIL=perfil.json python main.py
+(al salir se escriben perfil.json y perfil.folded).
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import atexit  # Exportación al salir
+import contextlib  # Secciones medidas
+import functools  # Envolturas
+import inspect  # Métodos de las clases
+import json  # Exportación
+import os  # Variable de entorno
+import threading  # Pilas por hilo
+import time  # Medición del tiempo
+import tracemalloc  # Bytes asignados
+
+_REGISTRO = {}  # (propietario, nombre) -> (función original, etiqueta)
+_ESTADISTICAS = {}  # pila (tupla de nombres) -> [llamadas, segundos, propio, bytes, aciertos]
+_CANDADO = threading.Lock()
+_HILO = threading.local()  # Pila de marcos del hilo actual
+_ACTIVO = False
+_MEMORIA = False
+
+
+class _Marco:
+    """
+    Marco de una llamada medida en la pila del hilo.
+    """
+    __slots__ = ('pila', 'inicio', 'hijos', 'memoria', 'pico')
+
+    def __init__(self, pila, memoria):
+        self.pila = pila
+        self.inicio = time.perf_counter()
+        self.hijos = 0.0  # Tiempo de las llamadas medidas internas
+        self.memoria = memoria  # Memoria trazada al entrar
+        self.pico = 0  # Pico absoluto antes de las llamadas internas y durante ellas
+
+
+def _entrar(nombre):
+    """
+    Abre un marco de medición para la llamada actual.
+    :param nombre: Nombre de la función o sección
+    :return: Marco abierto
+    """
+    pila = getattr(_HILO, 'pila', None)
+    if pila is None:
+        pila = _HILO.pila = []
+    ruta = (pila[-1].pila if pila else ()) + (nombre,)
+    memoria = 0
+    if _MEMORIA and tracemalloc.is_tracing():
+        # El pico hasta aquí es del llamador: se guarda en su marco y se reinicia, para que
+        # la llamada nueva no cargue con asignaciones anteriores a ella
+        memoria, pico = tracemalloc.get_traced_memory()
+        if pila:
+            pila[-1].pico = max(pila[-1].pico, pico)
+        tracemalloc.reset_peak()
+    marco = _Marco(ruta, memoria)
+    pila.append(marco)
+    return marco
+
+
+def _salir(marco, acierto=False):
+    """
+    Cierra un marco y acumula sus estadísticas en su pila de llamadas.
+    :param marco: Marco abierto por _entrar
+    :param acierto: Si la llamada se resolvió desde la caché
+    """
+    segundos = time.perf_counter() - marco.inicio
+    pila = _HILO.pila
+    pila.pop()
+    asignados = 0
+    if _MEMORIA and tracemalloc.is_tracing():
+        # El pico se reinicia al entrar y al salir de cada llamada: el de la llamada es el máximo
+        # entre el suyo propio y el de sus hijos, y se propaga al padre
+        pico = max(tracemalloc.get_traced_memory()[1], marco.pico)
+        tracemalloc.reset_peak()
+        asignados = max(0, pico - marco.memoria)
+        if pila:
+            pila[-1].pico = max(pila[-1].pico, pico)
+    if pila:
+        pila[-1].hijos += segundos
+    with _CANDADO:
+        e = _ESTADISTICAS.setdefault(marco.pila, [0, 0.0, 0.0, 0, 0])
+        e[0] += 1
+        e[1] += segundos
+        e[2] += segundos - marco.hijos
+        e[3] += asignados
+        e[4] += acierto
+
+
+def _envolver(funcion, nombre):
+    """
+    Crea la envoltura medida de una función. Para los métodos memorizados de nucleo
+    (atributo __perezoso__) se detecta si la llamada fue un acierto de la caché.
+    :param funcion: Función original
+    :param nombre: Nombre con el que se registra
+    :return: Envoltura
+    """
+    cantidad = getattr(funcion, '__perezoso__', None)
+
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        acierto = False
+        if cantidad is not None:
+            entrada = args[0]._cache.get(cantidad)
+            acierto = entrada is not None and entrada[0] == args[0]._firma(cantidad)
+        marco = _entrar(nombre)
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            _salir(marco, acierto)
+
+    envoltura.__original__ = funcion
+    return envoltura
+
+
+def registrar(propietario, nombre, etiqueta=None):
+    """
+    Registra un método (o función de un módulo) para medirlo mientras la instrumentación
+    esté activa.
+    :param propietario: Clase o módulo que contiene la función
+    :param nombre: Nombre del atributo
+    :param etiqueta: Nombre en los reportes (por defecto Propietario.nombre)
+    """
+    original = getattr(propietario, nombre)
+    _REGISTRO[(propietario, nombre)] = (original, etiqueta or '%s.%s' % (propietario.__name__, nombre))
+    if _ACTIVO:
+        setattr(propietario, nombre, _envolver(*_REGISTRO[(propietario, nombre)]))
+
+
+def instrumentable(*prefijos):
+    """
+    Decorador de clase que registra sus métodos públicos, o solo los que empiezan por
+    alguno de los prefijos dados.
+    :param prefijos: Prefijos de los métodos a registrar
+    :return: Decorador de clase
+    """
+    def decorador(cls):
+        for nombre, valor in list(vars(cls).items()):
+            if inspect.isfunction(valor) and not nombre.startswith('_') \
+                    and (not prefijos or nombre.startswith(prefijos)):
+                registrar(cls, nombre)
+        return cls
+
+    return decorador
+
+
+def envolver(funcion, nombre):
+    """
+    Retorna una versión medida de una función externa (p. ej. tabulate) si la
+    instrumentación está activa, o la misma función si no lo está.
+    :param funcion: Función a medir
+    :param nombre: Nombre en los reportes
+    :return: Función
+    """
+    return _envolver(funcion, nombre) if _ACTIVO else funcion
+
+
+@contextlib.contextmanager
+def _seccion_medida(nombre):
+    """
+    Mide el bloque de código de una sección.
+    :param nombre: Nombre de la sección
+    """
+    marco = _entrar(nombre)
+    try:
+        yield
+    finally:
+        _salir(marco)
+
+
+def seccion(nombre):
+    """
+    Administrador de contexto que mide un bloque de código como si fuera una llamada.
+    :param nombre: Nombre de la sección
+    :return: Administrador de contexto
+    """
+    return _seccion_medida(nombre) if _ACTIVO else contextlib.nullcontext()
+
+
+def activar(memoria=True):
+    """
+    Activa la instrumentación: reemplaza los métodos registrados por sus envolturas.
+    :param memoria: Si se miden los bytes asignados con tracemalloc (más lento)
+    """
+    global _ACTIVO, _MEMORIA
+    _MEMORIA = memoria
+    if memoria and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if not _ACTIVO:
+        for (propietario, nombre), (original, etiqueta) in _REGISTRO.items():
+            setattr(propietario, nombre, _envolver(original, etiqueta))
+    _ACTIVO = True
+
+
+def desactivar():
+    """
+    Desactiva la instrumentación y restaura los métodos originales. Los datos se conservan.
+    """
+    global _ACTIVO
+    for (propietario, nombre), (original, _) in _REGISTRO.items():
+        setattr(propietario, nombre, original)
+    if _MEMORIA and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _ACTIVO = False
+
+
+def activo():
+    """
+    Indica si la instrumentación está activa.
+    :return: True o False
+    """
+    return _ACTIVO
+
+
+def reiniciar():
+    """
+    Borra los datos acumulados.
+    """
+    with _CANDADO:
+        _ESTADISTICAS.clear()
+
+
+def instantanea():
+    """
+    Retorna los datos acumulados: totales por función y detalle por pila de llamadas.
+    El tiempo propio excluye las llamadas medidas internas.
+    :return: Diccionario {'funciones': {...}, 'pilas': [...]}
+    """
+    with _CANDADO:
+        datos = {pila: list(e) for pila, e in _ESTADISTICAS.items()}
+    funciones, pilas = {}, []
+    for pila, (llamadas, segundos, propio, asignados, aciertos) in sorted(datos.items()):
+        pilas.append({'pila': list(pila), 'llamadas': llamadas, 'segundos': segundos, 'propio': propio,
+                      'bytes': asignados, 'aciertos_cache': aciertos})
+        f = funciones.setdefault(pila[-1], {'llamadas': 0, 'segundos': 0.0, 'propio': 0.0, 'bytes': 0,
+                                            'aciertos_cache': 0, 'llamadores': []})
+        f['llamadas'] += llamadas
+        if pila[-1] not in pila[:-1]:  # En llamadas recursivas el tiempo ya está en el marco externo
+            f['segundos'] += segundos
+        f['propio'] += propio
+        f['bytes'] += asignados
+        f['aciertos_cache'] += aciertos
+        if len(pila) > 1 and pila[-2] not in f['llamadores']:
+            f['llamadores'].append(pila[-2])
+    return {'funciones': funciones, 'pilas': pilas}
+
+
+def exportar_json(ruta):
+    """
+    Escribe la instantánea en un archivo JSON.
+    :param ruta: Ruta del archivo
+    """
+    with open(ruta, 'w') as f:
+        json.dump(instantanea(), f, indent=1)
+
+
+def exportar_pilas(ruta):
+    """
+    Escribe las pilas en formato plegado ("a;b;c microsegundos" por línea), que leen
+    flamegraph.pl, speedscope e inferno. Cada pila pesa su tiempo propio.
+    :param ruta: Ruta del archivo
+    """
+    with open(ruta, 'w') as f:
+        for p in instantanea()['pilas']:
+            f.write('%s %d\n' % (';'.join(p['pila']), round(p['propio'] * 1e6)))
+
+
+def _exportar_al_salir(ruta):
+    """
+    Exporta la instantánea en JSON y en pilas plegadas al terminar el programa.
+    :param ruta: Ruta del JSON; las pilas van al mismo nombre con extensión .folded
+    """
+    exportar_json(ruta)
+    exportar_pilas(os.path.splitext(ruta)[0] + '.folded')
+
+
+# Activación por variable de entorno para perfilar programas sin modificarlos
+if os.environ.get('ANALIZADOR_PERFIL'):
+    activar(memoria=os.environ.get('ANALIZADOR_PERFIL_MEMORIA', '1') != '0')
+    atexit.register(_exportar_al_salir, os.environ['ANALIZADOR_PERFIL'])
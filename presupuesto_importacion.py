@@ -0,0 +1,94 @@
+"""
+Este programa verifica el presupuesto de tiempo de importación del núcleo
+numérico y de los programas. Cada módulo se importa en un intérprete nuevo; el
+tiempo que agrega sobre la importación de NumPy no debe superar el presupuesto y
+no se deben cargar matplotlib, tabulate ni requests. Retorna un código de salida distinto
+de cero si algún módulo no cumple.
+
+Uso: python presupuesto_importacion.py [--presupuesto 50] [--repeticiones 5]
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import argparse  # Argumentos de la línea de comandos
+import os  # Directorio del proyecto
+import subprocess  # Intérpretes nuevos
+import sys  # Intérprete actual
+
+# Módulos que deben importarse sin dependencias pesadas
+MODULOS = ('nucleo', 'analizador', 'motor', 'fasores', 'red', 'flujo', 'fuentes', 'decimacion', 'energia', 'perfil',
+           'calidad', 'armonicos', 'resultados', 'archivo', 'frecuencia', 'lote', 'servicio', 'ingesta',
+           'trabajador', 'rendimiento')
+PROHIBIDOS = ('matplotlib', 'tabulate', 'requests')
+PRESUPUESTO = 50  # Milisegundos sobre la importación de NumPy
+# Programas que necesitan bibliotecas estándar grandes (multiprocessing, http.server, asyncio):
+# solo ellas toman de 20 a 40 ms, así que tienen un presupuesto propio
+PROPIOS = {'lote': 100, 'servicio': 100, 'ingesta': 100}
+
+_MEDICION = '''
+import sys, time
+t = time.perf_counter()
+import numpy
+t_numpy = time.perf_counter()
+import {modulo}
+t_fin = time.perf_counter()
+print(t_fin - t_numpy, ','.join(m for m in {prohibidos!r} if m in sys.modules))
+'''
+
+
+def medir(modulo, repeticiones=5):
+    """
+    Mide el tiempo de importación de un módulo, descontando la importación de NumPy.
+    :param modulo: Nombre del módulo
+    :param repeticiones: Intérpretes nuevos a lanzar (se toma el mínimo)
+    :return: Tupla (segundos, módulos prohibidos cargados)
+    """
+    codigo = _MEDICION.format(modulo=modulo, prohibidos=PROHIBIDOS)
+    directorio = os.path.dirname(os.path.abspath(__file__))
+    tiempos, cargados = [], ''
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, '-c', codigo], cwd=directorio, check=True,
+                                capture_output=True, text=True).stdout.split()
+        tiempos.append(float(salida[0]))
+        cargados = salida[1] if len(salida) > 1 else ''
+    return min(tiempos), cargados
+
+
+def presupuesto(modulo, general=PRESUPUESTO):
+    """
+    Retorna el presupuesto de un módulo: el propio si lo tiene o el general.
+    :param modulo: Nombre del módulo
+    :param general: Presupuesto general [ms]
+    :return: Milisegundos sobre la importación de NumPy
+    """
+    return PROPIOS.get(modulo, general)
+
+
+def main(argumentos=None):
+    """
+    Función principal de la línea de comandos.
+    :param argumentos: Lista de argumentos (por defecto sys.argv)
+    :return: Código de salida
+    """
+    parser = argparse.ArgumentParser(description='Presupuesto de tiempo de importación')
+    parser.add_argument('--presupuesto', type=float, default=PRESUPUESTO,
+                        help='Milisegundos sobre NumPy (salvo los programas con presupuesto propio)')
+    parser.add_argument('--repeticiones', type=int, default=5, help='Intérpretes por módulo')
+    args = parser.parse_args(argumentos)
+
+    fallas = 0
+    for modulo in MODULOS:
+        segundos, cargados = medir(modulo, args.repeticiones)
+        ok = segundos * 1000 <= presupuesto(modulo, args.presupuesto) and not cargados
+        fallas += not ok
+        print('%-12s %7.1f ms  %s%s' % (modulo, segundos * 1000, 'OK' if ok else 'FALLA',
+                                         ' (carga %s)' % cargados if cargados else ''))
+    return 1 if fallas else 0
+
+
+# Salvaguarda
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""
+Este módulo contiene el modelo de la red de distribución. La red se describe con
+una lista de líneas (nodo inicial, nodo final, impedancia) y con ella se arma la
+matriz de admitancias de barra en formato disperso. Los voltajes de los nodos no
+medidos se obtienen para todas las muestras con una sola solución por lotes.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import json  # Redes descritas en archivos
+import numpy as np  # Cálculos matemáticos
+
+
+class Red:
+    """
+    Esta es la clase Red, la cual modela una red de distribución de N nodos a partir de
+    su lista de líneas y resuelve los voltajes de los nodos que no se miden.
+    """
+
+    def __init__(self, lineas, medidos, inyeccion=None):
+        """
+        Inicializador de la clase Red.
+        :param lineas: Lista de líneas (desde, hasta, z) con los nodos numerados desde 1
+        :param medidos: Nodos con voltajes y corrientes medidos, en el orden de las señales
+        :param inyeccion: Matriz (no medidos, medidos) que da la corriente inyectada en cada
+                          nodo no medido a partir de las corrientes medidas. Por defecto los
+                          nodos no medidos no tienen carga.
+        """
+        self.lineas = tuple((int(a), int(b), complex(z)) for a, b, z in lineas)
+        self.medidos = tuple(int(n) for n in medidos)
+        nodos = {n for a, b, _ in self.lineas for n in (a, b)} | set(self.medidos)
+        self.nodos = tuple(sorted(nodos))
+        self.no_medidos = tuple(n for n in self.nodos if n not in self.medidos)
+        if inyeccion is None:
+            inyeccion = np.zeros((len(self.no_medidos), len(self.medidos)))
+        self.inyeccion = np.asarray(inyeccion)
+        self._factorizacion = None  # Se calcula una sola vez, en el primer uso
+
+    @classmethod
+    def cuatro_nodos(cls, Zl1=0.009, Zl2=0.01, Zl3=0.01 + 0.001j):
+        """
+        Construye la red de 4 nodos del analizador: los nodos 1, 2 y 3 se miden y se conectan
+        al nodo 4 por las líneas 1, 2 y 3. El nodo 4 recibe la suma de las corrientes medidas.
+        :param Zl1: Impedancia en la línea 1
+        :param Zl2: Impedancia en la línea 2
+        :param Zl3: Impedancia en la línea 3
+        :return: Red de 4 nodos
+        """
+        return cls([(1, 4, Zl1), (2, 4, Zl2), (3, 4, Zl3)], medidos=(1, 2, 3),
+                   inyeccion=np.ones((1, 3)))
+
+    @classmethod
+    def estrella(cls, n_medidos, Z=0.01):
+        """
+        Construye una red en estrella: los nodos 1..n se miden y se conectan por una línea a
+        un nodo común n + 1, que recibe la suma de las corrientes medidas. Con n = 3 es la
+        topología de la red de 4 nodos.
+        :param n_medidos: Número de nodos medidos
+        :param Z: Impedancia de las líneas (escalar o una por línea)
+        :return: Red de n_medidos + 1 nodos
+        """
+        Z = np.broadcast_to(Z, (n_medidos,))
+        return cls([(n + 1, n_medidos + 1, Z[n]) for n in range(n_medidos)],
+                   medidos=range(1, n_medidos + 1), inyeccion=np.ones((1, n_medidos)))
+
+    @classmethod
+    def desde_archivo(cls, ruta):
+        """
+        Lee una red de un archivo JSON con las líneas [desde, hasta, R, X], los nodos medidos y,
+        opcionalmente, la matriz de inyección:
+        {"lineas": [[1, 4, 0.009, 0]], "medidos": [1], "inyeccion": [[1]]}
+        :param ruta: Ruta del archivo
+        :return: Red
+        """
+        with open(ruta) as f:
+            datos = json.load(f)
+        lineas = [(a, b, complex(r, x)) for a, b, r, x in datos['lineas']]
+        return cls(lineas, datos['medidos'], datos.get('inyeccion'))
+
+    @classmethod
+    def para_nodos(cls, n_medidos):
+        """
+        Retorna la red predeterminada para n nodos medidos: la red de 4 nodos del analizador
+        con 3 nodos medidos y una red en estrella con cualquier otro número.
+        :param n_medidos: Número de nodos medidos
+        :return: Red
+        """
+        return cls.cuatro_nodos() if n_medidos == 3 else cls.estrella(n_medidos)
+
+    def admitancia(self):
+        """
+        Arma la matriz de admitancias de barra en formato disperso de coordenadas.
+        :return: Tupla (filas, columnas, valores) con índices en el orden de self.nodos
+        """
+        indice = {n: k for k, n in enumerate(self.nodos)}
+        a = np.array([indice[l[0]] for l in self.lineas], dtype=int)
+        b = np.array([indice[l[1]] for l in self.lineas], dtype=int)
+        y = 1 / np.array([l[2] for l in self.lineas], dtype=complex)
+        filas = np.concatenate([a, b, a, b])
+        columnas = np.concatenate([a, b, b, a])
+        valores = np.concatenate([y, y, -y, -y])
+        return filas, columnas, valores
+
+    def admitancia_densa(self):
+        """
+        Retorna la matriz de admitancias de barra como arreglo denso.
+        :return: Matriz (nodos, nodos)
+        """
+        filas, columnas, valores = self.admitancia()
+        Y = np.zeros((len(self.nodos), len(self.nodos)), dtype=complex)
+        np.add.at(Y, (filas, columnas), valores)
+        return Y
+
+    def factorizar(self):
+        """
+        Factoriza una sola vez la submatriz de los nodos no medidos y guarda las matrices de
+        transferencia A = -Yuu⁻¹·Yum y B = Yuu⁻¹·C, con las cuales Vu = A·Vm + B·Im.
+        :return: Tupla (A, B)
+        """
+        if self._factorizacion is None:
+            Y = self.admitancia_densa()
+            u = [self.nodos.index(n) for n in self.no_medidos]
+            m = [self.nodos.index(n) for n in self.medidos]
+            Yuu = Y[np.ix_(u, u)]
+            if np.linalg.matrix_rank(Yuu) < len(u):
+                raise ValueError('La red tiene nodos no medidos sin conexión a un nodo medido')
+            # Se resuelve contra las columnas de Yum y de C a la vez: una sola factorización
+            X = np.linalg.solve(Yuu, np.hstack([Y[np.ix_(u, m)], self.inyeccion]))
+            self._factorizacion = (-X[:, :len(m)], X[:, len(m):])
+        return self._factorizacion
+
+    def resolver(self, V, I, eje=0):
+        """
+        Calcula los voltajes y las corrientes inyectadas de los nodos no medidos para todas las
+        fases y muestras (y todos los alimentadores) en una sola operación.
+        :param V: Voltajes medidos, con los nodos medidos en el eje indicado
+        :param I: Corrientes medidas, con los nodos medidos en el eje indicado
+        :param eje: Eje de los nodos (p. ej. -3 para (alimentadores, nodos, fases, muestras))
+        :return: Tupla (Vu, Iu) con los no medidos en el mismo eje, en complex64 si V e I son de
+                 precisión simple
+        """
+        A, B = self.factorizar()
+        C = self.inyeccion
+        if np.result_type(V, I) in (np.float32, np.complex64):  # Precisión simple: no se promueve
+            A, B = A.astype(np.complex64), B.astype(np.complex64)
+            C = C.astype(np.complex64 if np.iscomplexobj(C) else np.float32)
+        V, I = np.moveaxis(V, eje, 0), np.moveaxis(I, eje, 0)  # Vistas, sin copias
+        Iu = np.tensordot(C, I, axes=1)
+        Vu = np.tensordot(A, V, axes=1) + np.tensordot(B, I, axes=1)
+        return np.moveaxis(Vu, 0, eje), np.moveaxis(Iu, 0, eje)
+
+    def cuadrados(self, G):
+        """
+        Calcula Σ|Vu|² y Σ|Iu|² de los nodos no medidos a partir de la matriz de Gram de las
+        señales medidas (motor.gram), sin calcular sus muestras: Σ|w·z|² = Re(w·G·wᴴ).
+        :param G: Matriz de Gram (..., fases, 2·medidos, 2·medidos)
+        :return: Tupla (Σ|Vu|², Σ|Iu|²) con forma (..., no medidos, fases)
+        """
+        A, B = self.factorizar()
+        C = self.inyeccion
+        Wv = np.hstack([A, B])  # Vu = A·Vm + B·Im
+        Wi = np.hstack([np.zeros(C.shape, dtype=C.dtype), C])  # Iu = C·Im
+        return tuple(np.einsum('ua,...fab,ub->...uf', W, G, W.conj()).real for W in (Wv, Wi))
@@ -0,0 +1,230 @@
+"""
+Este programa mide el rendimiento de los métodos del Analizador sobre señales
+sintéticas deterministas (fuentes.sintetizar) de distintos tamaños y números de
+nodos. Para cada caso registra el tiempo (mínimo de varias repeticiones, con la
+caché del analizador vacía) y la memoria pico (tracemalloc). Los resultados se
+guardan como línea base JSON y se pueden comparar con una línea base anterior;
+en ese caso el código de salida es distinto de cero si hay regresiones.
+
+Uso: python rendimiento.py --guardar base.json
+     python rendimiento.py --comparar base.json --muestras 1000 100000 --nodos 3
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import argparse  # Argumentos de la línea de comandos
+import json  # Líneas base
+import os  # Rutas
+import platform  # Descripción del equipo
+import sys  # Intérprete y código de salida
+import time  # Medición del tiempo
+import tracemalloc  # Medición de la memoria pico
+import numpy as np  # Cálculos matemáticos
+from analizador import Analizador  # Métodos a medir
+from fuentes import CACHE, sintetizar  # Señales sintéticas
+from red import Red  # Red en estrella para cualquier número de nodos
+
+# Métodos medidos: nombre -> función que recibe el analizador
+METODOS = {
+    'v_rms': lambda a: a.v_rms(),
+    'i_rms': lambda a: a.i_rms(),
+    'pot_activa': lambda a: a.pot_activa(),
+    'pot_reactiva': lambda a: a.pot_reactiva(),
+    'pot_aparente': lambda a: a.pot_aparente(),
+    'factor_potencia': lambda a: a.factor_potencia(),
+    'tabla_rms': lambda a: a.tabla_rms(),
+    'impedancias': lambda a: a.impedancias(),
+    'tabla_potencias': lambda a: a.tabla_potencias(),
+    'armonicos': lambda a: a.armonicos(),
+    'voltajes_fasorial': lambda a: _pyplot().close(a.diagrama_fasorial('V')),
+    'corrientes_fasorial': lambda a: _pyplot().close(a.diagrama_fasorial('I')),
+}
+MUESTRAS = (1000, 10000, 100000, 1000000, 10000000, 100000000)
+NODOS = (3, 16, 64)
+
+
+def _pyplot():
+    """
+    Importa matplotlib.pyplot con un backend sin ventanas.
+    :return: Módulo matplotlib.pyplot
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def captura(n_muestras, n_nodos, directorio):
+    """
+    Retorna las señales sintéticas de un caso. Se escriben una sola vez en un .npy del
+    directorio y después se leen mapeadas en memoria.
+    :param n_muestras: Muestras por canal
+    :param n_nodos: Número de nodos
+    :param directorio: Directorio de las capturas sintéticas
+    :return: Tupla (V, I)
+    """
+    ruta = os.path.join(directorio, 'sintetica_%d_%d.npy' % (n_muestras, n_nodos))
+    if os.path.exists(ruta):
+        X = np.load(ruta, mmap_mode='r')
+        return X[0], X[1]
+    os.makedirs(directorio, exist_ok=True)
+    return sintetizar(n_muestras, n_nodos, ruta=ruta)
+
+
+def medir(funcion, V, I, red, repeticiones=3):
+    """
+    Mide un método con un analizador nuevo en cada repetición (caché vacía), después de una
+    ejecución sin medir que paga las importaciones perezosas (pyplot, tabulate).
+    :param funcion: Función que recibe el analizador
+    :param V: Voltajes
+    :param I: Corrientes
+    :param red: Red de los nodos medidos
+    :param repeticiones: Repeticiones para el tiempo (se toma el mínimo)
+    :return: Diccionario con 'segundos' y 'pico_MB'
+    """
+    funcion(Analizador(V, I, red=red))  # Calentamiento
+    tiempos = []
+    for _ in range(repeticiones):
+        analizador = Analizador(V, I, red=red)
+        inicio = time.perf_counter()
+        funcion(analizador)
+        tiempos.append(time.perf_counter() - inicio)
+    analizador = Analizador(V, I, red=red)
+    tracemalloc.start()  # La memoria se mide aparte porque tracemalloc hace lento el cálculo
+    try:
+        funcion(analizador)
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'segundos': min(tiempos), 'pico_MB': pico / 2 ** 20}
+
+
+def ejecutar(muestras, nodos, metodos, directorio, repeticiones=3, max_gb=4.0):
+    """
+    Ejecuta todos los casos del barrido.
+    :param muestras: Tamaños de las capturas (muestras por canal)
+    :param nodos: Números de nodos
+    :param metodos: Nombres de los métodos a medir
+    :param directorio: Directorio de las capturas sintéticas
+    :param repeticiones: Repeticiones por medición
+    :param max_gb: Tamaño máximo de una captura; los casos mayores se omiten
+    :return: Diccionario caso -> método -> medición
+    """
+    resultados = {}
+    for n_nodos in nodos:
+        red = Red.estrella(n_nodos)
+        for n in muestras:
+            caso = 'n=%d,nodos=%d' % (n, n_nodos)
+            if 2 * n_nodos * 3 * n * 8 > max_gb * 2 ** 30:
+                print('%-24s omitido (más de %g GB, ver --max-gb)' % (caso, max_gb), file=sys.stderr)
+                continue
+            V, I = captura(n, n_nodos, directorio)
+            resultados[caso] = {}
+            for nombre in metodos:
+                try:
+                    medicion = medir(METODOS[nombre], V, I, red, repeticiones)
+                except Exception as error:  # Un método que falla no detiene el barrido
+                    medicion = {'error': str(error)}
+                resultados[caso][nombre] = medicion
+                print('%-24s %-20s %s' % (caso, nombre, formato(medicion)), file=sys.stderr)
+    return resultados
+
+
+def formato(medicion):
+    """
+    Formatea una medición para la consola.
+    :param medicion: Diccionario con 'segundos' y 'pico_MB', o con 'error'
+    :return: Cadena
+    """
+    if 'error' in medicion:
+        return 'ERROR: ' + medicion['error']
+    return '%10.4f s %10.2f MB' % (medicion['segundos'], medicion['pico_MB'])
+
+
+def comparar(base, actual, tolerancia_tiempo=0.2, tolerancia_memoria=0.1, minimo=0.005):
+    """
+    Compara dos barridos y lista las regresiones.
+    :param base: Resultados de la línea base
+    :param actual: Resultados actuales
+    :param tolerancia_tiempo: Aumento relativo de tiempo permitido
+    :param tolerancia_memoria: Aumento relativo de memoria pico permitido
+    :param minimo: Tiempo [s] por debajo del cual no se comparan tiempos (ruido de medición)
+    :return: Lista de cadenas, una por regresión
+    """
+    regresiones = []
+    for caso, metodos in actual.items():
+        for nombre, nuevo in metodos.items():
+            anterior = base.get(caso, {}).get(nombre)
+            if anterior is None or 'error' in anterior:
+                continue
+            if 'error' in nuevo:
+                regresiones.append('%s %s: ahora falla (%s)' % (caso, nombre, nuevo['error']))
+                continue
+            if max(nuevo['segundos'], anterior['segundos']) >= minimo \
+                    and nuevo['segundos'] > anterior['segundos'] * (1 + tolerancia_tiempo):
+                regresiones.append('%s %s: tiempo %.4f s -> %.4f s (%+.0f %%)'
+                                   % (caso, nombre, anterior['segundos'], nuevo['segundos'],
+                                      100 * (nuevo['segundos'] / anterior['segundos'] - 1)))
+            if nuevo['pico_MB'] > anterior['pico_MB'] * (1 + tolerancia_memoria) + 0.01:
+                regresiones.append('%s %s: memoria %.2f MB -> %.2f MB'
+                                   % (caso, nombre, anterior['pico_MB'], nuevo['pico_MB']))
+    return regresiones
+
+
+def entorno():
+    """
+    Describe el equipo y las versiones, para saber si dos líneas base son comparables.
+    :return: Diccionario
+    """
+    return {'python': platform.python_version(), 'numpy': np.__version__,
+            'plataforma': platform.platform(), 'procesador': platform.processor() or platform.machine(),
+            'nucleos': os.cpu_count()}
+
+
+def main(argumentos=None):
+    """
+    Función principal de la línea de comandos.
+    :param argumentos: Lista de argumentos (por defecto sys.argv)
+    :return: Código de salida
+    """
+    parser = argparse.ArgumentParser(description='Rendimiento de los métodos del Analizador')
+    parser.add_argument('--muestras', type=int, nargs='+', default=MUESTRAS, help='Muestras por canal')
+    parser.add_argument('--nodos', type=int, nargs='+', default=NODOS, help='Números de nodos')
+    parser.add_argument('--metodos', nargs='+', default=list(METODOS), choices=list(METODOS),
+                        help='Métodos a medir')
+    parser.add_argument('--repeticiones', type=int, default=3, help='Repeticiones por medición')
+    parser.add_argument('--max-gb', type=float, default=4.0, help='Tamaño máximo de una captura')
+    parser.add_argument('--directorio', default=os.path.join(CACHE, 'rendimiento'),
+                        help='Directorio de las capturas sintéticas')
+    parser.add_argument('--guardar', help='Archivo JSON donde se guarda la línea base')
+    parser.add_argument('--comparar', help='Línea base JSON con la que se comparan los resultados')
+    parser.add_argument('--tolerancia', type=float, default=0.2, help='Aumento de tiempo permitido')
+    parser.add_argument('--tolerancia-memoria', type=float, default=0.1, help='Aumento de memoria permitido')
+    parser.add_argument('--minimo', type=float, default=0.005, help='Tiempo [s] bajo el cual no se compara')
+    args = parser.parse_args(argumentos)
+
+    resultados = ejecutar(args.muestras, args.nodos, args.metodos, args.directorio, args.repeticiones,
+                          args.max_gb)
+    if args.guardar:
+        with open(args.guardar, 'w') as f:
+            json.dump({'entorno': entorno(), 'resultados': resultados}, f, indent=1)
+    if args.comparar:
+        with open(args.comparar) as f:
+            base = json.load(f)
+        if base.get('entorno') != entorno():
+            print('Aviso: la línea base se tomó en otro entorno', file=sys.stderr)
+        regresiones = comparar(base['resultados'], resultados, args.tolerancia, args.tolerancia_memoria,
+                              args.minimo)
+        for regresion in regresiones:
+            print('REGRESIÓN ' + regresion)
+        print('%d regresiones' % len(regresiones))
+        return 1 if regresiones else 0
+    return 0
+
+
+# Salvaguarda
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""
+Este módulo contiene el contenedor de resultados del analizador de línea. Las
+métricas de un análisis se guardan una sola vez en arreglos contiguos indexados
+por nodo y fase, y todas las presentaciones salen de ellos sin volver a
+calcular nada: las tablas de texto de la interfaz, CSV, JSON y Arrow/Parquet.
+Las exportaciones trabajan por columnas completas, no fila por fila. Con varios
+alimentadores los arreglos tienen ejes iniciales adicionales.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import csv  # Exportación a CSV
+import functools  # Tablas por alimentador
+import json  # Exportación a JSON
+import numpy as np  # Cálculos matemáticos
+import perfil  # Instrumentación (sin costo si está desactivada)
+
+# Columnas de las exportaciones: una fila por archivo, nodo y fase (y alimentador, si hay varios)
+COLUMNAS = ['archivo', 'nodo', 'fase', 'v_rms', 'i_rms', 'P', 'Q', 'S', 'PF', 'Z', 'Z_angulo']
+_ARREGLOS = ('v_rms', 'i_rms', 'P', 'Q', 'S', 'PF', 'Z', 'v_rms_nodo', 'i_rms_nodo', 'P_nodo', 'Q_nodo',
+             'S_nodo', 'PF_nodo', 'Vu_rms', 'Iu_rms')
+
+
+def _tabulate():
+    """
+    Importa tabulate en el primer uso, para no cargarlo cuando solo se necesitan los números.
+    :return: Función tabulate
+    """
+    from tabulate import tabulate  # Crear tablas
+    return perfil.envolver(tabulate, 'tabulate')
+
+
+def etiquetas_fases(n_fases):
+    """
+    Retorna los nombres de las fases: A, B, C y, si hay más, su número.
+    :param n_fases: Número de fases
+    :return: Lista de cadenas
+    """
+    return ['ABC'[k] if k < 3 else str(k + 1) for k in range(n_fases)]
+
+
+def _por_alimentador(tabla):
+    """
+    Decorador de las tablas de texto: con varios alimentadores se crea una tabla por
+    alimentador, cada una con su título.
+    :param tabla: Método que crea la tabla de un solo alimentador
+    :return: Método para cualquier número de alimentadores
+    """
+    @functools.wraps(tabla)
+    def envoltura(self):
+        if not self.alimentadores:
+            return tabla(self)
+        return '\n\n'.join('Alimentador %s\n%s' % ('.'.join(str(j + 1) for j in indice),
+                                                    tabla(self.alimentador(indice)))
+                            for indice in np.ndindex(*self.alimentadores))
+
+    return envoltura
+
+
+class Resultados:
+    """
+    Esta es la clase Resultados, la cual guarda las métricas de un análisis en arreglos
+    contiguos con forma (..., nodos, fases) o (..., nodos) y las presenta como tablas o
+    exportaciones. Los ejes iniciales, si los hay, son alimentadores.
+    """
+    __slots__ = ('archivo',) + _ARREGLOS
+
+    def __init__(self, metricas, Z, Vu_rms=None, Iu_rms=None, archivo=''):
+        """
+        Inicializador de la clase Resultados.
+        :param metricas: Diccionario de motor.desde_sumas (por fase y por nodo)
+        :param Z: Impedancias complejas de carga (..., nodos, fases)
+        :param Vu_rms: Voltajes RMS de los nodos no medidos (..., no medidos, fases) o None
+        :param Iu_rms: Corrientes RMS de los nodos no medidos (..., no medidos, fases) o None
+        :param archivo: Nombre de la captura analizada
+        """
+        self.archivo = archivo
+        for nombre in ('v_rms', 'i_rms', 'P', 'Q', 'S', 'PF', 'v_rms_nodo', 'i_rms_nodo', 'P_nodo', 'Q_nodo',
+                       'S_nodo', 'PF_nodo'):
+            setattr(self, nombre, np.ascontiguousarray(metricas[nombre], dtype=float))
+        self.Z = np.ascontiguousarray(Z, dtype=complex)
+        self.Vu_rms = None if Vu_rms is None else np.ascontiguousarray(Vu_rms, dtype=float)
+        self.Iu_rms = None if Iu_rms is None else np.ascontiguousarray(Iu_rms, dtype=float)
+
+    @classmethod
+    def desde_analizador(cls, analizador, archivo='', no_medidos=True):
+        """
+        Reúne los resultados de un analizador. Las cantidades ya calculadas salen de su caché.
+        :param analizador: AnalizadorNumerico
+        :param archivo: Nombre de la captura analizada
+        :param no_medidos: Si se incluyen los valores RMS de los nodos no medidos (resuelve la red)
+        :return: Resultados
+        """
+        Vu_rms, Iu_rms = analizador.rms_no_medidos() if no_medidos else (None, None)
+        return cls(analizador.metricas(), analizador.impedancias_complejas(), Vu_rms, Iu_rms, archivo)
+
+    @property
+    def alimentadores(self):
+        """
+        Forma de los ejes de alimentadores (tupla vacía si hay un solo alimentador).
+        """
+        return self.P.shape[:-2]
+
+    def alimentador(self, indice):
+        """
+        Retorna los resultados de un alimentador, como vistas de los arreglos (sin copias).
+        :param indice: Índice del alimentador (entero o tupla)
+        :return: Resultados
+        """
+        r = Resultados.__new__(Resultados)
+        r.archivo = self.archivo
+        for nombre in _ARREGLOS:
+            x = getattr(self, nombre)
+            setattr(r, nombre, None if x is None else x[indice])
+        return r
+
+    # ---------------------- Exportaciones por columnas ----------------------
+    def columnas(self):
+        """
+        Retorna las columnas de la tabla por nodo y fase (COLUMNAS). Las columnas numéricas son
+        vistas planas de los arreglos, sin copias.
+        :return: Diccionario nombre -> arreglo con alimentadores·nodos·fases elementos; con varios
+                 alimentadores la primera columna es 'alimentador'
+        """
+        n_nodos, n_fases = self.P.shape[-2:]
+        K = int(np.prod(self.alimentadores))
+        columnas = {'alimentador': np.repeat(np.arange(1, K + 1), n_nodos * n_fases)} if self.alimentadores else {}
+        columnas.update({
+            'archivo': np.full(K * n_nodos * n_fases, self.archivo, dtype=object),
+            'nodo': np.tile(np.repeat(np.arange(1, n_nodos + 1), n_fases), K),
+            'fase': np.tile(np.array(etiquetas_fases(n_fases), dtype=object), K * n_nodos),
+            'v_rms': self.v_rms.ravel(), 'i_rms': self.i_rms.ravel(), 'P': self.P.ravel(),
+            'Q': self.Q.ravel(), 'S': self.S.ravel(), 'PF': self.PF.ravel(),
+            'Z': np.abs(self.Z).ravel(), 'Z_angulo': np.angle(self.Z, deg=True).ravel()})
+        return columnas
+
+    def exportar(self, ruta):
+        """
+        Escribe la tabla por nodo y fase en el formato que indica la extensión de la ruta.
+        :param ruta: Ruta .csv, .json, .parquet o .arrow
+        """
+        escribir(self.columnas(), ruta)
+
+    # ---------------------------- Tablas de texto ----------------------------
+    @_por_alimentador
+    def tabla_rms(self):
+        """
+        Retorna la tabla con los valores RMS de fase de tensiones y corrientes de cada nodo,
+        incluidos los no medidos.
+        :return: Tabla con verdaderos valores RMS
+        """
+        v = self.v_rms / np.sqrt(3)  # Valores RMS de fase (nodos, fases)
+        i = self.i_rms / np.sqrt(3)
+        Vu = self.Vu_rms if self.Vu_rms is not None else np.empty((0,) + v.shape[1:])
+        Iu = self.Iu_rms if self.Iu_rms is not None else np.empty((0,) + i.shape[1:])
+        fases = etiquetas_fases(v.shape[1])
+        filas = [['V' + f.lower() + ' [V]', *v[:, k], *Vu[:, k]] for k, f in enumerate(fases)]
+        filas += [['I' + f.lower() + ' [A]', *i[:, k], *Iu[:, k]] for k, f in enumerate(fases)]
+        tabulate = _tabulate()
+        return tabulate(filas, headers=["Fase"] + ["Nodo %d" % (n + 1) for n in range(len(v) + len(Vu))],
+                        tablefmt="fancy_outline")
+
+    @_por_alimentador
+    def tabla_rms_nodo(self):
+        """
+        Retorna la tabla con los valores RMS de voltaje y corriente por nodo.
+        :return: Tabla con los valores RMS por nodo
+        """
+        v, i = np.round(self.v_rms_nodo, 4), np.round(self.i_rms_nodo, 4)
+        tabulate = _tabulate()
+        return tabulate([[str(n + 1), v[n], i[n]] for n in range(len(v))],
+                        headers=["Nodo ", "Voltajes [V]", "Corrientes [A]"], tablefmt="fancy_outline")
+
+    @_por_alimentador
+    def tabla_impedancias(self):
+        """
+        Retorna la tabla de impedancias de carga en forma polar.
+        :return: Tabla con las impedancias
+        """
+        mag, ang = abs(self.Z), np.angle(self.Z, deg=True)
+        filas = [[f] + [str(np.round(mag[n, k], 3)) + '<' + str(np.round(ang[n, k], 3)) + '°'
+                        for n in range(len(self.Z))] for k, f in enumerate(etiquetas_fases(self.Z.shape[1]))]
+        tabulate = _tabulate()
+        return tabulate(filas, headers=["Fase"] + ["Nodo %d [Ω]" % (n + 1) for n in range(len(self.Z))],
+                        tablefmt="fancy_outline")
+
+    @_por_alimentador
+    def tabla_potencias(self):
+        """
+        Retorna la tabla de potencias activa, reactiva y aparente y el factor de potencia de
+        cada nodo, con los totales del sistema. P, el factor de potencia y sus totales llevan
+        signo (negativos con flujo inverso).
+        :return: Tabla de potencias
+        """
+        P = np.round(self.P_nodo, 4)  # Potencias activas (negativas si el flujo se invierte)
+        Q = np.round(self.Q_nodo, 4)  # Potencias reactivas
+        S = np.round(self.S_nodo, 4)  # Potencias aparentes
+        PF = np.round(self.PF_nodo, 4)  # Factores de potencia
+        Pt, Qt, St = P.sum(), Q.sum(), S.sum()  # Totales del sistema
+        PFt = np.round(Pt / St, 3)  # Factor de potencia del sistema
+        tabulate = _tabulate()
+        return tabulate([
+            ['P [W]', *P, Pt],
+            ['Q [VAr]', *Q, Qt],
+            ['S [VA]', *S, St],
+            ['cos(ϴ)', *PF, PFt]],
+            headers=["Potencia"] + ["Nodo %d " % (n + 1) for n in range(len(P))] + ["Total "],
+            tablefmt="fancy_outline")
+
+
+def concatenar(resultados):
+    """
+    Une las columnas de varios resultados (por ejemplo, de un lote de capturas).
+    :param resultados: Lista de Resultados
+    :return: Diccionario nombre -> arreglo con las columnas de Resultados.columnas
+    """
+    partes = [r.columnas() for r in resultados]
+    if not partes:
+        return {c: np.empty(0, dtype=object if c in ('archivo', 'fase') else float) for c in COLUMNAS}
+    if any('alimentador' in p for p in partes):  # Los resultados sin alimentadores son el alimentador 1
+        partes = [p if 'alimentador' in p else dict(alimentador=np.ones(len(p['nodo']), dtype=int), **p)
+                  for p in partes]
+    return {c: np.concatenate([p[c] for p in partes]) for c in partes[0]}
+
+
+def escribir(columnas, ruta):
+    """
+    Escribe columnas en CSV, JSON (un objeto con una lista por columna), Parquet o Arrow
+    (IPC/Feather), según la extensión de la ruta.
+    :param columnas: Diccionario nombre -> arreglo, todas de la misma longitud
+    :param ruta: Ruta del archivo de salida
+    """
+    if ruta.endswith(('.parquet', '.arrow', '.feather')):
+        import pyarrow as pa  # Dependencia opcional, solo para Parquet y Arrow
+        tabla = pa.table({c: (x.tolist() if x.dtype == object else x) for c, x in columnas.items()})
+        if ruta.endswith('.parquet'):
+            import pyarrow.parquet as pq
+            pq.write_table(tabla, ruta)
+        else:
+            import pyarrow.feather as feather
+            feather.write_feather(tabla, ruta)
+    elif ruta.endswith('.json'):
+        with open(ruta, 'w') as f:
+            json.dump({c: x.tolist() for c, x in columnas.items()}, f)
+    else:
+        with open(ruta, 'w', newline='') as f:
+            escritor = csv.writer(f)
+            escritor.writerow(list(columnas))
+            escritor.writerows(zip(*(x.tolist() for x in columnas.values())))
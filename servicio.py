@@ -0,0 +1,587 @@
+"""
+Este programa es un servicio HTTP/JSON local del analizador de línea. Mantiene
+procesos de trabajo calientes, con NumPy, el núcleo numérico, tabulate y
+matplotlib ya importados, así que cada solicitud solo paga el análisis. Acepta
+rutas de capturas o capturas subidas (.npy/.npz) y retorna las métricas por
+nodo y fase, las tablas de texto y los diagramas fasoriales en PNG.
+
+Las solicitudes entran a una cola acotada: si está llena, el servicio responde
+503 de inmediato en lugar de acumular trabajo. Las capturas subidas grandes solo
+se leen si la cola tiene lugar y hay menos de --subidas en memoria; si no, se
+responde 503 sin leer el cuerpo. Un despachador agrupa las
+solicitudes que llegan juntas en lotes y envía cada lote a un proceso en una
+sola tarea. Cada proceso guarda en caché los analizadores de las últimas
+capturas, de modo que pedir las métricas y luego los diagramas de una misma
+captura no la vuelve a analizar.
+
+Rutas:
+    GET  /salud                      estado de la cola y de los procesos
+    GET  /latencias                  histograma de latencias por ruta
+    POST /analizar                   JSON {"ruta", "fs", "f", "seguimiento", "tablas"} o una lista;
+                                     o una captura en el cuerpo (parámetros en la URL)
+    GET|POST /fasorial?tipo=V|I      diagrama fasorial en PNG (captura por ruta o en el cuerpo)
+
+Uso: python servicio.py --puerto 8750 --trabajadores 4 --cola 64
+     curl -d '{"ruta": "capturas/c1.npy", "tablas": true}' localhost:8750/analizar
+     curl --data-binary @c1.npz 'localhost:8750/fasorial?tipo=I' -o fasorial.png
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import argparse  # Argumentos de la línea de comandos
+import functools  # Caché de analizadores en los procesos
+import io  # Capturas subidas y PNG en memoria
+import json  # Solicitudes y respuestas
+import os  # Número de núcleos y fechas de modificación
+import queue  # Cola acotada de solicitudes
+import sys  # Mensajes del servidor
+import threading  # Despachador de lotes y estadísticas
+import time  # Latencias
+from concurrent.futures import Future, ProcessPoolExecutor, wait  # Procesos de trabajo calientes
+from concurrent.futures.process import BrokenProcessPool  # Procesos que terminaron inesperadamente
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # Servidor HTTP
+from urllib.parse import parse_qs, urlsplit  # Parámetros de la URL
+import numpy as np  # Cálculos matemáticos
+
+# Límites superiores de las cubetas del histograma de latencias [s]: de 0.5 ms a 32 s
+LIMITES = 0.0005 * 2.0 ** np.arange(17)
+MAXIMO_CUERPO = 256 << 20  # Tamaño máximo de una captura subida [bytes]
+CUERPO_PEQUENO = 64 << 10  # Cuerpos que se leen sin reservar una subida (JSON con rutas) [bytes]
+
+
+# ------------------------- Procesos de trabajo -------------------------
+def _preparar():
+    """
+    Inicializador de los procesos de trabajo: importa una sola vez todo lo que usan las
+    solicitudes, para que la primera no pague las importaciones.
+    """
+    import matplotlib
+    matplotlib.use('Agg')  # Sin interfaz gráfica
+    import matplotlib.figure  # noqa: F401
+    import tabulate  # noqa: F401
+    import analizador  # noqa: F401
+
+
+def _crear(V, I, fs, f, seguimiento):
+    """
+    Crea el analizador de una captura, con seguimiento de frecuencia si se pide.
+    :param V: Voltajes
+    :param I: Corrientes
+    :param fs: Frecuencia de muestreo [Hz]
+    :param f: Frecuencia del sistema [Hz]
+    :param seguimiento: Si se sigue la frecuencia y se remuestrea a ciclos enteros
+    :return: Analizador
+    """
+    from analizador import Analizador
+    if seguimiento:
+        return Analizador.con_seguimiento(V, I, fs=fs, f=f)
+    return Analizador(V, I, fs=fs, f=f)
+
+
+@functools.lru_cache(maxsize=8)
+def _analizador_ruta(ruta, modificado, fs, f, seguimiento):
+    """
+    Crea el analizador de una captura en disco. La fecha de modificación forma parte de la
+    clave de la caché, así que una captura reescrita se vuelve a analizar.
+    :param ruta: Ruta de la captura
+    :param modificado: Fecha de modificación de la captura
+    :param fs: Frecuencia de muestreo [Hz]
+    :param f: Frecuencia del sistema [Hz]
+    :param seguimiento: Si se sigue la frecuencia y se remuestrea a ciclos enteros
+    :return: Analizador
+    """
+    from fuentes import leer_captura
+    return _crear(*leer_captura(ruta), fs, f, seguimiento)
+
+
+def _leer_bytes(datos):
+    """
+    Lee una captura subida: .npz con los arreglos 'V' e 'I' o .npy con forma
+    (2, ..., nodos, fases, muestras).
+    :param datos: Contenido del archivo
+    :return: Tupla (V, I)
+    """
+    X = np.load(io.BytesIO(datos))
+    if isinstance(X, np.lib.npyio.NpzFile):
+        with X:
+            return X['V'], X['I']
+    return X[0], X[1]
+
+
+def _analizador(trabajo):
+    """
+    Retorna el analizador de la captura de un trabajo, por ruta o subida.
+    :param trabajo: Diccionario del trabajo
+    :return: Analizador
+    """
+    fs, f = float(trabajo.get('fs', 6000)), float(trabajo.get('f', 60))
+    seguimiento = str(trabajo.get('seguimiento', '')).lower() in ('1', 'true', 'si', 'sí')
+    if trabajo.get('datos') is not None:
+        return _crear(*_leer_bytes(trabajo['datos']), fs, f, seguimiento)
+    ruta = os.path.abspath(trabajo['ruta'])
+    return _analizador_ruta(ruta, os.path.getmtime(ruta), fs, f, seguimiento)
+
+
+def _ejecutar(trabajo):
+    """
+    Atiende un trabajo en un proceso de trabajo.
+    :param trabajo: Diccionario con 'accion' ('metricas' o 'fasorial'), la captura ('ruta' o
+                    'datos') y sus parámetros
+    :return: Diccionario JSON para 'metricas' o bytes PNG para 'fasorial'
+    """
+    a = _analizador(trabajo)
+    if trabajo['accion'] == 'fasorial':
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=(6.5, 6.5), dpi=80)
+        a.diagrama_fasorial(trabajo.get('tipo', 'V'), fig=fig, alimentador=int(trabajo.get('alimentador', 0)))
+        png = io.BytesIO()
+        fig.savefig(png, format='png')
+        return png.getvalue()
+    r = a.resultados()
+    respuesta = {'archivo': trabajo.get('ruta', ''),
+                 'columnas': {c: x.tolist() for c, x in r.columnas().items() if c != 'archivo'}}
+    if trabajo.get('tablas'):
+        respuesta['tablas'] = {'rms': r.tabla_rms(), 'potencias': r.tabla_potencias(),
+                               'impedancias': r.tabla_impedancias()}
+    return respuesta
+
+
+def _atender(trabajos):
+    """
+    Atiende un lote de trabajos en un proceso de trabajo. Un trabajo con error no detiene
+    a los demás del lote.
+    :param trabajos: Lista de diccionarios de trabajo
+    :return: Lista de tuplas (correcto, resultado o mensaje de error)
+    """
+    respuestas = []
+    for trabajo in trabajos:
+        try:
+            respuestas.append((True, _ejecutar(trabajo)))
+        except Exception as error:
+            respuestas.append((False, '%s: %s' % (type(error).__name__, error)))
+    return respuestas
+
+
+def _nada():
+    """
+    Tarea vacía para iniciar los procesos de trabajo.
+    """
+
+
+# ------------------------------- Servicio -------------------------------
+class ErrorTrabajo(Exception):
+    """
+    Error de un trabajo en el proceso de trabajo (captura inválida, ruta inexistente...).
+    """
+
+
+class Histograma:
+    """
+    Esta es la clase Histograma, la cual cuenta latencias en cubetas de ancho creciente
+    (LIMITES) por ruta, con memoria constante.
+    """
+
+    def __init__(self):
+        """
+        Inicializador de la clase Histograma.
+        """
+        self._conteos = {}
+        self._sumas = {}
+        self._candado = threading.Lock()
+
+    def registrar(self, ruta, segundos):
+        """
+        Registra la latencia de una solicitud.
+        :param ruta: Ruta de la solicitud
+        :param segundos: Latencia [s]
+        """
+        k = np.searchsorted(LIMITES, segundos)  # La última cubeta cuenta lo que supera LIMITES
+        with self._candado:
+            if ruta not in self._conteos:
+                self._conteos[ruta] = np.zeros(len(LIMITES) + 1, dtype=np.int64)
+                self._sumas[ruta] = 0.0
+            self._conteos[ruta][k] += 1
+            self._sumas[ruta] += segundos
+
+    def resumen(self):
+        """
+        Resume los histogramas. Los percentiles son el límite superior de la cubeta donde caen.
+        :return: Diccionario ruta -> {'limites_s', 'conteos', 'n', 'media_s', 'p50_s', 'p90_s', 'p99_s'}
+        """
+        with self._candado:
+            conteos = {ruta: c.copy() for ruta, c in self._conteos.items()}
+            sumas = dict(self._sumas)
+        limites = np.append(LIMITES, np.inf)
+        resumen = {}
+        for ruta, c in conteos.items():
+            n = int(c.sum())
+            acumulado = np.cumsum(c)
+            resumen[ruta] = {'limites_s': LIMITES.tolist(), 'conteos': c.tolist(), 'n': n,
+                             'media_s': sumas[ruta] / n}
+            for p in (50, 90, 99):
+                limite = limites[np.searchsorted(acumulado, p / 100 * n)]
+                resumen[ruta]['p%d_s' % p] = None if np.isinf(limite) else float(limite)
+        return resumen
+
+
+class Servicio:
+    """
+    Esta es la clase Servicio, la cual reparte los trabajos entre procesos calientes. Los
+    trabajos esperan en una cola acotada y un despachador los envía en lotes, con a lo sumo
+    un lote en curso por proceso.
+    """
+
+    def __init__(self, trabajadores=None, cola=64, lote=16, espera=0.002, limite=60.0, subidas=4):
+        """
+        Inicializador de la clase Servicio.
+        :param trabajadores: Número de procesos (por defecto todos los núcleos)
+        :param cola: Trabajos en espera como máximo; los que no caben se rechazan
+        :param lote: Trabajos por lote como máximo
+        :param espera: Tiempo máximo que el despachador espera para completar un lote [s]
+        :param limite: Tiempo máximo de respuesta de una solicitud [s]; después se responde 504
+        :param subidas: Capturas subidas grandes en memoria como máximo (cada una hasta MAXIMO_CUERPO)
+        """
+        self.trabajadores = trabajadores or os.cpu_count()
+        self.capacidad = cola
+        self.lote = lote
+        self.espera = espera
+        self.limite = limite
+        self.subidas = subidas
+        self.latencias = Histograma()
+        self.rechazados = 0
+        self.reinicios = 0
+        self._cola = queue.Queue(maxsize=cola)
+        self._libres = threading.Semaphore(self.trabajadores)  # Un lote en curso por proceso
+        self._subidas = threading.Semaphore(subidas)
+        self._pool = None
+        self._despachador = None
+
+    def iniciar(self):
+        """
+        Inicia los procesos de trabajo, espera a que terminen de importar y arranca el despachador.
+        """
+        self._pool = ProcessPoolExecutor(self.trabajadores, initializer=_preparar)
+        for tarea in [self._pool.submit(_nada) for _ in range(self.trabajadores)]:
+            tarea.result()
+        self._despachador = threading.Thread(target=self._despachar, daemon=True)
+        self._despachador.start()
+
+    def cerrar(self):
+        """
+        Detiene el despachador después de los trabajos en espera y cierra los procesos.
+        """
+        if self._despachador is not None:
+            self._cola.put(None)
+            self._despachador.join()
+        if self._pool is not None:
+            self._pool.shutdown()
+
+    def enviar(self, trabajos):
+        """
+        Pone trabajos en la cola. Si no caben todos, no se pone ninguno.
+        :param trabajos: Lista de diccionarios de trabajo
+        :return: Lista de Future con el resultado de cada trabajo, o None si la cola está llena
+        """
+        futuros = []
+        for trabajo in trabajos:
+            futuro = Future()
+            try:
+                self._cola.put_nowait((trabajo, futuro))
+            except queue.Full:
+                for anterior in futuros:  # El despachador descarta los cancelados
+                    anterior.cancel()
+                self.rechazados += 1
+                return None
+            futuros.append(futuro)
+        return futuros
+
+    def admitir(self, largo):
+        """
+        Decide, antes de leerlo, si se lee el cuerpo de una solicitud. Los cuerpos grandes
+        (capturas subidas) reservan una subida y solo se admiten si la cola tiene lugar, para
+        no leer cientos de MB que enviar rechazaría después. Si se admite, hay que llamar a
+        soltar con el mismo largo al terminar la solicitud.
+        :param largo: Bytes del cuerpo
+        :return: True si se admite
+        """
+        if largo <= CUERPO_PEQUENO:
+            return True
+        if self._cola.full() or not self._subidas.acquire(blocking=False):
+            self.rechazados += 1
+            return False
+        return True
+
+    def soltar(self, largo):
+        """
+        Libera la subida reservada por admitir.
+        :param largo: Bytes del cuerpo
+        """
+        if largo > CUERPO_PEQUENO:
+            self._subidas.release()
+
+    def estado(self):
+        """
+        Retorna el estado del servicio.
+        :return: Diccionario JSON
+        """
+        return {'trabajadores': self.trabajadores, 'cola': self._cola.qsize(), 'capacidad': self.capacidad,
+                'lote': self.lote, 'rechazados': self.rechazados, 'reinicios': self.reinicios}
+
+    def _despachar(self):
+        """
+        Ciclo del despachador: espera un proceso libre, toma el primer trabajo en espera,
+        completa el lote con los que lleguen durante self.espera y lo envía a ese proceso.
+        Los trabajos solo salen de la cola cuando hay un proceso para ellos, así que la cola
+        acotada es todo el trabajo en espera.
+        """
+        activo = True
+        while activo:
+            self._libres.acquire()
+            pendientes = [self._cola.get()]
+            limite = time.perf_counter() + self.espera
+            while pendientes[-1] is not None and len(pendientes) < self.lote:
+                try:
+                    pendientes.append(self._cola.get(timeout=max(limite - time.perf_counter(), 0)))
+                except queue.Empty:
+                    break
+            if pendientes[-1] is None:
+                activo = False
+                pendientes.pop()
+            pendientes = [(t, futuro) for t, futuro in pendientes if futuro.set_running_or_notify_cancel()]
+            if not pendientes:
+                self._libres.release()
+                continue
+            # Las capturas repetidas quedan juntas y aprovechan la caché del proceso
+            pendientes.sort(key=lambda p: str(p[0].get('ruta')))
+            trabajos = [t for t, _ in pendientes]
+            try:
+                try:
+                    tarea = self._pool.submit(_atender, trabajos)
+                except BrokenProcessPool:  # Un proceso murió (p. ej. sin memoria): se reemplaza el pool
+                    self._reiniciar()
+                    tarea = self._pool.submit(_atender, trabajos)
+            except Exception as error:
+                self._libres.release()
+                for _, futuro in pendientes:
+                    futuro.set_exception(error)
+                continue
+            tarea.add_done_callback(functools.partial(self._repartir, [f for _, f in pendientes]))
+
+    def _reiniciar(self):
+        """
+        Reemplaza un pool roto por uno nuevo. Los lotes que estaban en curso ya recibieron el error.
+        """
+        print('Un proceso de trabajo terminó inesperadamente; se reinician los procesos', file=sys.stderr)
+        self._pool.shutdown(wait=False)
+        self._pool = ProcessPoolExecutor(self.trabajadores, initializer=_preparar)
+        self.reinicios += 1
+
+    def _repartir(self, futuros, tarea):
+        """
+        Entrega los resultados de un lote a sus solicitudes.
+        :param futuros: Future de cada trabajo del lote
+        :param tarea: Future del lote
+        """
+        self._libres.release()
+        try:
+            respuestas = tarea.result()
+        except Exception as error:  # Falla del proceso de trabajo: afecta a todo el lote
+            for futuro in futuros:
+                futuro.set_exception(error)
+            return
+        for futuro, (correcto, valor) in zip(futuros, respuestas):
+            if correcto:
+                futuro.set_result(valor)
+            else:
+                futuro.set_exception(ErrorTrabajo(valor))
+
+
+# ----------------------------- Servidor HTTP -----------------------------
+class _Manejador(BaseHTTPRequestHandler):
+    """
+    Manejador de las solicitudes HTTP. El servicio está en self.server.servicio.
+    """
+    protocol_version = 'HTTP/1.1'  # Conexiones persistentes
+
+    def log_message(self, formato, *args):
+        """
+        Silencia el registro de cada solicitud (las latencias están en /latencias).
+        """
+
+    def _responder(self, codigo, cuerpo, tipo='application/json', encabezados=()):
+        """
+        Envía una respuesta.
+        :param codigo: Código HTTP
+        :param cuerpo: Objeto JSON o bytes
+        :param tipo: Tipo de contenido
+        :param encabezados: Encabezados adicionales (nombre, valor)
+        """
+        if not isinstance(cuerpo, bytes):
+            cuerpo = json.dumps(cuerpo, ensure_ascii=False).encode()
+        self.send_response(codigo)
+        self.send_header('Content-Type', tipo)
+        self.send_header('Content-Length', str(len(cuerpo)))
+        for nombre, valor in encabezados:
+            self.send_header(nombre, valor)
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def _largo(self):
+        """
+        Lee el largo del cuerpo de la solicitud. El cuerpo se lee completo después, para que en
+        una conexión persistente la siguiente solicitud empiece donde debe.
+        :return: Bytes del cuerpo, o None si Content-Length es inválido o supera MAXIMO_CUERPO
+        """
+        try:
+            largo = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            return None
+        return largo if 0 <= largo <= MAXIMO_CUERPO else None
+
+    def _trabajos(self, accion, consulta, cuerpo):
+        """
+        Arma los trabajos de la solicitud: del cuerpo JSON (un objeto o una lista), de la
+        captura subida en el cuerpo o de los parámetros de la URL.
+        :param accion: 'metricas' o 'fasorial'
+        :param consulta: Parámetros de la URL
+        :param cuerpo: Cuerpo de la solicitud
+        :return: Tupla (trabajos, es_lista)
+        """
+        parametros = {k: v[-1] for k, v in consulta.items()}
+        if cuerpo[:1] in (b'{', b'['):
+            datos = json.loads(cuerpo)
+            es_lista = isinstance(datos, list)
+            trabajos = [{**parametros, **d, 'accion': accion} for d in (datos if es_lista else [datos])]
+        elif cuerpo:
+            trabajos, es_lista = [dict(parametros, datos=cuerpo, accion=accion)], False
+        else:
+            trabajos, es_lista = [dict(parametros, accion=accion)], False
+        for trabajo in trabajos:
+            if trabajo.get('ruta') is None and trabajo.get('datos') is None:
+                raise ValueError('Indique la ruta de la captura o súbala en el cuerpo')
+        return trabajos, es_lista
+
+    def _procesar(self, metodo):
+        """
+        Atiende una solicitud y registra su latencia.
+        :param metodo: 'GET' o 'POST'
+        """
+        inicio = time.perf_counter()
+        url = urlsplit(self.path)
+        servicio = self.server.servicio
+        largo = self._largo()
+        admitido = largo is not None and servicio.admitir(largo)
+        try:
+            # Sin leer el cuerpo se cierra la conexión: lo que queda en ella no es otra solicitud
+            if largo is None:
+                self._responder(413, {'error': 'El cuerpo supera %d bytes o su largo es inválido' % MAXIMO_CUERPO},
+                                encabezados=[('Connection', 'close')])
+                return
+            if not admitido:
+                self._responder(503, {'error': 'Cola llena, intente de nuevo'},
+                                encabezados=[('Retry-After', '1'), ('Connection', 'close')])
+                return
+            cuerpo = self.rfile.read(largo) if largo else b''
+            if url.path == '/salud':
+                self._responder(200, servicio.estado())
+            elif url.path == '/latencias':
+                self._responder(200, servicio.latencias.resumen())
+            elif url.path == '/analizar' and metodo == 'POST' or url.path == '/fasorial':
+                accion = 'metricas' if url.path == '/analizar' else 'fasorial'
+                trabajos, es_lista = self._trabajos(accion, parse_qs(url.query), cuerpo)
+                if accion == 'fasorial' and es_lista:
+                    raise ValueError('/fasorial retorna una sola imagen')
+                futuros = servicio.enviar(trabajos)
+                if futuros is None:
+                    self._responder(503, {'error': 'Cola llena, intente de nuevo'}, encabezados=[('Retry-After', '1')])
+                elif wait(futuros, timeout=servicio.limite).not_done:
+                    for futuro in futuros:  # Los que siguen en la cola ya no se calculan
+                        futuro.cancel()
+                    self._responder(504, {'error': 'El análisis superó %g s' % servicio.limite})
+                else:
+                    if accion == 'fasorial':
+                        self._responder(200, futuros[0].result(), tipo='image/png')
+                    elif es_lista:  # En una lista, cada captura con error lleva su mensaje
+                        self._responder(200, [{'error': str(futuro.exception())} if futuro.exception()
+                                              else futuro.result() for futuro in futuros])
+                    else:
+                        self._responder(200, futuros[0].result())
+            else:
+                self._responder(404, {'error': 'Ruta desconocida: %s %s' % (metodo, url.path)})
+        except (ValueError, KeyError, ErrorTrabajo) as error:
+            self._responder(400, {'error': str(error)})
+        except Exception as error:
+            self._responder(500, {'error': '%s: %s' % (type(error).__name__, error)})
+        finally:
+            if admitido:
+                servicio.soltar(largo)
+            servicio.latencias.registrar(url.path, time.perf_counter() - inicio)
+
+    def do_GET(self):
+        self._procesar('GET')
+
+    def do_POST(self):
+        self._procesar('POST')
+
+
+class _Servidor(ThreadingHTTPServer):
+    """
+    Servidor HTTP con un hilo por conexión.
+    """
+    daemon_threads = True
+    request_queue_size = 128  # Conexiones pendientes: con 5 (por defecto) una ráfaga de clientes recibe RST
+
+
+def crear_servidor(servicio, host='127.0.0.1', puerto=8750):
+    """
+    Crea el servidor HTTP del servicio (un hilo por conexión; el cálculo ocurre en los procesos).
+    :param servicio: Servicio iniciado
+    :param host: Dirección de escucha (por defecto solo local)
+    :param puerto: Puerto (0 para uno libre)
+    :return: ThreadingHTTPServer
+    """
+    servidor = _Servidor((host, puerto), _Manejador)
+    servidor.servicio = servicio
+    return servidor
+
+
+def main(argumentos=None):
+    """
+    Función principal de la línea de comandos.
+    :param argumentos: Lista de argumentos (por defecto sys.argv)
+    :return: Código de salida
+    """
+    parser = argparse.ArgumentParser(description='Servicio HTTP local del analizador de línea')
+    parser.add_argument('--host', default='127.0.0.1', help='Dirección de escucha')
+    parser.add_argument('--puerto', type=int, default=8750, help='Puerto')
+    parser.add_argument('--trabajadores', type=int, default=os.cpu_count(), help='Procesos de trabajo')
+    parser.add_argument('--cola', type=int, default=64, help='Trabajos en espera antes de responder 503')
+    parser.add_argument('--lote', type=int, default=16, help='Trabajos por lote')
+    parser.add_argument('--espera', type=float, default=0.002, help='Espera para completar un lote [s]')
+    parser.add_argument('--limite', type=float, default=60.0, help='Tiempo máximo de respuesta antes de 504 [s]')
+    parser.add_argument('--subidas', type=int, default=4, help='Capturas subidas grandes en memoria')
+    args = parser.parse_args(argumentos)
+
+    servicio = Servicio(args.trabajadores, args.cola, args.lote, args.espera, args.limite, args.subidas)
+    inicio = time.perf_counter()
+    servicio.iniciar()
+    servidor = crear_servidor(servicio, args.host, args.puerto)
+    print('%d procesos listos en %.2f s; escuchando en http://%s:%d'
+          % (servicio.trabajadores, time.perf_counter() - inicio, args.host, servidor.server_address[1]),
+          file=sys.stderr)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        servicio.cerrar()
+    return 0
+
+
+# Salvaguarda
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,13 @@
+"""
+Configuración de las pruebas: los módulos del analizador están en la raíz del proyecto.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,101 @@
+"""
+Pruebas del archivo histórico: resúmenes, reapertura y consultas por rango frente a una
+reducción directa de todas las filas.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import numpy as np
+import pytest
+from archivo import CAMPOS, NIVELES, Archivo
+
+FORMA = (2, 3)
+
+
+def _datos(n=6000, semilla=0):
+    rng = np.random.default_rng(semilla)
+    t = 1.7e9 + np.cumsum(rng.exponential(20.0, n))  # Día y medio con separaciones irregulares
+    columnas = {c: rng.normal(size=(n,) + FORMA) for c in CAMPOS}
+    return t, columnas
+
+
+def _llenar(directorio, t, columnas, cortes, reabrir=()):
+    archivo = Archivo(directorio, forma=FORMA, trozo=256)
+    for k, (a, b) in enumerate(zip(cortes[:-1], cortes[1:])):
+        if k in reabrir:  # Como si el programa se reiniciara entre dos lotes
+            archivo = Archivo(directorio)
+        archivo.agregar(t[a:b], {c: x[a:b] for c, x in columnas.items()})
+    return archivo
+
+
+def _resumen_directo(t, columnas, ancho, inicio=-np.inf, fin=np.inf):
+    cubeta = np.floor(t / ancho) * ancho
+    sel = (cubeta >= inicio) & (cubeta < fin)
+    resumen = {'t': [], 'n': []}
+    for c in np.unique(cubeta[sel]):
+        filas = cubeta == c
+        resumen['t'].append(c)
+        resumen['n'].append(filas.sum())
+        for campo, x in columnas.items():
+            resumen.setdefault(campo, []).append(x[filas].mean(axis=0))
+            resumen.setdefault(campo + '_min', []).append(x[filas].min(axis=0))
+            resumen.setdefault(campo + '_max', []).append(x[filas].max(axis=0))
+    return {c: np.array(v) for c, v in resumen.items()}
+
+
+@pytest.fixture(scope='module')
+def datos():
+    return _datos()
+
+
+def _cortes(n, semilla=1):
+    rng = np.random.default_rng(semilla)
+    return np.r_[0, np.sort(rng.choice(np.arange(1, n), 30, replace=False)), n]
+
+
+@pytest.mark.parametrize('nivel', list(NIVELES))
+def test_resumenes_con_reaperturas(tmp_path, datos, nivel):
+    t, columnas = datos
+    archivo = _llenar(str(tmp_path), t, columnas, _cortes(len(t)), reabrir=(10, 11, 20))
+    assert len(archivo) == len(t)
+    obtenido = archivo.rango(-np.inf, np.inf, nivel)
+    esperado = _resumen_directo(t, columnas, NIVELES[nivel])
+    np.testing.assert_array_equal(obtenido['t'], esperado['t'])
+    np.testing.assert_array_equal(obtenido['n'], esperado['n'])
+    for campo in esperado:
+        np.testing.assert_allclose(obtenido[campo], esperado[campo], rtol=1e-9, atol=1e-12, err_msg=campo)
+    # El archivo reabierto al final responde lo mismo, con el intervalo abierto reconstruido
+    reabierto = Archivo(str(tmp_path)).rango(-np.inf, np.inf, nivel)
+    for campo in obtenido.dtype.names:
+        np.testing.assert_allclose(reabierto[campo], obtenido[campo], rtol=1e-12, err_msg=campo)
+
+
+def test_consultas_por_rango(tmp_path, datos):
+    t, columnas = datos
+    archivo = _llenar(str(tmp_path), t, columnas, _cortes(len(t), semilla=2))
+    rng = np.random.default_rng(3)
+    for inicio, fin in np.sort(rng.uniform(t[0] - 100, t[-1] + 100, (20, 2)), axis=1).tolist() + [
+            [t[300], t[700]], [t[-1] + 1, np.inf], [-np.inf, t[0]]]:
+        filas = archivo.rango(inicio, fin)
+        sel = (t >= inicio) & (t < fin)
+        np.testing.assert_array_equal(filas['t'], t[sel])
+        for campo, x in columnas.items():
+            np.testing.assert_array_equal(filas[campo], x[sel])
+        esperado = _resumen_directo(t, columnas, NIVELES['1h'], inicio, fin)
+        horas = archivo.rango(inicio, fin, '1h')
+        np.testing.assert_array_equal(horas['t'], esperado.get('t', []))
+        if len(horas):
+            np.testing.assert_allclose(horas['P'], esperado['P'], rtol=1e-9, atol=1e-12)
+
+
+def test_filas_fuera_de_orden(tmp_path, datos):
+    t, columnas = datos
+    archivo = _llenar(str(tmp_path), t, columnas, [0, 100])
+    with pytest.raises(ValueError):
+        archivo.agregar(t[50:60], {c: x[50:60] for c, x in columnas.items()})
+    with pytest.raises(ValueError):
+        archivo.rango(0, 1, nivel='5m')
+    assert len(archivo) == 100
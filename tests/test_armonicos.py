@@ -0,0 +1,35 @@
+"""
+Pruebas del análisis de armónicos con canales sin fundamental.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import warnings
+import numpy as np
+import armonicos
+from analizador import Analizador
+from fuentes import sintetizar
+
+
+def test_fase_apagada():
+    V, I = sintetizar(6000)
+    I[1, 2] = 0  # Fase C del nodo 2 sin corriente
+    a = Analizador(V, I)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', RuntimeWarning)
+        thd_v, thd_i = a.thd()
+        tdd, fk = a.tdd(), a.factor_k()
+        tabla = a.tabla_armonicos()
+    assert np.all(np.isfinite(thd_i)) and np.all(np.isfinite(tdd)) and np.all(np.isfinite(fk))
+    assert thd_i[1, 2] == 0 and tdd[1, 2] == 0 and fk[1, 2] == 1
+    assert 'nan' not in tabla and 'inf' not in tabla
+
+
+def test_thd_sin_fundamental():
+    magnitudes = np.zeros((2, 6))
+    magnitudes[0, [1, 3]] = 10, 1
+    magnitudes[1, 3] = 1  # Solo tercer armónico: el THD no está definido
+    np.testing.assert_allclose(armonicos.thd(magnitudes), [0.1, 0])
@@ -0,0 +1,64 @@
+"""
+Pruebas del detector de eventos de calidad con perturbaciones inyectadas.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import numpy as np
+import calidad
+from fuentes import sintetizar
+from nucleo import AnalizadorNumerico
+
+
+def _eventos(V):
+    return AnalizadorNumerico(V, np.zeros_like(V)).eventos()
+
+
+def test_transitorio_una_sola_vez():
+    V = sintetizar(60000)[0].copy()
+    V[1, 2, 6000] += 400  # El ciclo siguiente repite el salto respecto a este, pero no al suyo
+    eventos = _eventos(V)
+    assert len(eventos) == 1
+    e = eventos[0]
+    assert (e['tipo'], e['nodo'], e['fase'], e['muestra']) == ('transitorio', 2, 'C', 6000)
+
+
+def test_hueco_sin_transitorios_en_los_bordes():
+    V = sintetizar(60000)[0].copy()
+    V[0, :, 12000:15000] *= 0.5
+    eventos = _eventos(V)
+    assert list(eventos['tipo']) == ['hueco'] * 3
+    assert list(eventos['fase']) == ['A', 'B', 'C']
+    np.testing.assert_allclose(eventos['profundidad'], 50, atol=0.5)
+    np.testing.assert_allclose(eventos['duracion'], 0.5, atol=1 / 60)
+
+
+def test_elevacion_y_transitorio_separados():
+    V = sintetizar(60000)[0].copy()
+    V[2, 1, 12050:15050] *= 1.3
+    V[2, 1, 30000] -= 100
+    eventos = _eventos(V)
+    assert list(eventos['tipo']) == ['elevacion', 'transitorio']
+    assert list(eventos['muestra']) == [12000, 30000]
+    assert np.isclose(eventos['profundidad'][0], 30, atol=0.5)
+
+
+def test_saltos_por_bloques():
+    V = sintetizar(12000, n_nodos=1)[0].copy()
+    V[0, 0, [99, 250, 5999, 11950]] += 300  # Bordes de bloque y ciclos extremos
+    completo = calidad.medios_ciclos(V, 100)
+    for bloque in (50, 150, 1000):
+        for esperado, obtenido in zip(completo, calidad.medios_ciclos(V, 100, bloque)):
+            np.testing.assert_allclose(obtenido, esperado)
+    saltos = completo[1][0, 0] / (120 * np.sqrt(2))
+    assert set(np.flatnonzero(saltos > 0.5)) == {1, 5, 119, 239}
+
+
+def test_fases_con_mas_de_tres_canales():
+    urms = np.ones((1, 4, 200))
+    urms[0, 3, 50:80] = 0.5
+    eventos = calidad.detectar(urms, 6000, 100)
+    assert list(eventos['fase']) == ['4']
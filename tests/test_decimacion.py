@@ -0,0 +1,74 @@
+"""
+Pruebas de la reducción de puntos de las gráficas: envolvente, LTTB, densidad y caché
+por nivel de zoom.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import numpy as np
+from decimacion import CacheNiveles, densidad, lttb, minmax
+from fuentes import sintetizar
+
+
+def test_envolvente_conserva_los_extremos():
+    V = sintetizar(60000, n_nodos=2)[0].copy()
+    V[1, 2, 31234] = 900  # Un pico de una sola muestra debe verse a cualquier zoom
+    inicio, fin, pixeles = 1000, 59001, 700
+    x, y = minmax(V, inicio, fin, pixeles)
+    assert y.shape == V.shape[:-1] + x.shape and len(x) <= 2 * pixeles + 2
+    assert np.all(np.diff(x) >= 0) and x[0] == inicio and x[-1] < fin
+    tramo = V[..., inicio:fin]
+    np.testing.assert_array_equal(y.max(axis=-1), tramo.max(axis=-1))
+    np.testing.assert_array_equal(y.min(axis=-1), tramo.min(axis=-1))
+    paso = -(-(fin - inicio) // pixeles)
+    for g in (0, 3, len(x) // 2 - 1):  # Cada píxel tiene el mínimo y el máximo de sus muestras
+        grupo = V[..., inicio + g * paso:min(inicio + (g + 1) * paso, fin)]
+        np.testing.assert_array_equal(np.sort(y[..., 2 * g:2 * g + 2], axis=-1)[..., 0], grupo.min(axis=-1))
+        np.testing.assert_array_equal(np.sort(y[..., 2 * g:2 * g + 2], axis=-1)[..., 1], grupo.max(axis=-1))
+
+
+def test_envolvente_sin_reducir():
+    y = np.arange(20.0)
+    x, y_red = minmax(y, 5, 15, 10)
+    np.testing.assert_array_equal(x, np.arange(5, 15))
+    np.testing.assert_array_equal(y_red, y[5:15])
+
+
+def test_lttb():
+    x = np.arange(10000.0)
+    y = np.sin(x / 500)
+    y[4321] = 5
+    xr, yr = lttb(x, y, 200)
+    assert len(xr) == 200 and xr[0] == 0 and xr[-1] == 9999
+    assert np.all(np.diff(xr) > 0)
+    assert 4321 in xr  # El pico forma el triángulo más grande de su grupo
+    np.testing.assert_array_equal(yr, y[xr.astype(int)])
+    assert len(lttb(x[:50], y[:50], 200)[0]) == 50
+
+
+def test_densidad_cuenta_todos_los_puntos():
+    V, I = sintetizar(60000, n_nodos=1)
+    xc, yc, cuentas = densidad(V[0, 0], I[0, 0], 300)
+    assert cuentas.sum() == 60000 and np.all(cuentas > 0)
+    assert len(xc) == len(yc) == len(cuentas) <= 300 * 300
+    assert V[0, 0].min() <= xc.min() and xc.max() <= V[0, 0].max()
+    assert densidad([0.0, 1.0], [0.0, 0.0], 4, rango=[[0, 1], [-1, 1]])[2].tolist() == [1, 1]
+
+
+def test_cache_lru():
+    cache = CacheNiveles(capacidad=2)
+    calculos = []
+
+    def calcular(valor):
+        return lambda: calculos.append(valor) or valor
+
+    assert cache.obtener('a', calcular('a')) == 'a'
+    cache.obtener('b', calcular('b'))
+    cache.obtener('a', calcular('a'))  # Acierto: 'a' pasa a ser la más reciente
+    cache.obtener('c', calcular('c'))  # Sale 'b'
+    cache.obtener('a', calcular('a'))
+    cache.obtener('b', calcular('b'))
+    assert calculos == ['a', 'b', 'c', 'b']
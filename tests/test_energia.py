@@ -0,0 +1,35 @@
+"""
+Pruebas del medidor de energía: capturas repetidas y tarifa por bloques.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import numpy as np
+from energia import MedidorEnergia, Tarifa, huella
+from fuentes import sintetizar
+
+
+def test_huellas_en_el_respaldo(tmp_path):
+    V, I = sintetizar(6000)
+    archivo = str(tmp_path / 'energia.npz')
+    medidor = MedidorEnergia(archivo=archivo)
+    clave = huella(V, I)
+    assert not medidor.integrada(clave)
+    medidor.integrar(V, I, clave=clave)
+    medidor.guardar()
+    reabierto = MedidorEnergia(archivo=archivo)  # Como al reiniciar el programa
+    assert reabierto.integrada(clave)
+    assert not reabierto.integrada(huella(V, 2 * I))
+    np.testing.assert_array_equal(reabierto.kwh, medidor.kwh)
+
+
+def test_tarifa_sobre_el_total():
+    tarifa = Tarifa([(100, 500), (float('inf'), 900)], precio_kvarh=10)
+    kwh = np.array([60.0, 60.0, 80.0])
+    costo = tarifa.repartir(kwh, np.array([1.0, 2.0, 3.0]))
+    assert np.isclose(costo.sum(), 100 * 500 + 100 * 900 + 6 * 10)
+    np.testing.assert_allclose(costo - [10, 20, 30], (100 * 500 + 100 * 900) * kwh / kwh.sum())
+    np.testing.assert_array_equal(tarifa.repartir(np.zeros(3)), 0)
@@ -0,0 +1,45 @@
+"""
+Pruebas del analizador en flujo continuo frente al núcleo por lotes.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import numpy as np
+import pytest
+from flujo import AnalizadorFlujo, ciclos_ventana
+from fuentes import sintetizar
+from nucleo import AnalizadorNumerico
+
+
+def _bloques(V, I, tamanos):
+    inicio, k = 0, 0
+    while inicio < V.shape[-1]:
+        fin = inicio + tamanos[k % len(tamanos)]
+        yield V[..., inicio:fin], I[..., inicio:fin]
+        inicio, k = fin, k + 1
+
+
+@pytest.mark.parametrize('paso', [None, 300])
+def test_ventanas_igual_que_por_lotes(paso):
+    flujo = AnalizadorFlujo(n_nodos=2, ciclos=12, paso=paso)
+    W = flujo.W
+    V, I = sintetizar(70 * W, n_nodos=2)  # Más de _RESINCRONIZAR vueltas del búfer
+    ventanas = list(flujo.ventanas(_bloques(V, I, [777, 1, 5000, 1200])))  # Bloques que cruzan las ventanas
+    assert [v['muestra'] for v in ventanas] == list(range(W, 70 * W + 1, paso or W))
+    for ventana in ventanas[::7] + ventanas[-2:]:
+        fin = ventana['muestra']
+        a = AnalizadorNumerico(V[..., fin - W:fin], I[..., fin - W:fin])
+        esperado = dict(a.metricas())
+        _, _, _, esperado['V_fasor'], esperado['I_fasor'] = a.pasada()
+        for nombre, valor in esperado.items():
+            np.testing.assert_allclose(ventana[nombre], valor, rtol=1e-9, atol=1e-9, err_msg=nombre)
+
+
+def test_ciclos_ventana():
+    assert [ciclos_ventana(t, 60) for t in ('ciclo', 'iec', '3s')] == [1, 12, 180]
+    assert [ciclos_ventana(t, 50) for t in ('ciclo', 'iec', '3s')] == [1, 10, 150]
+    with pytest.raises(ValueError):
+        ciclos_ventana('minuto')
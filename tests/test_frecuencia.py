@@ -0,0 +1,45 @@
+"""
+Pruebas del seguimiento de frecuencia y del remuestreo a ciclos enteros.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import tracemalloc
+import numpy as np
+import frecuencia
+from fuentes import sintetizar
+from nucleo import AnalizadorNumerico
+
+
+def test_frecuencia_fuera_de_la_nominal():
+    V, I = sintetizar(60000, fs=7000, f=60.4)
+    a = AnalizadorNumerico.con_seguimiento(V, I, fs=7000, f=60)
+    np.testing.assert_allclose(a.frecuencia(), 60.4, atol=5e-3)
+    assert a.V.shape[-1] % frecuencia.MUESTRAS_CICLO == 0
+    nominal = AnalizadorNumerico(*sintetizar(60000, fs=6000, f=60), fs=6000, f=60).metricas()
+    np.testing.assert_allclose(a.metricas()['P'], nominal['P'], rtol=2e-3)
+    t = a.instantes(slice(0, 3))
+    np.testing.assert_allclose(np.diff(t), 1 / (60.4 * frecuencia.MUESTRAS_CICLO), rtol=1e-4)
+
+
+def _pico(ruta, n):
+    sintetizar(n, fs=7000, f=60.4, ruta=ruta)
+    X = np.load(ruta, mmap_mode='r')
+    tracemalloc.start()
+    try:
+        a = AnalizadorNumerico.con_seguimiento(X[0], X[1], fs=7000, f=60)
+        a.metricas()
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert isinstance(a.V, np.memmap)
+    return pico
+
+
+def test_memoria_acotada_con_grabaciones_en_disco(tmp_path):
+    corta = _pico(str(tmp_path / 'corta.npy'), 300000)
+    larga = _pico(str(tmp_path / 'larga.npy'), 1200000)  # 4 veces más larga: 74 MB remuestreados
+    assert larga < 1.3 * corta + (2 << 20)
@@ -0,0 +1,93 @@
+"""
+Pruebas de las fuentes de señales: generador, directorio de capturas, caché local y
+descarga del módulo del curso.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import sys
+import types
+import numpy as np
+import pytest
+import fuentes
+from fuentes import FuenteCache, FuenteDirectorio, FuenteGenerador, sintetizar
+
+
+def test_sintetizar_reproducible_y_en_disco(tmp_path):
+    V, I = sintetizar(5000, n_nodos=2, semilla=3, bloque=2048)
+    assert V.shape == I.shape == (2, 3, 5000)
+    np.testing.assert_array_equal(sintetizar(5000, n_nodos=2, semilla=3, bloque=2048)[0], V)
+    Vd, Id = sintetizar(5000, n_nodos=2, semilla=3, bloque=2048, ruta=str(tmp_path / 'c.npy'))
+    assert isinstance(Vd, np.memmap)
+    np.testing.assert_array_equal(Vd, V)
+    np.testing.assert_array_equal(Id, I)
+
+
+def test_generador_con_diccionario_de_nodos():
+    def generador(n):
+        return {'Node %d' % k: (np.full((3, n), k), np.full((3, n), -k)) for k in (10, 2, 1)}
+
+    V, I = FuenteGenerador(generador, n=4).cargar()
+    assert V.shape == (3, 3, 4)
+    np.testing.assert_array_equal(V[:, 0, 0], [1, 2, 10])  # Orden numérico de los nodos
+    np.testing.assert_array_equal(I, -V)
+
+
+def test_cache_genera_una_sola_vez(tmp_path):
+    llamadas = []
+
+    def generador(n):
+        llamadas.append(n)
+        return sintetizar(n)
+
+    def fuente(n):
+        return FuenteCache(FuenteGenerador(generador, nombre='prueba', n=n), directorio=str(tmp_path))
+
+    V, I = fuente(600).cargar()
+    V2, I2 = fuente(600).cargar()  # Como en un segundo arranque
+    assert llamadas == [600]
+    assert isinstance(V2, np.memmap)
+    np.testing.assert_array_equal(V2, V)
+    np.testing.assert_array_equal(I2, I)
+    fuente(700).cargar()  # Otros parámetros, otra instantánea
+    assert llamadas == [600, 700]
+    assert len(list(tmp_path.glob('*.npy'))) == 2
+
+
+def test_directorio_de_capturas(tmp_path):
+    V, I = sintetizar(600)
+    np.savez(tmp_path / 'b.npz', V=V, I=I)
+    np.save(tmp_path / 'a.npy', np.stack([2 * V, 2 * I]))
+    np.testing.assert_array_equal(FuenteDirectorio(str(tmp_path)).cargar()[0], 2 * V)  # La primera
+    np.testing.assert_array_equal(FuenteDirectorio(str(tmp_path), 'b.npz').cargar()[1], I)
+    assert FuenteDirectorio(str(tmp_path)).clave() != FuenteDirectorio(str(tmp_path), 'b.npz').clave()
+    with pytest.raises(FileNotFoundError):
+        FuenteDirectorio(str(tmp_path / 'vacio')).cargar()
+
+
+def test_descarga_con_limite_de_tiempo(tmp_path, monkeypatch):
+    pedidas = []
+
+    class Respuesta:
+        text = 'def signal_generation():\n    return {"Node 1": ([[1.0]], [[2.0]])}\n'
+
+        def raise_for_status(self):
+            pedidas.append('estado')
+
+    def get(url, timeout=None):
+        pedidas.append(timeout)
+        return Respuesta()
+
+    monkeypatch.setitem(sys.modules, 'requests', types.SimpleNamespace(get=get))
+    monkeypatch.delitem(sys.modules, 'seniales_sep', raising=False)
+    monkeypatch.setattr(sys, 'path', list(sys.path))
+    datos = fuentes.senales_curso(str(tmp_path))
+    assert pedidas == [fuentes.ESPERA, 'estado']
+    assert datos == {'Node 1': ([[1.0]], [[2.0]])}
+    monkeypatch.delitem(sys.modules, 'seniales_sep')
+    fuentes.senales_curso(str(tmp_path))  # Ya descargado: no vuelve a pedirlo
+    assert len(pedidas) == 2
+    assert (tmp_path / 'seniales_sep.py').exists() and not list(tmp_path.glob('*.tmp'))
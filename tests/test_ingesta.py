@@ -0,0 +1,137 @@
+"""
+Pruebas de la ingesta: ventanas armadas con tramas de cualquier tamaño, huecos, tramas
+tardías, reinicios, políticas y errores del análisis.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import asyncio
+import numpy as np
+import ingesta as modulo
+from fuentes import sintetizar
+from ingesta import Ingesta, trama
+from nucleo import AnalizadorNumerico
+
+
+def _alimentar(ingesta, ventanas=6):
+    async def probar():
+        servidor = await ingesta.iniciar(puerto=0)
+        X = np.ones((2, 3, 3, ingesta.W), dtype=np.float32)
+        for k in range(ventanas):  # Más ventanas que ranuras: con 'esperar' se bloquearía si no se liberan
+            await asyncio.wait_for(ingesta.recibir(7, k * ingesta.W, X), timeout=10)
+        await asyncio.wait_for(ingesta.vaciar(), timeout=10)
+        servidor.close()
+        await ingesta.cerrar()
+
+    asyncio.run(probar())
+
+
+def test_error_en_al_resultado():
+    recibidas = []
+
+    def al_resultado(medidor, ventana):
+        recibidas.append(medidor)
+        raise RuntimeError('falla del consumidor')
+
+    ingesta = Ingesta(profundidad=2, al_resultado=al_resultado)
+    _alimentar(ingesta)
+    assert len(recibidas) == 6
+    assert ingesta.errores == 6
+
+
+def test_error_en_el_analisis(monkeypatch):
+    def fallar(ventanas, fs, f):
+        raise MemoryError('sin memoria')
+
+    monkeypatch.setattr(modulo, '_metricas', fallar)
+    ingesta = Ingesta(profundidad=2)
+    _alimentar(ingesta)
+    assert ingesta.errores > 0
+    assert ingesta.estado()['lotes'] == 0
+    assert ingesta.estado()['total']['ventanas'] == 6
+
+
+def test_recibir_sin_iniciar():
+    ingesta = Ingesta()
+    X = np.zeros((2, 3, 3, ingesta.W), dtype=np.float32)
+    asyncio.run(ingesta.recibir(1, 0, X))
+    assert ingesta.estado()['total']['ventanas'] == 1
+
+
+def _enviar(ingesta, *conexiones):
+    """
+    Envía por TCP las tramas de cada conexión, una conexión después de otra, y espera a que
+    todas se procesen y se analicen.
+    """
+    async def probar():
+        servidor = await ingesta.iniciar(puerto=0)
+        puerto = servidor.sockets[0].getsockname()[1]
+        enviadas = 0
+        for tramas in conexiones:
+            _, escritor = await asyncio.open_connection('127.0.0.1', puerto)
+            for t in tramas:
+                escritor.write(t)
+            await escritor.drain()
+            escritor.close()
+            await escritor.wait_closed()
+            enviadas += len(tramas)
+            while ingesta.estado()['total'].get('tramas', 0) < enviadas:
+                await asyncio.sleep(0.01)
+        await asyncio.wait_for(ingesta.vaciar(), timeout=10)
+        servidor.close()
+        await ingesta.cerrar()
+
+    asyncio.run(probar())
+
+
+def _tramas(V, I, secuencias, muestras, medidor=7):
+    return [trama(medidor, s, V[..., s:s + muestras], I[..., s:s + muestras]) for s in secuencias]
+
+
+def test_ventanas_igual_que_el_nucleo():
+    ventanas = []
+    ingesta = Ingesta(lote=1, al_resultado=lambda medidor, ventana: ventanas.append(ventana))
+    W = ingesta.W
+    V, I = (X.astype(np.float32) for X in sintetizar(6 * W))
+    _enviar(ingesta, _tramas(V, I, range(0, 6 * W, 700), 700))  # Tramas que cruzan los bordes de ventana
+    assert [v['muestra'] for v in ventanas] == [W * (k + 1) for k in range(6)]
+    for k, ventana in enumerate(ventanas):
+        esperado = AnalizadorNumerico(V[..., k * W:(k + 1) * W], I[..., k * W:(k + 1) * W]).metricas()
+        for nombre, valor in esperado.items():
+            np.testing.assert_array_equal(ventana[nombre], valor, err_msg=nombre)
+
+
+def test_huecos_y_tramas_tardias():
+    ventanas = []
+    ingesta = Ingesta(al_resultado=lambda medidor, ventana: ventanas.append(ventana['muestra']))
+    V, I = sintetizar(3000)
+    # La trama 1200 se pierde (la ventana en curso se descarta) y la 600 llega repetida y tarde
+    _enviar(ingesta, _tramas(V, I, [0, 600, 1800, 600, 2400], 600))
+    c = ingesta.estado()['total']
+    assert (c['ventanas'], c['huecos'], c['perdidas'], c['tardias'], c['reinicios']) == (2, 1, 600, 1, 0)
+    assert ventanas == [1200, 3000]
+
+
+def test_reinicio_en_conexion_nueva():
+    ventanas = []
+    ingesta = Ingesta(al_resultado=lambda medidor, ventana: ventanas.append(ventana['muestra']))
+    V, I = sintetizar(2400)
+    # El medidor se reinicia y vuelve a conectarse desde la secuencia 0
+    _enviar(ingesta, _tramas(V, I, [0, 600, 1200, 1800], 600), _tramas(V, I, [0, 600], 600))
+    c = ingesta.estado()['total']
+    assert (c['ventanas'], c['reinicios'], c['tardias'], c['huecos']) == (3, 1, 0, 0)
+    assert ventanas == [1200, 2400, 1200]
+
+
+def test_politica_descartar():
+    ingesta = Ingesta(profundidad=2, politica='descartar')
+    X = np.zeros((2, 3, 3, ingesta.W), dtype=np.float32)
+    for k in range(5):  # Sin análisis en marcha: ninguna ranura se libera
+        asyncio.run(ingesta.recibir(7, k * ingesta.W, X))
+    m = ingesta.medidores[7]
+    c = m.contadores
+    assert (c['ventanas'], c['descartadas'], c['esperas']) == (5, 4, 0)
+    assert [m.inicio[s] for s in m.listas] == [4 * ingesta.W]  # Queda la ventana más reciente
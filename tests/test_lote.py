@@ -0,0 +1,55 @@
+"""
+Pruebas del análisis por lotes con capturas de distinto número de nodos.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import csv
+import json
+import numpy as np
+import lote
+from fuentes import sintetizar
+from nucleo import AnalizadorNumerico
+from resultados import Resultados, concatenar
+
+
+def _guardar(directorio, nombre, n_nodos):
+    V, I = sintetizar(6000, n_nodos=n_nodos)
+    ruta = str(directorio / nombre)
+    np.savez(ruta, V=V, I=I)
+    return ruta
+
+
+def test_capturas_con_dos_y_tres_nodos(tmp_path):
+    rutas = [_guardar(tmp_path, 'dos.npz', 2), _guardar(tmp_path, 'tres.npz', 3)]
+    salida = str(tmp_path / 'resumen.csv')
+    assert lote.ejecutar(rutas, salida, trabajadores=1) == 0
+    with open(salida) as f:
+        filas = list(csv.DictReader(f))
+    assert len(filas) == (2 + 3) * 3
+    assert {fila['nodo'] for fila in filas if fila['archivo'].endswith('dos.npz')} == {'1', '2'}
+
+
+def test_red_desde_archivo(tmp_path):
+    ruta_red = tmp_path / 'red.json'
+    ruta_red.write_text(json.dumps({'lineas': [[1, 3, 0.01, 0], [2, 3, 0.02, 0.001]], 'medidos': [1, 2],
+                                    'inyeccion': [[1, 1]]}))
+    ruta = _guardar(tmp_path, 'dos.npz', 2)
+    salida = str(tmp_path / 'resumen.json')
+    assert lote.main([ruta, '--salida', salida, '--trabajadores', '1', '--red', str(ruta_red)]) == 0
+    with open(salida) as f:
+        assert len(json.load(f)['nodo']) == 6
+
+
+def test_concatenar_con_y_sin_alimentadores():
+    V, I = sintetizar(6000, n_nodos=2)
+    uno = Resultados.desde_analizador(AnalizadorNumerico(V, I), 'uno', no_medidos=False)
+    varios = Resultados.desde_analizador(AnalizadorNumerico(np.stack([V, V]), np.stack([I, I])), 'varios',
+                                         no_medidos=False)
+    columnas = concatenar([uno, varios])
+    assert list(columnas)[0] == 'alimentador'
+    assert len({len(x) for x in columnas.values()}) == 1
+    np.testing.assert_array_equal(columnas['alimentador'], [1] * 6 + [1] * 6 + [2] * 6)
@@ -0,0 +1,95 @@
+"""
+Pruebas del núcleo numérico con cualquier número de nodos medidos.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import numpy as np
+import pytest
+from fuentes import sintetizar
+from nucleo import AnalizadorNumerico
+from red import Red
+
+
+@pytest.mark.parametrize('n_nodos', [1, 2, 3, 5])
+def test_red_predeterminada_por_numero_de_nodos(n_nodos):
+    V, I = sintetizar(6000, n_nodos=n_nodos)
+    a = AnalizadorNumerico(V, I)
+    assert len(a.red.medidos) == n_nodos
+    assert a.impedancias_complejas().shape == (n_nodos, 3)
+    r = a.resultados()
+    assert r.Vu_rms.shape == (1, 3)
+    assert np.all(np.isfinite(r.Z))
+    Vf, If, Vu, Iu = a.fasores()
+    assert Vu.shape == Iu.shape == (1, 3)
+
+
+def test_impedancias_sin_resolver_la_red():
+    V, I = sintetizar(6000, n_nodos=2)
+    a = AnalizadorNumerico(V, I)
+    a.red = Red([(3, 4, 0.01)], medidos=(1, 2))  # Nodos 3 y 4 aislados: la red no tiene solución
+    with pytest.raises(ValueError):
+        a.fasores()
+    assert a.impedancias_complejas().shape == (2, 3)
+
+
+def test_red_incompatible():
+    V, I = sintetizar(6000, n_nodos=5)
+    with pytest.raises(ValueError, match='nodos medidos'):
+        AnalizadorNumerico(V, I, red=Red.cuatro_nodos())
+
+
+def test_alimentadores_con_dos_nodos():
+    V, I = sintetizar(6000, n_nodos=2)
+    a = AnalizadorNumerico(np.stack([V, V]), np.stack([I, I]))
+    r = a.resultados()
+    assert r.alimentadores == (2,)
+    np.testing.assert_allclose(r.Z[0], r.Z[1])
+
+
+def test_factor_de_potencia_con_signo():
+    V, I = sintetizar(6000)
+    directo, inverso = AnalizadorNumerico(V, I).metricas(), AnalizadorNumerico(V, -I).metricas()
+    np.testing.assert_allclose(inverso['PF_nodo'], -directo['PF_nodo'])
+    np.testing.assert_allclose(inverso['PF'], -directo['PF'])
+    assert np.all(np.sign(directo['PF_nodo']) == np.sign(directo['P_nodo']))
+
+
+def test_tabla_de_potencias_con_flujo_inverso():
+    from analizador import Analizador
+    V, I = sintetizar(6000)
+    a = Analizador(V, -I)
+    assert np.all(a.pot_activa() < 0) and np.all(a.factor_potencia() < 0)
+    fila = next(linea for linea in a.tabla_potencias().splitlines() if 'cos' in linea)
+    valores = [float(x) for x in fila.strip('│ ').split('│')[1:]]
+    assert len(valores) == 4 and all(x < 0 for x in valores)  # Tres nodos y el total
+
+
+@pytest.mark.parametrize('formato', ['npy', 'float32'])
+def test_desde_archivo_igual_que_en_memoria(tmp_path, formato):
+    ruta = str(tmp_path / 'captura.npy')
+    V, I = sintetizar(60000, n_nodos=2, ruta=ruta)
+    crudo = {}
+    if formato == 'float32':
+        X = np.stack([V, I]).astype(np.float32)
+        ruta = str(tmp_path / 'captura.bin')
+        X.tofile(ruta)
+        V, I = X
+        crudo = {'nodos': 2, 'dtype': 'float32'}
+    a = AnalizadorNumerico.desde_archivo(ruta, **crudo)
+    assert isinstance(a.V, np.memmap)
+    esperado = AnalizadorNumerico(np.array(V), np.array(I)).metricas()
+    for nombre, valor in a.metricas().items():
+        np.testing.assert_allclose(valor, esperado[nombre], rtol=3e-10, atol=1e-12, err_msg=nombre)
+
+
+def test_potencia_instantanea_sin_memorizar():
+    V, I = sintetizar(6000, n_nodos=2)
+    a = AnalizadorNumerico(V, I)
+    p = a.pot_instantanea()
+    assert p.shape == (4, 3, 6000)
+    np.testing.assert_allclose(p[1], V[0] * I[1])
+    assert 'pot_instantanea' not in a._cache
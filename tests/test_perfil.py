@@ -0,0 +1,57 @@
+"""
+Pruebas de la instrumentación: bytes asignados por llamada.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import numpy as np
+import pytest
+import perfil
+
+MB = 1 << 20
+
+
+class Carga:
+    def nada(self):
+        return 0
+
+    def asignar(self, mb):
+        return np.ones(mb * MB, dtype=np.uint8).sum()
+
+    def externa(self):
+        self.asignar(4)
+        return self.nada()
+
+
+@pytest.fixture
+def medido():
+    for nombre in ('nada', 'asignar', 'externa'):
+        perfil.registrar(Carga, nombre)
+    perfil.reiniciar()
+    perfil.activar(memoria=True)
+    yield Carga()
+    perfil.desactivar()
+    for nombre in ('nada', 'asignar', 'externa'):
+        perfil._REGISTRO.pop((Carga, nombre))
+    perfil.reiniciar()
+
+
+def _bytes(pila):
+    return {tuple(p['pila']): p['bytes'] for p in perfil.instantanea()['pilas']}[pila]
+
+
+def test_pico_anterior_no_se_carga_a_la_llamada(medido):
+    basura = np.ones(16 * MB, dtype=np.uint8)  # Pico de 16 MB antes de la llamada
+    del basura
+    medido.nada()
+    assert _bytes(('Carga.nada',)) < MB // 4
+
+
+def test_pico_de_los_hijos_se_propaga(medido):
+    medido.externa()
+    assert 4 * MB <= _bytes(('Carga.externa', 'Carga.asignar')) < 5 * MB
+    assert 4 * MB <= _bytes(('Carga.externa',)) < 5 * MB
+    assert _bytes(('Carga.externa', 'Carga.nada')) < MB // 4
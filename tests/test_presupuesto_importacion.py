@@ -0,0 +1,18 @@
+"""
+Prueba del presupuesto de importación del núcleo numérico.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import pytest
+from presupuesto_importacion import MODULOS, medir, presupuesto
+
+
+@pytest.mark.parametrize('modulo', MODULOS)
+def test_presupuesto(modulo):
+    segundos, cargados = medir(modulo, repeticiones=3)
+    assert not cargados, '%s carga %s' % (modulo, cargados)
+    assert segundos * 1000 <= presupuesto(modulo), '%s tarda %.1f ms' % (modulo, segundos * 1000)
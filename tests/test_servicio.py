@@ -0,0 +1,146 @@
+"""
+Pruebas del servicio HTTP con capturas de distinto número de nodos.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import http.client
+import io
+import json
+import os
+import signal
+import threading
+import urllib.error
+import urllib.request
+import numpy as np
+import pytest
+import servicio
+from fuentes import sintetizar
+
+
+@pytest.fixture(scope='module')
+def servidor():
+    s = servicio.Servicio(trabajadores=1, cola=8, lote=4)
+    s.iniciar()
+    servidor = servicio.crear_servidor(s, puerto=0)
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+    s.cerrar()
+
+
+@pytest.fixture
+def url(servidor):
+    return 'http://127.0.0.1:%d' % servidor.server_address[1]
+
+
+def _subir(url, ruta, cuerpo):
+    solicitud = urllib.request.Request(url + ruta, data=cuerpo, method='POST')
+    try:
+        with urllib.request.urlopen(solicitud, timeout=60) as respuesta:
+            return respuesta.status, respuesta.read()
+    except urllib.error.HTTPError as error:
+        return error.code, error.read()
+
+
+def _captura(n_nodos):
+    V, I = sintetizar(6000, n_nodos=n_nodos)
+    datos = io.BytesIO()
+    np.savez(datos, V=V, I=I)
+    return datos.getvalue()
+
+
+@pytest.mark.parametrize('n_nodos', [2, 3])
+def test_analizar_captura_subida(url, n_nodos):
+    codigo, cuerpo = _subir(url, '/analizar', _captura(n_nodos))
+    assert codigo == 200
+    columnas = json.loads(cuerpo)['columnas']
+    assert sorted(set(columnas['nodo'])) == list(range(1, n_nodos + 1))
+
+
+def test_fasorial_dos_nodos(url):
+    codigo, cuerpo = _subir(url, '/fasorial?tipo=I', _captura(2))
+    assert codigo == 200
+    assert cuerpo.startswith(b'\x89PNG')
+
+
+def test_limite_de_tiempo(servidor, url, monkeypatch):
+    monkeypatch.setattr(servidor.servicio, 'limite', 0.0)
+    codigo, _ = _subir(url, '/analizar', _captura(3))
+    assert codigo == 504
+
+
+def test_cuerpo_demasiado_grande(servidor, monkeypatch):
+    monkeypatch.setattr(servicio, 'MAXIMO_CUERPO', 100)
+    conexion = http.client.HTTPConnection('127.0.0.1', servidor.server_address[1], timeout=60)
+    conexion.request('POST', '/analizar', body=b'x' * 1000)
+    respuesta = conexion.getresponse()
+    respuesta.read()
+    assert respuesta.status == 413
+    assert respuesta.getheader('Connection') == 'close'
+    conexion.close()
+
+
+def _servidor_detenido(s):
+    servidor = servicio.crear_servidor(s, puerto=0)  # Sin iniciar el servicio: nadie vacía la cola
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def test_cola_llena():
+    s = servicio.Servicio(trabajadores=1, cola=1)
+    servidor = _servidor_detenido(s)
+    url = 'http://127.0.0.1:%d' % servidor.server_address[1]
+    try:
+        assert s.enviar([{'ruta': 'c.npy', 'accion': 'metricas'}]) is not None
+        codigo, _ = _subir(url, '/analizar', json.dumps({'ruta': 'c.npy'}).encode())
+        assert codigo == 503
+        # Una captura grande se rechaza sin leer el cuerpo: solo se envían los encabezados
+        conexion = http.client.HTTPConnection('127.0.0.1', servidor.server_address[1], timeout=60)
+        conexion.putrequest('POST', '/analizar')
+        conexion.putheader('Content-Length', str(servicio.MAXIMO_CUERPO))
+        conexion.endheaders()
+        respuesta = conexion.getresponse()
+        respuesta.read()
+        assert respuesta.status == 503
+        assert respuesta.getheader('Connection') == 'close'
+        conexion.close()
+        assert s.estado()['rechazados'] == 2
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+
+def test_subidas_en_memoria(servidor, url, monkeypatch):
+    monkeypatch.setattr(servidor.servicio, '_subidas', threading.Semaphore(0))
+    assert _subir(url, '/analizar', _captura(2))[0] == 503
+    assert _subir(url, '/analizar', json.dumps({'ruta': 'no_existe.npy'}).encode())[0] == 400  # Cuerpo pequeño
+
+
+def _latencias(url):
+    with urllib.request.urlopen(url + '/latencias', timeout=60) as respuesta:
+        return json.loads(respuesta.read())
+
+
+def test_latencias(url):
+    antes = _latencias(url).get('/analizar', {'n': 0})['n']
+    assert _subir(url, '/analizar', _captura(3))[0] == 200
+    h = _latencias(url)['/analizar']
+    assert h['n'] == antes + 1 and sum(h['conteos']) == h['n']
+    assert len(h['conteos']) == len(h['limites_s']) + 1
+    assert 0 < h['media_s'] and h['p50_s'] <= h['p90_s'] <= h['p99_s']
+
+
+def test_reinicio_del_pool(servidor, url):
+    s = servidor.servicio
+    for pid in list(s._pool._processes):
+        os.kill(pid, signal.SIGKILL)
+    # La solicitud que encuentra el pool roto puede fallar; las siguientes usan procesos nuevos
+    codigos = [_subir(url, '/analizar', _captura(2))[0] for _ in range(3)]
+    assert codigos[-1] == 200
+    assert s.reinicios == 1
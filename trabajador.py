@@ -0,0 +1,77 @@
+"""
+Este módulo contiene el trabajador de cálculo en segundo plano de la interfaz.
+Los pasos del análisis se ejecutan en un hilo aparte y los avances y resultados
+vuelven por una cola que la interfaz revisa con root.after, de modo que el ciclo
+principal de Tk nunca se bloquea. Una tarea nueva cancela la anterior.
+
+
+Programa: Ingeniería Eléctrica
+Asignatura: Análisis de señales
+Universidad Tecnológica de Pereira
+"""
+
+import queue  # Cola de mensajes hacia la interfaz
+import threading  # Hilo de cálculo
+
+
+class TrabajadorCalculo:
+    """
+    Esta es la clase TrabajadorCalculo, la cual ejecuta tareas de análisis en un hilo y
+    entrega sus avances y resultados por una cola.
+    """
+
+    def __init__(self):
+        """
+        Inicializador de la clase TrabajadorCalculo.
+        """
+        self.cola = queue.Queue()  # Mensajes (tipo, tarea, datos)
+        self.tarea = 0  # Número de la tarea vigente
+        self._cancelada = threading.Event()
+
+    def enviar(self, pasos):
+        """
+        Inicia una tarea nueva y cancela la que esté en curso.
+        :param pasos: Lista de tuplas (nombre, función). Cada función recibe el diccionario
+                      con los resultados de los pasos anteriores.
+        :return: Número de la tarea
+        """
+        self._cancelada.set()  # La tarea anterior se detiene en su próximo paso
+        self._cancelada = threading.Event()
+        self.tarea += 1
+        threading.Thread(target=self._ejecutar, args=(self.tarea, self._cancelada, pasos),
+                         daemon=True).start()
+        return self.tarea
+
+    def _ejecutar(self, tarea, cancelada, pasos):
+        """
+        Ejecuta los pasos de una tarea en el hilo de cálculo.
+        :param tarea: Número de la tarea
+        :param cancelada: Evento que indica que la tarea fue reemplazada
+        :param pasos: Lista de tuplas (nombre, función)
+        """
+        resultados = {}
+        try:
+            for k, (nombre, funcion) in enumerate(pasos):
+                if cancelada.is_set():
+                    return
+                self.cola.put(('progreso', tarea, (k / len(pasos), nombre)))
+                resultados[nombre] = funcion(resultados)
+            if not cancelada.is_set():
+                self.cola.put(('listo', tarea, resultados))
+        except Exception as error:  # El error se muestra en la interfaz
+            self.cola.put(('error', tarea, error))
+
+    def recibir(self):
+        """
+        Retira sin bloquear los mensajes pendientes de la tarea vigente; los de tareas
+        canceladas se descartan.
+        :return: Lista de tuplas (tipo, datos)
+        """
+        mensajes = []
+        while True:
+            try:
+                tipo, tarea, datos = self.cola.get_nowait()
+            except queue.Empty:
+                return mensajes
+            if tarea == self.tarea:
+                mensajes.append((tipo, datos))